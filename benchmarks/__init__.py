@@ -0,0 +1,3 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
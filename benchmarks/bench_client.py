@@ -0,0 +1,259 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Benchmark the client against a local fake SMM server: login time, get_json throughput, set_position rate,
+geometry upload size/time and object construction cost
+
+Run with: python -m benchmarks.bench_client [--latency SECONDS] [--save NAME] [--compare NAME]
+
+Results can be saved as a named baseline (benchmarks/baselines/NAME.json) and later runs compared
+against it; the comparison exits non-zero if any result is worse than the baseline by more than --threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks.bench_points import make_coordinates
+from benchmarks.fake_server import ASSET_COMMAND, ASSET_STATUS, FakeSMMServer
+from smm_client import SMMConnection
+from smm_client.assets import SMMAsset, SMMAssetCommand, SMMAssetStatus
+from smm_client.http_cache import SMMResponseCache
+from smm_client.search import SMMSearchData
+from smm_client.types import SMMPointArray
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+USERNAME = "bench"
+
+
+class BenchResult:
+    # pylint: disable=R0903
+    """
+    One measured value
+    """
+
+    def __init__(self, name: str, value: float, unit: str, *, higher_is_better: bool = False) -> None:
+        self.name = name
+        self.value = value
+        self.unit = unit
+        self.higher_is_better = higher_is_better
+
+    def change(self, baseline: dict) -> float:
+        """
+        Fractional change from baseline, positive when this result is worse
+        """
+        if not baseline["value"]:
+            return 0.0
+        change = (self.value - baseline["value"]) / baseline["value"]
+        return -change if self.higher_is_better else change
+
+    def to_json(self) -> dict:
+        """
+        The result as stored in a baseline file
+        """
+        return {"value": self.value, "unit": self.unit, "higher_is_better": self.higher_is_better}
+
+
+def _rate(count: int, seconds: float) -> float:
+    return count / seconds if seconds > 0 else 0.0
+
+
+def _run(count: int, workers: int, call) -> float:
+    """
+    Call call(i) for i in range(count) on workers threads, returning the elapsed seconds
+    """
+    start = time.perf_counter()
+    if workers <= 1:
+        for i in range(count):
+            call(i)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for _ in pool.map(call, range(count)):
+                pass
+    return time.perf_counter() - start
+
+
+def bench_login(server: FakeSMMServer, repeat: int) -> list[BenchResult]:
+    """
+    Time creating a connection (CSRF fetch plus login)
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        SMMConnection(server.url, USERNAME, server.password).session.close()
+        times.append(time.perf_counter() - start)
+    return [
+        BenchResult("login.median", statistics.median(times) * 1000, "ms"),
+        BenchResult("login.min", min(times) * 1000, "ms"),
+    ]
+
+
+def bench_get_json(server: FakeSMMServer, connection: SMMConnection, count: int, workers: int) -> list[BenchResult]:
+    """
+    Requests per second from get_json, one at a time, from a thread pool and revalidating a response cache
+    """
+    serial = _run(count, 1, lambda _: connection.get_json("/assets/"))
+    threaded = _run(count, workers, lambda _: connection.get_json("/assets/"))
+    cached_connection = SMMConnection(server.url, USERNAME, server.password, response_cache=SMMResponseCache())
+    cached = _run(count, 1, lambda _: cached_connection.get_json("/assets/"))
+    cached_connection.session.close()
+    return [
+        BenchResult("get_json.serial", _rate(count, serial), "req/s", higher_is_better=True),
+        BenchResult(f"get_json.threads{workers}", _rate(count, threaded), "req/s", higher_is_better=True),
+        BenchResult("get_json.cached", _rate(count, cached), "req/s", higher_is_better=True),
+    ]
+
+
+def bench_set_position(connection: SMMConnection, count: int, workers: int) -> list[BenchResult]:
+    """
+    Positions per second from set_position, one at a time and from a thread pool
+    """
+    assets = connection.get_assets()
+
+    def send(i: int) -> None:
+        assets[i % len(assets)].set_position(-43.5 + i * 1e-6, 172.6, 1, 100, 90)
+
+    serial = _run(count, 1, send)
+    threaded = _run(count, workers, send)
+    return [
+        BenchResult("set_position.serial", _rate(count, serial), "pos/s", higher_is_better=True),
+        BenchResult(f"set_position.threads{workers}", _rate(count, threaded), "pos/s", higher_is_better=True),
+    ]
+
+
+def bench_geometry(server: FakeSMMServer, connection: SMMConnection, points: int, repeat: int) -> list[BenchResult]:
+    """
+    Request body size and time to upload a line with many points
+    """
+    mission = connection.create_mission("Benchmark", "Geometry upload benchmark")
+    if mission is None:
+        msg = "Fake server did not create a mission"
+        raise RuntimeError(msg)
+    line = SMMPointArray.from_lnglat(make_coordinates(points))
+    times = []
+    upload_bytes = 0
+    for _ in range(repeat):
+        received = server.state.bytes_received
+        start = time.perf_counter()
+        mission.add_line(line, "Benchmark line")
+        times.append(time.perf_counter() - start)
+        upload_bytes = server.state.bytes_received - received
+    return [
+        BenchResult(f"geometry.line{points}.size", upload_bytes / 1024, "KiB"),
+        BenchResult(f"geometry.line{points}.time", statistics.median(times) * 1000, "ms"),
+    ]
+
+
+def bench_objects(connection: SMMConnection, count: int) -> list[BenchResult]:
+    """
+    Cost of building client objects from server JSON
+    """
+    assets_json = [{"id": i, "name": f"Asset-{i}"} for i in range(count)]
+    asset = SMMAsset(connection, 1, "Asset-1")
+    search_json = {
+        "id": 1,
+        "properties": {},
+        "geometry": {"type": "LineString", "coordinates": make_coordinates(1000)},
+    }
+
+    def per_object(build, number: int) -> float:
+        return min(timeit.repeat(build, number=1, repeat=5)) / number * 1e6
+
+    return [
+        BenchResult(
+            "objects.asset",
+            per_object(lambda: [SMMAsset(connection, a["id"], a["name"]) for a in assets_json], count),
+            "us",
+        ),
+        BenchResult(
+            "objects.asset_status",
+            per_object(lambda: [SMMAssetStatus(asset, ASSET_STATUS) for _ in range(count)], count),
+            "us",
+        ),
+        BenchResult(
+            "objects.asset_command",
+            per_object(lambda: [SMMAssetCommand(asset, ASSET_COMMAND) for _ in range(count)], count),
+            "us",
+        ),
+        BenchResult("objects.search_data1000", per_object(lambda: SMMSearchData(search_json), 1), "us"),
+    ]
+
+
+def run(args: argparse.Namespace) -> list[BenchResult]:
+    """
+    Start a fake server and run every benchmark against it
+    """
+    with FakeSMMServer(assets=args.assets, latency=args.latency) as server:
+        connection = SMMConnection(server.url, USERNAME, server.password, pool_maxsize=args.workers)
+        results = bench_login(server, args.repeat)
+        results += bench_get_json(server, connection, args.requests, args.workers)
+        results += bench_set_position(connection, args.requests, args.workers)
+        results += bench_geometry(server, connection, args.points, args.repeat)
+        results += bench_objects(connection, args.objects)
+        connection.session.close()
+    return results
+
+
+def report(results: list[BenchResult], baseline: dict | None, threshold: float) -> bool:
+    """
+    Print the results (and the change from baseline), returning False if any regressed past threshold
+    """
+    passed = True
+    for result in results:
+        line = f"{result.name:32s} {result.value:12.2f} {result.unit:6s}"
+        previous = baseline.get(result.name) if baseline is not None else None
+        if previous is not None:
+            change = result.change(previous)
+            regressed = change > threshold
+            passed = passed and not regressed
+            line += f" {previous['value']:12.2f} {change * 100:+7.1f}%{'  REGRESSED' if regressed else ''}"
+        print(line)
+    return passed
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the client benchmarks
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the fake server waits per request")
+    parser.add_argument("--requests", type=int, default=500, help="requests per throughput benchmark")
+    parser.add_argument("--workers", type=int, default=8, help="threads for the concurrent benchmarks")
+    parser.add_argument("--assets", type=int, default=50, help="assets on the fake server")
+    parser.add_argument("--points", type=int, default=1000, help="points in the uploaded line")
+    parser.add_argument("--objects", type=int, default=10000, help="objects built per construction benchmark")
+    parser.add_argument("--repeat", type=int, default=10, help="repeats for the timed benchmarks")
+    parser.add_argument("--save", metavar="NAME", help="save the results as baseline NAME")
+    parser.add_argument("--compare", metavar="NAME", help="compare the results with baseline NAME")
+    parser.add_argument("--threshold", type=float, default=0.1, help="fractional change counted as a regression")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads((BASELINE_DIR / f"{args.compare}.json").read_text(encoding="utf-8"))["results"]
+    results = run(args)
+    passed = report(results, baseline, args.threshold)
+    if args.save:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        saved = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": {name: value for name, value in vars(args).items() if name not in ("save", "compare")},
+            "results": {result.name: result.to_json() for result in results},
+        }
+        (BASELINE_DIR / f"{args.save}.json").write_text(json.dumps(saved, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved baseline {args.save}")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Benchmark cold-start import time with python -X importtime, and check that importing the package and its
+offline modules doesn't pull in requests, NumPy or asyncio
+
+Run with: python -m benchmarks.bench_import [--runs N] [--budget MS] [--top N]
+
+Exits non-zero if a case imports a module it shouldn't, or (with --budget) takes longer than MS to import.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Submodules connection.py and missions.py import in the methods that use them
+_DEFERRED = ("fleet", "watch", "snapshot", "importer", "simplify", "streaming")
+
+# (name, statement, modules the statement must not import)
+CASES = (
+    ("package", "import smm_client", ("requests", "numpy", "asyncio")),
+    ("patterns", "import smm_client.patterns", ("requests", "numpy", "asyncio")),
+    (
+        "connection",
+        "from smm_client import SMMConnection",
+        ("numpy", "asyncio", "aiohttp", *(f"smm_client.{module}" for module in _DEFERRED)),
+    ),
+)
+
+
+class ImportProfile:
+    # pylint: disable=R0903
+    """
+    The modules imported by one run of a statement, with their self and cumulative times in microseconds
+    """
+
+    def __init__(self, output: str) -> None:
+        self.modules: dict[str, tuple[int, int]] = {}
+        self.total = 0
+        # Modules imported before site finishes are interpreter startup, not the statement
+        started = False
+        for line in output.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            top_level = not name[1:].startswith(" ")
+            if started:
+                self.modules[name.strip()] = (int(self_us), int(cumulative_us))
+                # A top level import's cumulative time includes everything it imported
+                if top_level:
+                    self.total += int(cumulative_us)
+            elif top_level and name.strip() == "site":
+                started = True
+
+
+def profile(statement: str) -> ImportProfile:
+    """
+    Run statement in a fresh interpreter with -X importtime
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return ImportProfile(result.stderr)
+
+
+def main() -> int:
+    """
+    Run the import benchmarks, returning the exit status
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per case, the median is reported")
+    parser.add_argument("--budget", type=float, help="fail if a case takes longer than this many milliseconds")
+    parser.add_argument("--top", type=int, default=0, help="show the N slowest modules (by self time) per case")
+    args = parser.parse_args()
+
+    failed = False
+    for name, statement, forbidden in CASES:
+        profiles = [profile(statement) for _ in range(args.runs)]
+        median = statistics.median(run.total for run in profiles) / 1000
+        imported = sorted(module for module in forbidden if module in profiles[0].modules)
+        over = args.budget is not None and median > args.budget
+        status = "FAIL" if imported or over else "ok"
+        print(f"{name:12} {median:8.1f}ms  {len(profiles[0].modules):4} modules  {status}  ({statement})")
+        if imported:
+            print(f"  imports {', '.join(imported)}")
+        for module, (self_us, _) in sorted(profiles[0].modules.items(), key=lambda item: -item[1][0])[: args.top]:
+            print(f"  {self_us / 1000:8.2f}ms  {module}")
+        failed = failed or status == "FAIL"
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
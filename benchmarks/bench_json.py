@@ -0,0 +1,95 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Benchmark the JSON decoding backends on representative response bodies: search GeoJSON, mission lists
+and asset lists
+
+Run with: python -m benchmarks.bench_json [scale]
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import timeit
+
+from benchmarks.bench_points import make_coordinates
+from smm_client.decoding import JSON_ORJSON, JSON_STDLIB, get_json_decoder
+
+
+def search_geojson(points: int) -> bytes:
+    """
+    A search as returned by /search/ID/: one feature with a LineString of points
+    """
+    feature = {
+        "type": "Feature",
+        "id": 1,
+        "properties": {"pk": 1, "sweep_width": 200, "created_by": "admin", "inprogress_by": None},
+        "geometry": {"type": "LineString", "coordinates": make_coordinates(points)},
+    }
+    return json.dumps({"type": "FeatureCollection", "features": [feature]}).encode()
+
+
+def mission_list(missions: int) -> bytes:
+    """
+    A /mission/list/ response
+    """
+    return json.dumps(
+        {
+            "missions": [
+                {"id": i, "name": f"Mission {i}", "started": "2025-01-01T00:00:00Z", "closed": None, "admin": True}
+                for i in range(missions)
+            ]
+        }
+    ).encode()
+
+
+def asset_list(assets: int) -> bytes:
+    """
+    An /assets/ response
+    """
+    return json.dumps(
+        {"assets": [{"id": i, "name": f"Asset-{i}", "type_id": 1, "type_name": "Helicopter"} for i in range(assets)]}
+    ).encode()
+
+
+def available_backends() -> list[str]:
+    """
+    The backends that can be used here
+    """
+    backends = [JSON_STDLIB]
+    try:
+        get_json_decoder(JSON_ORJSON)
+    except RuntimeError:
+        print("orjson is not installed, only the json module is measured")
+    else:
+        backends.append(JSON_ORJSON)
+    return backends
+
+
+def main(scale: int) -> None:
+    """
+    Run the decoding benchmarks
+    """
+    payloads = {
+        "search, 100 points": search_geojson(100),
+        f"search, {100 * scale} points": search_geojson(100 * scale),
+        f"mission list, {10 * scale} missions": mission_list(10 * scale),
+        f"asset list, {10 * scale} assets": asset_list(10 * scale),
+    }
+    backends = available_backends()
+    print(f"{'payload':32} {'size':>10} " + " ".join(f"{backend:>12}" for backend in backends))
+    for name, body in payloads.items():
+        times = []
+        for backend in backends:
+            decoder = get_json_decoder(backend)
+            runs, total = timeit.Timer(lambda decoder=decoder, body=body: decoder.loads(body)).autorange()
+            times.append(total / runs)
+        speedup = f"  x{times[0] / times[-1]:.1f}" if len(times) > 1 else ""
+        cells = " ".join(f"{seconds * 1e6:10.0f}us" for seconds in times)
+        print(f"{name:32} {len(body) / 1024:8.0f}KB {cells}{speedup}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Benchmark point storage: SMMPoint lists (with and without __slots__) against SMMPointArray
+
+Run with: python -m benchmarks.bench_points [count]
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+import tracemalloc
+
+from smm_client.missions import _populate_points
+from smm_client.types import MAX_LATITUDE, MAX_LONGITUDE, MIN_LATITUDE, MIN_LONGITUDE, SMMPoint, SMMPointArray
+
+
+class DictPoint:
+    # pylint: disable=R0903
+    """
+    SMMPoint as it was before __slots__: validated properties over a per-instance __dict__
+    """
+
+    def __init__(self, latitude: float, longitude: float) -> None:
+        self.lat = latitude
+        self.lng = longitude
+
+    def __set_lat(self, lat: float) -> None:
+        if lat < MIN_LATITUDE or lat > MAX_LATITUDE:
+            raise ValueError
+        self._lat = lat
+
+    def __get_lat(self) -> float:
+        return self._lat
+
+    def __set_lng(self, lng: float) -> None:
+        if lng < MIN_LONGITUDE or lng > MAX_LONGITUDE:
+            raise ValueError
+        self._lng = lng
+
+    def __get_lng(self) -> float:
+        return self._lng
+
+    lat = property(__get_lat, __set_lat)
+    lng = property(__get_lng, __set_lng)
+
+
+def make_coordinates(count: int) -> list[list[float]]:
+    """
+    GeoJSON style [lng, lat] coordinates for a creeping line search
+    """
+    return [[172.0 + (i % 100) * 0.001, -43.0 - (i // 100) * 0.001] for i in range(count)]
+
+
+def measure(name: str, build, repeat: int = 5) -> object:
+    """
+    Report the time and memory taken by build()
+    """
+    tracemalloc.start()
+    result = build()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    seconds = min(timeit.repeat(build, number=1, repeat=repeat))
+    print(f"{name:40s} {seconds * 1000:9.2f} ms {memory / 1024:10.1f} KiB")
+    return result
+
+
+def main(count: int) -> None:
+    """
+    Run the point storage benchmarks
+    """
+    coordinates = make_coordinates(count)
+    print(f"{count} points")
+    print("construction from GeoJSON coordinates:")
+    dict_points = measure("  list[SMMPoint] (no __slots__)", lambda: [DictPoint(p[1], p[0]) for p in coordinates])
+    slot_points = measure("  list[SMMPoint] (__slots__)", lambda: [SMMPoint(p[1], p[0]) for p in coordinates])
+    point_array = measure("  SMMPointArray.from_lnglat", lambda: SMMPointArray.from_lnglat(coordinates))
+    print("line/polygon form data:")
+    measure("  _populate_points(list, no __slots__)", lambda: _populate_points(dict_points, "bench"))
+    measure("  _populate_points(list, __slots__)", lambda: _populate_points(slot_points, "bench"))
+    measure("  _populate_points(SMMPointArray)", lambda: _populate_points(point_array, "bench"))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
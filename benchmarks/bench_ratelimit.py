@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Benchmark a fleet reconnecting at once against a server that can only handle so many requests at a time,
+with and without a rate limiter
+
+Every thread sends its position updates as fast as it can, retrying the ones the server rejects with 503.
+The fake server answers requests beyond --capacity with 503, so without a limiter much of the traffic is wasted.
+
+Run with: python -m benchmarks.bench_ratelimit [--threads N] [--updates N] [--capacity N] [--latency S]
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+
+from benchmarks.fake_server import FakeSMMServer
+from smm_client import SMMConnection
+from smm_client.ratelimit import ENDPOINT_TELEMETRY, SMMAdaptiveConcurrency, SMMRateLimiter
+from smm_client.types import SMMRequestError
+
+USERNAME = "bench"
+
+
+def run(server: FakeSMMServer, args: argparse.Namespace, limiter: SMMRateLimiter | None) -> dict:
+    """
+    Send args.updates position updates from each of args.threads threads, retrying rejected ones
+    """
+    connection = SMMConnection(server.url, USERNAME, server.password, pool_maxsize=args.threads, rate_limiter=limiter)
+    assets = connection.get_assets()
+    requests_before, rejected_before = server.state.requests, server.state.rejected
+    failures = [0] * args.threads
+
+    def worker(index: int) -> None:
+        asset = assets[index % len(assets)]
+        for _ in range(args.updates):
+            while True:
+                try:
+                    asset.set_position(-43.5, 172.6, 3, None, None)
+                    break
+                except SMMRequestError:
+                    failures[index] += 1
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {
+        "elapsed": elapsed,
+        "updates": args.threads * args.updates,
+        "sent": server.state.requests - requests_before,
+        "rejected": server.state.rejected - rejected_before,
+        "failures": sum(failures),
+        "limit": limiter.concurrency.limit if limiter is not None else None,
+    }
+
+
+def main() -> None:
+    """
+    Run the rate limiting benchmark
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=64, help="clients reconnecting at once")
+    parser.add_argument("--updates", type=int, default=20, help="position updates per client")
+    parser.add_argument("--capacity", type=int, default=8, help="requests the server handles at once")
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds the server takes per request")
+    args = parser.parse_args()
+
+    cases = {
+        "no limiter": lambda: None,
+        "adaptive concurrency": lambda: SMMRateLimiter({ENDPOINT_TELEMETRY: None}),
+        "fixed concurrency": lambda: SMMRateLimiter(
+            {ENDPOINT_TELEMETRY: None},
+            concurrency=SMMAdaptiveConcurrency(args.capacity, args.capacity, args.capacity),
+        ),
+        "default rates": SMMRateLimiter,
+    }
+    print(f"{'case':22} {'updates/s':>10} {'sent':>7} {'rejected':>9} {'limit':>6}")
+    with FakeSMMServer(assets=args.threads, latency=args.latency, capacity=args.capacity) as server:
+        for name, limiter in cases.items():
+            result = run(server, args, limiter())
+            limit = result["limit"] if result["limit"] is not None else "-"
+            print(
+                f"{name:22} {result['updates'] / result['elapsed']:10.0f} {result['sent']:7} "
+                f"{result['rejected']:9} {limit:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,529 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Local stand-in for an SMM server, for benchmarking the client without a real deployment
+
+Implements the session/CSRF cookie handling and the JSON and redirect shapes the client expects
+from the endpoints it uses. Data is held in memory and nothing is validated beyond what the client
+relies on (logins, CSRF tokens and object ids).
+
+Run on its own with: python -m benchmarks.fake_server [port]
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import re
+import secrets
+import sys
+import threading
+import time
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Callable
+from urllib.parse import parse_qs, urlsplit
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+PASSWORD = "password"  # noqa: S105
+ASSET_STATUS = {"status": "Active", "inop": False, "since": "2025-01-01T00:00:00Z", "notes": ""}
+ASSET_COMMAND = {
+    "id": 1,
+    "issued": "2025-01-01T00:00:00Z",
+    "issued_by": "admin",
+    "action_txt": "Return to Base",
+    "reason": "Benchmark",
+    "latitude": -43.5,
+    "longitude": 172.6,
+    "response": {"by": None, "type": None, "message": None},
+}
+
+
+def _feature_collection(pk: int, coordinates: list | None = None) -> dict:
+    geometry = {"type": "LineString", "coordinates": coordinates} if coordinates is not None else None
+    return {
+        "type": "FeatureCollection",
+        "features": [{"type": "Feature", "id": pk, "properties": {"pk": pk}, "geometry": geometry}],
+    }
+
+
+class FakeSMMState:
+    # pylint: disable=R0902
+    """
+    The data held by a FakeSMMServer, and counters of what it has been asked to do
+    """
+
+    def __init__(
+        self, *, assets: int = 10, missions: int = 5, latency: float = 0.0, capacity: int | None = None
+    ) -> None:
+        self.lock = threading.Lock()
+        self.latency = latency
+        self.capacity = capacity
+        self.in_flight = 0
+        self.rejected = 0
+        self.sessions: set[str] = set()
+        self.next_id = 1000
+        self.assets = {i: {"id": i, "name": f"Asset-{i}"} for i in range(1, assets + 1)}
+        self.missions = {i: {"id": i, "name": f"Mission-{i}"} for i in range(1, missions + 1)}
+        self.asset_types = {1: {"id": 1, "name": "Helicopter"}}
+        self.status_values = {1: {"id": 1, "name": "Active", "description": "Active", "inop": False}}
+        self.mission_status_values = {1: {"id": 1, "name": "Tasked", "description": "Tasked"}}
+        self.organizations = {1: {"id": 1, "name": "Org-1"}}
+        self.positions: dict[int, dict] = {}
+        # Assets whose position updates are answered with ASSET_COMMAND
+        self.commanded: set[int] = set()
+        self.geometry: dict[int, dict] = {}
+        self.external_references: dict[int, dict] = {}
+        self.requests = 0
+        self.connections = 0
+        self.logins = 0
+        self.bytes_received = 0
+
+    def new_id(self) -> int:
+        """
+        Allocate an id for a new object
+        """
+        with self.lock:
+            self.next_id += 1
+            return self.next_id
+
+    def count(self, body_bytes: int) -> None:
+        """
+        Record a request with a body of body_bytes
+        """
+        with self.lock:
+            self.requests += 1
+            self.bytes_received += body_bytes
+
+    def admit(self) -> bool:
+        """
+        Start handling a request, or return False (and count it as rejected) if the server is at capacity
+        """
+        with self.lock:
+            if self.capacity is not None and self.in_flight >= self.capacity:
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def finished(self) -> None:
+        """
+        Finish handling a request admitted by admit()
+        """
+        with self.lock:
+            self.in_flight -= 1
+
+    def expire_sessions(self) -> None:
+        """
+        Forget every session, as if they had all timed out
+        """
+        with self.lock:
+            self.sessions.clear()
+
+
+class FakeSMMRequest:
+    # pylint: disable=R0903
+    """
+    A parsed request passed to a route
+    """
+
+    def __init__(self, method: str, match: re.Match, query: dict[str, str], form: dict[str, str]) -> None:
+        self.method = method
+        self.match = match
+        self.query = query
+        self.form = form
+
+    def id(self, group: int = 1) -> int:
+        """
+        The object id captured by the route pattern
+        """
+        return int(self.match.group(group))
+
+
+class FakeSMMResponse:
+    # pylint: disable=R0903
+    """
+    The response from a route
+    """
+
+    def __init__(self, body: object = b"", status: int = 200, *, location: str | None = None) -> None:
+        self.status = status
+        self.location = location
+        if isinstance(body, (dict, list)):
+            self.content_type = "application/json"
+            self.body = json.dumps(body).encode()
+        else:
+            self.content_type = "text/html"
+            self.body = body.encode() if isinstance(body, str) else body
+
+
+def _redirect(location: str) -> FakeSMMResponse:
+    return FakeSMMResponse(status=302, location=location)
+
+
+def _not_found() -> FakeSMMResponse:
+    return FakeSMMResponse("not found", 404)
+
+
+class FakeSMMRoutes:
+    # pylint: disable=R0904
+    """
+    The endpoints of the fake server, as (methods, path pattern, handler) routes
+    """
+
+    def __init__(self, state: FakeSMMState) -> None:
+        self.state = state
+        self.routes: list[tuple[tuple[str, ...], re.Pattern, Callable[[FakeSMMRequest], FakeSMMResponse]]] = []
+        self._add(("GET",), r"/assets/", self.assets)
+        self._add(("GET",), r"/assets/(\d+)/", self.asset)
+        self._add(("GET", "POST"), r"/assets/(\d+)/status/", self.asset_status)
+        self._add(("GET",), r"/assets/(\d+)/command/", self.asset_command)
+        self._add(("GET",), r"/assets/(\d+)/mission/", self.asset_mission)
+        self._add(("POST",), r"/data/assets/(\d+)/position/add/", self.asset_position)
+        self._add(("GET",), r"/assets/assettypes/", self.asset_types)
+        self._add(("GET",), r"/assets/status/values/", self.asset_status_values)
+        self._add(("GET",), r"/mission/asset/status/values/", self.mission_asset_status_values)
+        self._add(("GET",), r"/mission/list/", self.missions)
+        self._add(("POST",), r"/mission/new/", self.mission_new)
+        self._add(("GET",), r"/mission/(\d+)/assets/", self.mission_assets)
+        self._add(("GET",), r"/mission/(\d+)/organizations/", self.mission_organizations)
+        self._add(("GET", "POST"), r"/mission/(\d+)/externalreferences/", self.mission_external_references)
+        self._add(("POST",), r"/mission/(\d+)/data/(pois|userlines|userpolygons)/create/", self.mission_geometry)
+        self._add(("POST",), r"/mission/(\d+)/search/\w+/create/(\w+/)?", self.search_create)
+        self._add(("GET",), r"/mission/(\d+)/details/", self.ok)
+        self._add(("POST", "DELETE"), r"/mission/(\d+)/.*", self.ok)
+        self._add(("GET", "POST"), r"/organization/", self.organizations)
+        self._add(("GET",), r"/organization/(\d+)/", self.organization)
+        self._add(("GET",), r"/organization/(\d+)/assets/", self.organization_assets)
+        self._add(("POST",), r"/organization/(\d+)/.*", self.ok)
+        self._add(("POST",), r"/admin/(\w+)/(\w+)/add/", self.admin_add)
+        self._add(("GET",), r"/admin/\w+/\w+/\d+/change/", self.ok)
+        self._add(("POST",), r"/search/find/closest/", self.search_closest)
+        self._add(("GET",), r"/search/(\d+)/", self.search)
+        self._add(("POST",), r"/search/(\d+)/queue/", self.search_queue)
+        self._add(("POST",), r"/search/(\d+)/(begin|finished)/", self.search_progress)
+
+    def _add(self, methods: tuple[str, ...], pattern: str, handler: Callable[[FakeSMMRequest], FakeSMMResponse]):
+        self.routes.append((methods, re.compile(pattern), handler))
+
+    def dispatch(self, method: str, path: str, query: dict[str, str], form: dict[str, str]) -> FakeSMMResponse:
+        """
+        Call the handler for the first route matching method and path
+        """
+        for methods, pattern, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if match is not None and method in methods:
+                return handler(FakeSMMRequest(method, match, query, form))
+        return _not_found()
+
+    # pylint: disable=C0116
+    def ok(self, _request: FakeSMMRequest) -> FakeSMMResponse:
+        return FakeSMMResponse("OK")
+
+    def assets(self, _request: FakeSMMRequest) -> FakeSMMResponse:
+        return FakeSMMResponse({"assets": list(self.state.assets.values())})
+
+    def asset(self, request: FakeSMMRequest) -> FakeSMMResponse:
+        asset = self.state.assets.get(request.id())
+        return FakeSMMResponse(asset) if asset is not None else _not_found()
+
+    def asset_status(self, request: FakeSMMRequest) -> FakeSMMResponse:
+        if request.method == "POST":
+            return FakeSMMResponse("OK")
+        return FakeSMMResponse(ASSET_STATUS)
+
+    def asset_command(self, _request: FakeSMMRequest) -> FakeSMMResponse:
+        return FakeSMMResponse({"command": ASSET_COMMAND})
+
+    def asset_mission(self, _request: FakeSMMRequest) -> FakeSMMResponse:
+        mission = next(iter(self.state.missions.values()), None)
+        if mission is None:
+            return FakeSMMResponse({})
+        return FakeSMMResponse({"mission_id": mission["id"], "mission_name": mission["name"]})
+
+    def asset_position(self, request: FakeSMMRequest) -> FakeSMMResponse:
+        self.state.positions[request.id()] = request.form
+        return FakeSMMResponse(ASSET_COMMAND if request.id() in self.state.commanded else "")
+
+    def asset_types(self, _request: FakeSMMRequest) -> FakeSMMResponse:
+        return FakeSMMResponse({"asset_types": list(self.state.asset_types.values())})
+
+    def asset_status_values(self, _request: FakeSMMRequest) -> FakeSMMResponse:
+        return FakeSMMResponse({"values": list(self.state.status_values.values())})
+
+    def mission_asset_status_values(self, _request: FakeSMMRequest) -> FakeSMMResponse:
+        return FakeSMMResponse({"values": list(self.state.mission_status_values.values())})
+
+    def missions(self, _request: FakeSMMRequest) -> FakeSMMResponse:
+        return FakeSMMResponse({"missions": list(self.state.missions.values())})
+
+    def mission_new(self, request: FakeSMMRequest) -> FakeSMMResponse:
+        mission_id = self.state.new_id()
+        self.state.missions[mission_id] = {"id": mission_id, "name": request.form.get("mission_name")}
+        return _redirect(f"/mission/{mission_id}/details/")
+
+    def mission_assets(self, _request: FakeSMMRequest) -> FakeSMMResponse:
+        return FakeSMMResponse({"assets": list(self.state.assets.values())})
+
+    def mission_organizations(self, _request: FakeSMMRequest) -> FakeSMMResponse:
+        return FakeSMMResponse({"organizations": [{"organization": org} for org in self.state.organizations.values()]})
+
+    def mission_external_references(self, request: FakeSMMRequest) -> FakeSMMResponse:
+        if request.method == "POST":
+            reference_id = self.state.new_id()
+            self.state.external_references[reference_id] = {"id": reference_id, **request.form}
+            return FakeSMMResponse("OK")
+        return FakeSMMResponse({"external_references": list(self.state.external_references.values())})
+
+    def mission_geometry(self, request: FakeSMMRequest) -> FakeSMMResponse:
+        pk = self.state.new_id()
+        self.state.geometry[pk] = request.form
+        return FakeSMMResponse(_feature_collection(pk))
+
+    def organizations(self, request: FakeSMMRequest) -> FakeSMMResponse:
+        if request.method == "POST":
+            org_id = self.state.new_id()
+            self.state.organizations[org_id] = {"id": org_id, "name": request.form.get("name")}
+            return FakeSMMResponse(self.state.organizations[org_id])
+        return FakeSMMResponse({"organizations": list(self.state.organizations.values())})
+
+    def organization(self, request: FakeSMMRequest) -> FakeSMMResponse:
+        return FakeSMMResponse(
+            {
+                "id": request.id(),
+                "members": [
+                    {
+                        "user": f"user{i}",
+                        "role": "M",
+                        "added": "x",
+                        "added_by": "y",
+                        "removed": None,
+                        "removed_by": None,
+                    }
+                    for i in range(5)
+                ],
+            }
+        )
+
+    def organization_assets(self, _request: FakeSMMRequest) -> FakeSMMResponse:
+        return FakeSMMResponse(
+            {
+                "assets": [
+                    {"asset": asset, "added": "x", "added_by": "y", "removed": None, "removed_by": None}
+                    for asset in self.state.assets.values()
+                ]
+            }
+        )
+
+    def admin_add(self, request: FakeSMMRequest) -> FakeSMMResponse:
+        object_id = self.state.new_id()
+        app, model = request.match.group(1), request.match.group(2)
+        if model == "asset":
+            self.state.assets[object_id] = {"id": object_id, "name": request.form.get("name")}
+        elif model == "assettype":
+            self.state.asset_types[object_id] = {"id": object_id, "name": request.form.get("name")}
+        return _redirect(f"/admin/{app}/{model}/{object_id}/change/")
+
+    def search_closest(self, _request: FakeSMMRequest) -> FakeSMMResponse:
+        return FakeSMMResponse({"object_url": "/search/7/"})
+
+    def search_create(self, _request: FakeSMMRequest) -> FakeSMMResponse:
+        return FakeSMMResponse(_feature_collection(self.state.new_id()))
+
+    def search(self, request: FakeSMMRequest) -> FakeSMMResponse:
+        coordinates = [[172.0 + i * 0.001, -43.0 - (i % 2) * 0.01] for i in range(100)]
+        return FakeSMMResponse(_feature_collection(request.id(), coordinates))
+
+    def search_queue(self, _request: FakeSMMRequest) -> FakeSMMResponse:
+        return FakeSMMResponse("Success")
+
+    def search_progress(self, request: FakeSMMRequest) -> FakeSMMResponse:
+        return FakeSMMResponse("Completed" if request.match.group(2) == "finished" else "Started")
+
+    # pylint: enable=C0116
+
+
+class FakeSMMHandler(BaseHTTPRequestHandler):
+    """
+    Request handler for FakeSMMServer: sessions, CSRF checks and latency, then the routes
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: FakeSMMServer
+
+    def setup(self) -> None:
+        super().setup()
+        state = self.server.state
+        with state.lock:
+            state.connections += 1
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 # pylint: disable=W0622
+        pass
+
+    def _cookies(self) -> dict[str, str]:
+        return {name: morsel.value for name, morsel in SimpleCookie(self.headers.get("Cookie", "")).items()}
+
+    def _send(self, response: FakeSMMResponse, cookies: tuple[str, ...] = ()) -> None:
+        body = response.body
+        etag = None
+        if response.content_type == "application/json" and response.status == HTTPStatus.OK:
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            if self.headers.get("If-None-Match") == etag:
+                response = FakeSMMResponse(status=HTTPStatus.NOT_MODIFIED)
+                body = b""
+        self.send_response(response.status)
+        self.send_header("Content-Type", response.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        if response.location is not None:
+            self.send_header("Location", response.location)
+        for cookie in cookies:
+            self.send_header("Set-Cookie", cookie)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_form(self) -> tuple[dict[str, str], int]:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length).decode() if length else ""
+        return {name: values[-1] for name, values in parse_qs(raw).items()}, length
+
+    def _handle(self, method: str) -> None:
+        state = self.server.state
+        form, length = self._read_form() if method == "POST" else ({}, 0)
+        state.count(length)
+        if not state.admit():
+            self._send(FakeSMMResponse("Service Unavailable", HTTPStatus.SERVICE_UNAVAILABLE))
+            return
+        try:
+            self._serve(method, form)
+        finally:
+            state.finished()
+
+    def _serve(self, method: str, form: dict[str, str]) -> None:
+        state = self.server.state
+        if state.latency:
+            time.sleep(state.latency)
+        parts = urlsplit(self.path)
+        path = re.sub("/+", "/", parts.path)
+        cookies = self._cookies()
+        if path == "/" and method == "GET":
+            token = cookies.get("csrftoken") or secrets.token_hex(16)
+            self._send(FakeSMMResponse("<html></html>"), (f"csrftoken={token}; Path=/",))
+        elif method != "GET" and self.headers.get("X-CSRFToken") != cookies.get("csrftoken"):
+            self._send(FakeSMMResponse("CSRF verification failed", 403))
+        elif path == "/accounts/login/":
+            if method == "POST":
+                self._login(form)
+            else:
+                self._send(FakeSMMResponse("<html>Log in</html>"))
+        elif cookies.get("sessionid") not in state.sessions:
+            self._send(_redirect(f"/accounts/login/?next={path}"))
+        else:
+            query = {name: values[-1] for name, values in parse_qs(parts.query).items()}
+            self._send(self.server.routes.dispatch(method, path, query, form))
+
+    def _login(self, form: dict[str, str]) -> None:
+        state = self.server.state
+        if form.get("password") != self.server.password:
+            self._send(FakeSMMResponse("<html>Please enter a correct username and password</html>"))
+            return
+        session_id = secrets.token_hex(16)
+        with state.lock:
+            state.sessions.add(session_id)
+            state.logins += 1
+        self._send(_redirect("/"), (f"sessionid={session_id}; Path=/; HttpOnly",))
+
+    # pylint: disable=C0103,C0116
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+
+class FakeSMMServer(ThreadingHTTPServer):
+    """
+    A fake SMM server on a background thread, listening on localhost
+
+    Usage:
+        with FakeSMMServer(latency=0.01) as server:
+            connection = SMMConnection(server.url, "user", server.password)
+    """
+
+    daemon_threads = True
+    # Concurrent benchmarks open many connections at once; the default backlog of 5 drops some, costing a 1s retry
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        *,
+        assets: int = 10,
+        missions: int = 5,
+        latency: float = 0.0,
+        port: int = 0,
+        password: str = PASSWORD,
+        capacity: int | None = None,
+    ) -> None:
+        # pylint: disable=R0913
+        """
+        Args:
+            assets (int): Number of assets the server starts with.
+            missions (int): Number of missions the server starts with.
+            latency (float): Seconds added to every request before it is handled.
+            port (int): Port to listen on, 0 picks a free one.
+            password (str): The password every username logs in with.
+            capacity (int, optional): Requests handled at once, more are answered with 503 Service Unavailable.
+        """
+        super().__init__(("127.0.0.1", port), FakeSMMHandler)
+        self.state = FakeSMMState(assets=assets, missions=missions, latency=latency, capacity=capacity)
+        self.routes = FakeSMMRoutes(self.state)
+        self.password = password
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """
+        The base URL to pass to SMMConnection
+        """
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> Self:
+        """
+        Start serving on a background thread
+        """
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-smm-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop serving and close the listening socket
+        """
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    with FakeSMMServer(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8000) as fake_server:
+        print(f"Fake SMM server on {fake_server.url}, password {fake_server.password!r}")
+        with contextlib.suppress(KeyboardInterrupt):
+            threading.Event().wait()
@@ -3,9 +3,38 @@
 # SPDX-License-Identifier: MIT
 """
 Search Management Map (SMM) Client Library
+
+The names exported here are imported from their submodules on first use, so importing the package (or a
+submodule that doesn't need the network, such as smm_client.patterns) doesn't import requests.
 """
 
-from smm_client.connection import SMMConnection
-from smm_client.types import SMMPoint
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from smm_client.connection import SMMConnection
+    from smm_client.types import SMMPoint
+
+_LAZY_EXPORTS = {
+    "SMMConnection": "smm_client.connection",
+    "SMMPoint": "smm_client.types",
+}
 
 __all__ = ["SMMConnection", "SMMPoint"]
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(module), name)
+    # Later lookups find it directly, without calling __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
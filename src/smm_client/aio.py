@@ -0,0 +1,986 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - asyncio client
+
+Requires the optional aiohttp dependency: pip install smm-client[async]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+from json import JSONDecodeError
+from typing import TYPE_CHECKING, AsyncIterator, Callable
+
+import aiohttp
+
+from smm_client.aio_missions import (
+    AsyncSMMMissionExternalReference,
+    AsyncSMMMissionMember,
+    AsyncSMMMissionOrganization,
+)
+from smm_client.assets import (
+    SMMAssetCommand,
+    SMMAssetStatus,
+    SMMAssetStatusValue,
+    SMMAssetType,
+    _parse_position_command,
+    _parse_search_id,
+)
+from smm_client.connection import _LOGIN_PATH, SMMUser, _parse_redirect_id, _session_expired
+from smm_client.decoding import JSON_AUTO, SMMJSONDecoder, get_json_decoder
+from smm_client.geometry import _parse_features_pk
+from smm_client.identity import SMMIdentityMap
+from smm_client.missions import SMMMissionAssetStatusValue, _populate_points, _simplify_points
+from smm_client.organizations import (
+    SMMOrganizationAsset,
+    SMMOrganizationUser,
+    _parse_organization_assets,
+    _parse_organization_member,
+    _parse_organization_members,
+)
+from smm_client.search import SMMSearchData
+from smm_client.types import (
+    SMMCSRFTokenError,
+    SMMDeleteCSRFError,
+    SMMDeleteHTTPError,
+    SMMGetHTTPError,
+    SMMJSONDecodeError,
+    SMMLoginNoSessionError,
+    SMMMissingKeyError,
+    SMMParseError,
+    SMMPostCSRFError,
+    SMMPostHTTPError,
+    SMMRequestError,
+)
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from smm_client.importer import ImportSource, SMMImportResult
+    from smm_client.simplify import SMMSimplification
+    from smm_client.types import SMMPoint, SMMPointArray
+
+_HTTP_OK = 200
+
+
+def _form_data(data: dict | None) -> dict | None:
+    """
+    Encode form data the same way requests does: None values are dropped, everything else is stringified
+    """
+    if data is None:
+        return None
+    return {key: str(value) for key, value in data.items() if value is not None}
+
+
+class SMMAsyncResponse:
+    """
+    A fully read response from an AsyncSMMConnection request
+
+    Provides the parts of the requests.Response interface used by the response parsers in this package.
+    """
+
+    def __init__(self, response: aiohttp.ClientResponse, content: bytes, decoder: SMMJSONDecoder) -> None:
+        self._response = response
+        self._decoder = decoder
+        self.status_code = response.status
+        self.url = str(response.url)
+        self.history = response.history
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        """
+        The response body decoded as text
+        """
+        return self.content.decode(self._response.get_encoding(), errors="replace")
+
+    def json(self):
+        """
+        The response body decoded as JSON
+        """
+        return self._decoder.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        """
+        Raise aiohttp.ClientResponseError for a non-2xx response
+        """
+        self._response.raise_for_status()
+
+
+class AsyncSMMConnection:
+    # pylint: disable=R0902,R0904
+    """
+    Manages an asyncio connection and authentication to a Search Management Map (SMM) server.
+
+    Unlike SMMConnection the login is not performed on construction, use either:
+        async with AsyncSMMConnection(url, username, password) as smm:
+            ...
+    or:
+        smm = await AsyncSMMConnection.connect(url, username, password)
+    """
+
+    def __init__(
+        self,
+        url: str,
+        username: str,
+        password: str,
+        *,
+        limit: int = 100,
+        json_decoder: str | SMMJSONDecoder = JSON_AUTO,
+        reauthenticate: bool = True,
+    ) -> None:
+        # pylint: disable=R0913
+        """
+        Initializes the connection, without logging in.
+
+        Args:
+            url (str): The base URL of the SMM server.
+            username (str): The username for authentication.
+            password (str): The password for authentication.
+            limit (int): The maximum number of simultaneous connections to the server.
+            json_decoder (str | SMMJSONDecoder): How responses are decoded: "orjson", "json" (the standard library)
+                or "auto" (orjson if it is installed), see smm_client.decoding.
+            reauthenticate (bool): Log in again and retry once when the server rejects an expired session.
+        """
+        self.base_url = url
+        self.username = username
+        self.password = password
+        self.limit = limit
+        self.json_decoder = get_json_decoder(json_decoder)
+        self.reauthenticate = reauthenticate
+        self.session: aiohttp.ClientSession | None = None
+        # Created on first use, so it belongs to the event loop the connection is used on
+        self._login_lock: asyncio.Lock | None = None
+        self._login_generation = 0
+        self.identity_map = SMMIdentityMap()
+
+    @classmethod
+    async def connect(
+        cls,
+        url: str,
+        username: str,
+        password: str,
+        *,
+        limit: int = 100,
+        json_decoder: str | SMMJSONDecoder = JSON_AUTO,
+        reauthenticate: bool = True,
+    ) -> AsyncSMMConnection:
+        # pylint: disable=R0913
+        """
+        Create a connection and log in to the SMM server.
+        """
+        connection = cls(url, username, password, limit=limit, json_decoder=json_decoder, reauthenticate=reauthenticate)
+        await connection.login()
+        return connection
+
+    async def __aenter__(self) -> Self:
+        await self.login()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Close the underlying HTTP session
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _session(self) -> aiohttp.ClientSession:
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.limit),
+                cookie_jar=aiohttp.CookieJar(unsafe=True),
+            )
+        return self.session
+
+    def _cookie(self, name: str) -> str | None:
+        for cookie in self._session().cookie_jar:
+            if cookie.key == name:
+                return cookie.value
+        return None
+
+    async def _send(
+        self, method: str, url: str, csrf_error: type[SMMRequestError] | None, *, wait_for_login: bool, **kwargs
+    ) -> SMMAsyncResponse:
+        if csrf_error is not None:
+            csrftoken = self._cookie("csrftoken")
+            if csrftoken is None and wait_for_login and self._login_lock is not None:
+                # Another task logging in again clears the jar until the server sets a new token; wait for it
+                async with self._login_lock:
+                    csrftoken = self._cookie("csrftoken")
+            if csrftoken is None:
+                raise csrf_error
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), "X-CSRFToken": csrftoken}
+        async with self._session().request(method, url, **kwargs) as response:
+            content = await response.read()
+            return SMMAsyncResponse(response, content, self.json_decoder)
+
+    async def _request(
+        self,
+        method: str,
+        path: str | None,
+        *,
+        csrf_error: type[SMMRequestError] | None = None,
+        reauthenticate: bool = True,
+        **kwargs,
+    ) -> SMMAsyncResponse:
+        """
+        Send a request, logging in again and replaying it once if the session has expired
+        """
+        url = f"{self.base_url}/{path}" if path else self.base_url
+        generation = self._login_generation
+        response = await self._send(method, url, csrf_error, wait_for_login=reauthenticate, **kwargs)
+        if reauthenticate and self.reauthenticate and _session_expired(response):
+            await self._relogin(generation)
+            response = await self._send(method, url, csrf_error, wait_for_login=True, **kwargs)
+        return response
+
+    async def _relogin(self, generation: int) -> None:
+        """
+        Log in again, unless another task already has since the failed request was sent
+        """
+        if self._login_lock is None:
+            self._login_lock = asyncio.Lock()
+        async with self._login_lock:
+            if self._login_generation == generation:
+                await self.login()
+
+    async def get(self, path: str | None = None) -> SMMAsyncResponse:
+        """
+        Performs a GET request to the specified path.
+
+        Args:
+            path (str, optional): The path to request, relative to the base URL.
+
+        Returns:
+            SMMAsyncResponse: The response from the server.
+        """
+        return await self._request("GET", path)
+
+    async def get_json(self, path: str):
+        """
+        Performs a GET request and returns the parsed JSON response.
+
+        Args:
+            path (str): The path to request, relative to the base URL.
+
+        Returns:
+            dict: The parsed JSON response.
+
+        Raises:
+            SMMRequestError: If the request fails or returns non-JSON content.
+        """
+        response = await self._request("GET", path, headers={"Accept": "application/json"})
+        try:
+            response.raise_for_status()
+            return response.json()
+        except aiohttp.ClientResponseError as exc:
+            raise SMMGetHTTPError(path, exc) from exc
+        except ValueError as exc:
+            raise SMMJSONDecodeError(path, exc) from exc
+
+    async def post(self, path: str, data=None) -> SMMAsyncResponse:
+        """
+        Performs a POST request to the specified path.
+
+        Args:
+            path (str): The path to request, relative to the base URL.
+            data (dict, optional): The data to send in the POST request.
+
+        Returns:
+            SMMAsyncResponse: The response from the server.
+
+        Raises:
+            SMMRequestError: If the request fails or CSRF token is missing.
+        """
+        return await self._post(path, data)
+
+    async def _post(self, path: str, data=None, *, reauthenticate: bool = True) -> SMMAsyncResponse:
+        response = await self._request(
+            "POST", path, csrf_error=SMMPostCSRFError, reauthenticate=reauthenticate, data=_form_data(data)
+        )
+        try:
+            response.raise_for_status()
+        except aiohttp.ClientResponseError as exc:
+            raise SMMPostHTTPError(path, exc) from exc
+        return response
+
+    async def delete(self, path: str) -> SMMAsyncResponse:
+        """
+        Performs a DELETE request to the specified path.
+
+        Args:
+            path (str): The path to request, relative to the base URL.
+
+        Returns:
+            SMMAsyncResponse: The response from the server.
+
+        Raises:
+            SMMRequestError: If the request fails or CSRF token is missing.
+        """
+        response = await self._request("DELETE", path, csrf_error=SMMDeleteCSRFError)
+        try:
+            response.raise_for_status()
+        except aiohttp.ClientResponseError as exc:
+            raise SMMDeleteHTTPError(path, exc) from exc
+        return response
+
+    async def login(self) -> None:
+        """
+        Authenticates with the SMM server using the provided credentials.
+        """
+        # Start from a clean cookie jar so a stale session cookie can't be mistaken for a new one
+        self._session().cookie_jar.clear()
+        await self._request("GET", None, reauthenticate=False)
+        if self._cookie("csrftoken") is None:
+            raise SMMCSRFTokenError
+
+        await self._post(_LOGIN_PATH, data={"username": self.username, "password": self.password}, reauthenticate=False)
+
+        if self._cookie("sessionid") is None:
+            raise SMMLoginNoSessionError
+        self._login_generation += 1
+
+    async def iter_json(self, path: str, key: str) -> AsyncIterator:
+        """
+        Performs a GET request and yields the items of the key array in the JSON response.
+
+        Unlike SMMConnection.iter_json the response is read in full first; its items are then parsed one at a time.
+
+        Raises:
+            SMMRequestError: If the request fails, returns non-JSON content or has no key array.
+        """
+        iter_json_array = importlib.import_module("smm_client.streaming").iter_json_array
+        response = await self._request("GET", path, headers={"Accept": "application/json"})
+        try:
+            response.raise_for_status()
+            for item in iter_json_array([response.content], key):
+                yield item
+        except KeyError as exc:
+            raise SMMMissingKeyError(path, key) from exc
+        except aiohttp.ClientResponseError as exc:
+            raise SMMGetHTTPError(path, exc) from exc
+        except ValueError as exc:
+            raise SMMJSONDecodeError(path, exc) from exc
+
+    async def get_assets(self) -> list[AsyncSMMAsset]:
+        """
+        Retrieves all assets associated with the authenticated user.
+        """
+        data = await self.get_json("/assets/")
+        if "assets" not in data:
+            raise SMMMissingKeyError("/assets/", "assets")
+        return [
+            self.identity_map.get(AsyncSMMAsset, self, asset_json["id"], asset_json["name"])
+            for asset_json in data["assets"]
+        ]
+
+    async def get_missions(self, only: str = "all") -> list[AsyncSMMMission]:
+        """
+        Retrieves missions the authenticated user is a member of.
+
+        Args:
+            only (str): Filter for missions (e.g., 'all', 'active'). Defaults to 'all'.
+        """
+        data = await self.get_json(f"/mission/list/?only={only}")
+        if "missions" not in data:
+            raise SMMMissingKeyError(f"/mission/list/?only={only}", "missions")
+        return [
+            self.identity_map.get(AsyncSMMMission, self, mission_json["id"], mission_json["name"])
+            for mission_json in data["missions"]
+        ]
+
+    async def get_asset_types(self) -> list[SMMAssetType]:
+        """
+        Get all asset types
+        """
+        data = await self.get_json("/assets/assettypes/")
+        if "asset_types" not in data:
+            raise SMMMissingKeyError("/assets/assettypes/", "asset_types")
+        return [
+            SMMAssetType(self, asset_type_json["id"], asset_type_json["name"])
+            for asset_type_json in data["asset_types"]
+        ]
+
+    async def get_asset_status_values(self) -> list[SMMAssetStatusValue]:
+        """
+        Get all the asset status values
+        """
+        data = await self.get_json("/assets/status/values/")
+        if "values" not in data:
+            raise SMMMissingKeyError("/assets/status/values/", "values")
+        return [
+            SMMAssetStatusValue(value["id"], value["name"], value["description"], inop=value["inop"])
+            for value in data["values"]
+        ]
+
+    async def get_mission_asset_status_values(self) -> list[SMMMissionAssetStatusValue]:
+        """
+        Get all the mission asset status values
+        """
+        data = await self.get_json("/mission/asset/status/values/")
+        if "values" not in data:
+            raise SMMMissingKeyError("/mission/asset/status/values/", "values")
+        return [
+            SMMMissionAssetStatusValue(value["id"], value["name"], value["description"]) for value in data["values"]
+        ]
+
+    async def get_organizations(self, *, all_orgs=False) -> list[AsyncSMMOrganization]:
+        """
+        Get all Organizations
+        """
+        url = "/organization/" if all_orgs else "/organization/?only=mine"
+        data = await self.get_json(url)
+        if "organizations" not in data:
+            raise SMMMissingKeyError(url, "organizations")
+        return [
+            self.identity_map.get(AsyncSMMOrganization, self, org_json["id"], org_json["name"])
+            for org_json in data["organizations"]
+        ]
+
+    async def create_user(self, username: str, password: str) -> SMMUser:
+        """
+        Add a new user to this server
+        """
+        result = await self.post(
+            "/admin/auth/user/add/",
+            {"username": username, "password1": password, "password2": password, "_save": "Save"},
+        )
+        return SMMUser(_parse_redirect_id("user", result.url), username)
+
+    async def create_asset_type(self, asset_type: str, description: str) -> SMMAssetType:
+        """
+        Create a new asset type
+        """
+        result = await self.post(
+            "/admin/assets/assettype/add/",
+            {"name": asset_type, "description": description, "_continue": "Save+and+continue+editing"},
+        )
+        return SMMAssetType(self, _parse_redirect_id("asset type", result.url), asset_type)
+
+    async def create_asset(self, user: SMMUser, asset: str, asset_type: SMMAssetType) -> AsyncSMMAsset:
+        """
+        Create a new asset
+        """
+        result = await self.post(
+            "/admin/assets/asset/add/",
+            {"name": asset, "owner": user.id, "asset_type": asset_type.id, "_continue": "Save+and+continue+editing"},
+        )
+        return self.identity_map.get(AsyncSMMAsset, self, _parse_redirect_id("asset", result.url), asset)
+
+    async def create_mission(self, name: str, description: str) -> AsyncSMMMission | None:
+        """
+        Create a new mission
+        """
+        res = await self.post("/mission/new/", {"mission_name": name, "mission_description": description})
+        if res.status_code == _HTTP_OK:
+            return self.identity_map.get(AsyncSMMMission, self, _parse_redirect_id("mission", res.url), name)
+        return None
+
+    async def create_organization(self, name: str) -> AsyncSMMOrganization:
+        """
+        Create a new organization
+        """
+        res = await self.post("/organization/", {"name": name})
+        try:
+            org_json = res.json()
+            return self.identity_map.get(AsyncSMMOrganization, self, org_json["id"], org_json["name"])
+        except (ValueError, KeyError) as exc:
+            raise SMMParseError("organization", exc) from exc
+
+
+class AsyncSMMObject:
+    # pylint: disable=R0903
+    """
+    Search Management Map - Common base for objects on an AsyncSMMConnection
+    """
+
+    url_prefix = ""
+
+    def __init__(self, connection: AsyncSMMConnection, object_id: int, name: str) -> None:
+        self.connection = connection
+        self.id = object_id
+        self.name = name
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.id})"
+
+    def _url(self, page: str) -> str:
+        return f"{self.url_prefix}/{self.id}/{page}"
+
+
+class AsyncSMMAsset(AsyncSMMObject):
+    """
+    Search Management Map - Asset (asyncio)
+    """
+
+    url_prefix = "/assets"
+
+    async def get_status(self) -> SMMAssetStatus | None:
+        """
+        Retrieves the current status of this asset from the SMM server.
+        """
+        data = await self.connection.get_json(self._url("status/"))
+        return SMMAssetStatus(self, data) if data else None
+
+    async def set_status(self, status: str, notes: str) -> None:
+        """
+        Updates the status of this asset on the SMM server.
+        """
+        await self.connection.post(self._url("status/"), data={"value_id": status, "notes": notes})
+
+    async def get_command(self) -> SMMAssetCommand | None:
+        """
+        Retrieves the command currently assigned to this asset.
+        """
+        data = await self.connection.get_json(self._url("command/"))
+        data = data["command"] if data and "command" in data and "issued" in data["command"] else None
+        return SMMAssetCommand(self, data) if data else None
+
+    async def set_position(
+        self, lat: float, lon: float, fix: int, alt: int | None, heading: int | None
+    ) -> SMMAssetCommand | None:
+        # pylint: disable=R0913,R0917
+        """
+        Updates the geographical position and telemetry of this asset.
+
+        Returns:
+            SMMAssetCommand: The current asset command, if any, returned by the server.
+        """
+        data = await self.connection.post(
+            f"/data/assets/{self.id}/position/add/",
+            data={"lat": lat, "lon": lon, "fix": fix, "alt": alt, "heading": heading},
+        )
+        return _parse_position_command(self, data)
+
+    async def get_next_search(self, lat: float, lon: float) -> AsyncSMMSearch | None:
+        """
+        Get the nearest search for this asset
+        """
+        data = await self.connection.post(
+            "/search/find/closest/", data={"asset_id": self.id, "latitude": lat, "longitude": lon}
+        )
+        search_id = _parse_search_id(data, self.connection.json_decoder)
+        return AsyncSMMSearch(self.connection, search_id) if search_id is not None else None
+
+    async def get_asset_data(self):
+        """
+        Get the current data for this asset
+        """
+        return await self.connection.get_json(self._url(""))
+
+    async def get_mission_data(self):
+        """
+        Get the mission/search context for this asset
+        """
+        return await self.connection.get_json(self._url("mission/"))
+
+
+class AsyncSMMSearch:
+    """
+    Search Management Map - Search (asyncio)
+    """
+
+    def __init__(self, connection: AsyncSMMConnection, search_id: int) -> None:
+        self.connection = connection
+        self.id = search_id
+
+    def _url(self, page: str | None) -> str:
+        return f"/search/{self.id}/{page}" if page else f"/search/{self.id}/"
+
+    async def get_data(self) -> SMMSearchData | None:
+        """
+        Get the data for this search
+        """
+        res = await self.connection.get_json(self._url(None))
+        try:
+            return SMMSearchData(res["features"][0])
+        except KeyError:
+            return None
+
+    async def queue(self, asset: AsyncSMMAsset | None) -> bool:
+        """
+        Queue this search for a specific asset, or just for the asset type
+        """
+        data = {"asset": asset.id} if asset is not None else None
+        res = await self.connection.post(self._url("queue/"), data=data)
+        return res.text == "Success"
+
+    async def begin(self, asset: AsyncSMMAsset) -> SMMSearchData | None:
+        """
+        Begin this search with asset
+        """
+        res = await self.connection.post(self._url("begin/"), data={"asset_id": asset.id})
+        try:
+            return SMMSearchData(res.json()["features"][0])
+        except JSONDecodeError:
+            return None
+
+    async def finished(self, asset: AsyncSMMAsset) -> bool:
+        """
+        Mark this search as finished/completed by asset
+        """
+        res = await self.connection.post(self._url("finished/"), data={"asset_id": asset.id})
+        return res.text == "Completed"
+
+
+class AsyncSMMGeometry:
+    # pylint: disable=R0903
+    """
+    Search Management Map - Parent class for user geometry (asyncio)
+    """
+
+    def __init__(self, mission: AsyncSMMMission, geo_id: int, simplification: SMMSimplification | None = None) -> None:
+        self.connection = mission.connection
+        self.mission = mission
+        self.geo_id = geo_id
+        self.simplification = simplification
+
+    async def _create_search(self, page: str, context: str, data: dict) -> int | None:
+        result = await self.connection.post(page, data={"poi_id": self.geo_id, **data})
+        return _parse_features_pk(result, context, self.connection.json_decoder)
+
+
+class AsyncSMMPoi(AsyncSMMGeometry):
+    """
+    Search Management Map - Point of Interest (asyncio)
+    """
+
+    async def create_sector_search(self, sweep_width: int, asset_type: SMMAssetType) -> int | None:
+        """
+        Create a sector search starting at this POI
+        """
+        return await self._create_search(
+            "search/sector/create/", "sector search", {"asset_type_id": asset_type.id, "sweep_width": sweep_width}
+        )
+
+    async def create_expanding_box_search(
+        self, sweep_width: int, asset_type: SMMAssetType, iterations: int, first_bearing: int = 0
+    ) -> int | None:
+        """
+        Create an expanding box search starting at this POI
+        """
+        return await self._create_search(
+            "search/expandingbox/create/",
+            "expanding box search",
+            {
+                "asset_type_id": asset_type.id,
+                "sweep_width": sweep_width,
+                "iterations": iterations,
+                "first_bearing": first_bearing,
+            },
+        )
+
+
+class AsyncSMMLine(AsyncSMMGeometry):
+    """
+    Search Management Map - Line (asyncio)
+    """
+
+    async def create_shoreline_search(self, sweep_width: int, asset_type: SMMAssetType) -> int | None:
+        """
+        Create a shoreline search along this line
+        """
+        return await self._create_search(
+            "search/shoreline/create/", "shoreline search", {"asset_type_id": asset_type.id, "sweep_width": sweep_width}
+        )
+
+    async def create_trackline_search(self, sweep_width: int, asset_type: SMMAssetType) -> int | None:
+        """
+        Create a trackline search along this line
+        """
+        return await self._create_search(
+            "search/trackline/create/", "trackline search", {"asset_type_id": asset_type.id, "sweep_width": sweep_width}
+        )
+
+    async def create_creepingline_search(self, sweep_width: int, asset_type: SMMAssetType, width: int) -> int | None:
+        """
+        Create a creeping line ahead search along this line
+        """
+        return await self._create_search(
+            "search/creepingline/create/track/",
+            "creeping line search",
+            {"asset_type_id": asset_type.id, "sweep_width": sweep_width, "width": width},
+        )
+
+
+class AsyncSMMPolygon(AsyncSMMGeometry):
+    # pylint: disable=R0903
+    """
+    Search Management Map -- Polygon (asyncio)
+    """
+
+    async def create_creepingline_search(self, sweep_width: int, asset_type: SMMAssetType) -> int | None:
+        """
+        Create a creeping line ahead search inside this polygon
+        """
+        return await self._create_search(
+            "search/creepingline/create/polygon/",
+            "polygon creeping line search",
+            {"asset_type_id": asset_type.id, "sweep_width": sweep_width},
+        )
+
+
+class AsyncSMMMission(AsyncSMMObject):
+    """
+    Represents a specific Search and Rescue mission in SMM (asyncio).
+    """
+
+    url_prefix = "/mission"
+
+    async def post(self, page: str, data: object) -> SMMAsyncResponse:
+        """
+        Performs a POST request to a mission-specific endpoint.
+        """
+        return await self.connection.post(self._url(page), data)
+
+    async def get_json(self, page: str):
+        """
+        Performs a GET request to a mission-specific endpoint and returns JSON.
+        """
+        return await self.connection.get_json(self._url(page))
+
+    async def delete(self, page: str) -> None:
+        """
+        Performs a DELETE request to a mission-specific endpoint.
+        """
+        await self.connection.delete(self._url(page))
+
+    async def add_member(self, user: SMMUser) -> AsyncSMMMissionMember:
+        """
+        Adds a user as a member of this mission.
+        """
+        await self.post("users/add/", data={"user": user.username})
+        return AsyncSMMMissionMember(self, user)
+
+    async def add_organization(self, organization: AsyncSMMOrganization) -> AsyncSMMMissionOrganization:
+        """
+        Adds an organization to this mission.
+        """
+        await self.post("organizations/", data={"organization": organization.id})
+        return AsyncSMMMissionOrganization(self, organization)
+
+    async def get_organizations(self) -> list[AsyncSMMMissionOrganization]:
+        """
+        Get all the current organizations in this mission
+        """
+        data = await self.get_json("organizations/")
+        if "organizations" not in data:
+            raise SMMMissingKeyError("organizations/", "organizations")
+        return [
+            AsyncSMMMissionOrganization(
+                self,
+                self.connection.identity_map.get(
+                    AsyncSMMOrganization,
+                    self.connection,
+                    organization["organization"]["id"],
+                    organization["organization"]["name"],
+                ),
+            )
+            for organization in data["organizations"]
+        ]
+
+    async def add_asset(self, asset: AsyncSMMAsset) -> None:
+        """
+        Add an asset to this mission
+        """
+        await self.post("assets/", data={"asset": asset.id})
+
+    async def remove_asset(self, asset: AsyncSMMAsset) -> None:
+        """
+        Remove an asset from this mission
+        """
+        await self.connection.get(self._url(f"assets/{asset.id}/remove/"))
+
+    async def set_asset_command(
+        self, asset: AsyncSMMAsset, command: str, reason: str, point: SMMPoint | None = None
+    ) -> None:
+        """
+        Set the command for a specific asset
+        """
+        data = {"asset": asset.id, "command": command, "reason": reason}
+        if point is not None:
+            data["latitude"] = point.latitude
+            data["longitude"] = point.longitude
+        await self.post("assets/command/set/", data)
+
+    async def set_asset_status(self, asset: AsyncSMMAsset, status: SMMMissionAssetStatusValue, notes: str) -> None:
+        """
+        Set the status of a specific asset in the mission
+        """
+        await self.post(f"assets/{asset.id}/status/", {"value_id": status.id, "notes": notes})
+
+    async def close(self) -> None:
+        """
+        Close this mission
+        """
+        await self.connection.get(self._url("close/"))
+
+    async def assets(self, include: str = "active") -> list:
+        """
+        Get all the assets in this mission
+
+        Use include="removed" to see get all assets that were ever in the mission
+        """
+        include_removed = str(include == "removed")
+        data = await self.get_json(f"assets/?include_removed={include_removed}")
+        if "assets" not in data:
+            raise SMMMissingKeyError("assets/", "assets")
+        return data["assets"]
+
+    def iter_assets(self, include: str = "active") -> AsyncIterator[dict]:
+        """
+        Iterate over the assets in this mission (async for)
+
+        Use include="removed" to see get all assets that were ever in the mission
+        """
+        include_removed = str(include == "removed")
+        return self.connection.iter_json(self._url(f"assets/?include_removed={include_removed}"), "assets")
+
+    async def add_waypoint(self, point: SMMPoint, label: str) -> AsyncSMMPoi | None:
+        """
+        Add a way point to this mission
+        """
+        results = await self.post("data/pois/create/", {"lat": point.lat, "lon": point.lng, "label": label})
+        pk = _parse_features_pk(results, "mission waypoint", self.connection.json_decoder)
+        return AsyncSMMPoi(self, pk) if pk is not None else None
+
+    async def add_line(
+        self,
+        points: list[SMMPoint] | SMMPointArray,
+        label: str,
+        *,
+        tolerance: float | None = None,
+        simplify_method: str | None = None,
+    ) -> AsyncSMMLine | None:
+        """
+        Add a line to this mission, simplified first if a tolerance (in metres) is given
+        """
+        points, simplification = _simplify_points(points, tolerance, simplify_method, closed=False)
+        results = await self.post("data/userlines/create/", _populate_points(points, label))
+        pk = _parse_features_pk(results, "mission line", self.connection.json_decoder)
+        return AsyncSMMLine(self, pk, simplification) if pk is not None else None
+
+    async def add_polygon(
+        self,
+        points: list[SMMPoint] | SMMPointArray,
+        label: str,
+        *,
+        tolerance: float | None = None,
+        simplify_method: str | None = None,
+    ) -> AsyncSMMPolygon | None:
+        """
+        Add a polygon to this mission, simplified first if a tolerance (in metres) is given
+        """
+        points, simplification = _simplify_points(points, tolerance, simplify_method, closed=True)
+        results = await self.post("data/userpolygons/create/", _populate_points(points, label))
+        pk = _parse_features_pk(results, "mission polygon", self.connection.json_decoder)
+        return AsyncSMMPolygon(self, pk, simplification) if pk is not None else None
+
+    async def import_geometry(
+        self,
+        source: ImportSource,
+        *,
+        file_format: str | None = None,
+        workers: int = 4,
+        on_progress: Callable[[int, int], None] | None = None,
+        tolerance: float | None = None,
+    ) -> SMMImportResult:
+        """
+        Add the waypoints, lines and polygons in a GeoJSON, KML or GPX file to this mission
+
+        See SMMMission.import_geometry; here at most workers uploads run at once as tasks in the event loop.
+        """
+        return await importlib.import_module("smm_client.importer").import_geometry_async(
+            self, source, file_format=file_format, workers=workers, on_progress=on_progress, tolerance=tolerance
+        )
+
+    @classmethod
+    async def get_mission_for_asset(cls, asset: AsyncSMMAsset) -> AsyncSMMMission | None:
+        """
+        Get the current mission for the asset
+        """
+        data = await asset.get_mission_data()
+        try:
+            return asset.connection.identity_map.get(
+                AsyncSMMMission, asset.connection, data["mission_id"], data["mission_name"]
+            )
+        except KeyError:
+            return None
+
+    async def get_external_references(self) -> list[AsyncSMMMissionExternalReference]:
+        """
+        Get all external references for this mission
+        """
+        data = await self.get_json("externalreferences/")
+        if "external_references" not in data:
+            raise SMMMissingKeyError("externalreferences/", "external_references")
+        return [AsyncSMMMissionExternalReference(self, extref) for extref in data["external_references"]]
+
+    async def add_external_reference(self, name: str, code: str | None, url: str | None, notes: str | None) -> None:
+        """
+        Add an external reference to this mission
+        """
+        await self.post("externalreferences/", {"name": name, "code": code, "url": url, "notes": notes})
+
+
+class AsyncSMMOrganization(AsyncSMMObject):
+    """
+    Search Management Map - Organization (asyncio)
+    """
+
+    url_prefix = "/organization"
+
+    def __str__(self) -> str:
+        return self.name
+
+    async def get_members(self) -> list[SMMOrganizationUser]:
+        """
+        Get all the members of this organization
+        """
+        organization = await self.connection.get_json(self._url(""))
+        return _parse_organization_members(self, self._url(""), organization)
+
+    async def iter_members(self) -> AsyncIterator[SMMOrganizationUser]:
+        """
+        Iterate over the members of this organization (async for)
+        """
+        async for member_json in self.connection.iter_json(self._url(""), "members"):
+            yield _parse_organization_member(self, member_json)
+
+    async def add_member(self, user: SMMUser, role: str = "M") -> None:
+        """
+        Add a new member (or update an existing members role)
+        """
+        await self.connection.post(self._url(f"user/{user.username}/"), data={"role": role})
+
+    async def remove_member(self, user: SMMUser) -> None:
+        """
+        Remove a member from this organization
+        """
+        await self.connection.delete(self._url(f"user/{user.username}/"))
+
+    async def get_assets(self) -> list[SMMOrganizationAsset]:
+        """
+        Get all the assets in this organization
+        """
+        data = await self.connection.get_json(self._url("assets/"))
+        return _parse_organization_assets(self, self._url("assets/"), data, AsyncSMMAsset)
+
+    async def add_asset(self, asset: AsyncSMMAsset) -> None:
+        """
+        Add an asset to this organization
+        """
+        await self.connection.post(self._url(f"assets/{asset.id}/"))
+
+    async def remove_asset(self, asset: AsyncSMMAsset) -> None:
+        """
+        Remove an asset from this organization
+        """
+        await self.connection.delete(self._url(f"assets/{asset.id}/"))
@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Mission memberships and external references (asyncio)
+"""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from smm_client.aio import AsyncSMMMission, AsyncSMMOrganization
+    from smm_client.connection import SMMUser
+
+
+class AsyncSMMMissionOrganization:
+    """
+    Search Management Map - Organization membership of a Mission (asyncio)
+    """
+
+    def __init__(self, mission: AsyncSMMMission, organization: AsyncSMMOrganization) -> None:
+        self.mission = mission
+        self.organization = organization
+
+    async def set_can_add_organizations(self, *, value: bool) -> bool:
+        """
+        Set whether this organization can add organizations or not
+        """
+        response = await self.mission.post(f"organizations/{self.organization.id}/", {"add_organization": value})
+        return response.status_code == HTTPStatus.OK
+
+    async def set_can_add_users(self, *, value: bool) -> bool:
+        """
+        Set whether this organization can add members or not
+        """
+        response = await self.mission.post(f"organizations/{self.organization.id}/", {"add_user": value})
+        return response.status_code == HTTPStatus.OK
+
+
+class AsyncSMMMissionMember:
+    """
+    Search Management Map - User membership of a Mission (asyncio)
+    """
+
+    def __init__(self, mission: AsyncSMMMission, user: SMMUser) -> None:
+        self.mission = mission
+        self.user = user
+
+    async def set_is_admin(self, *, value: bool) -> bool:
+        """
+        Set whether this user is an admin or not
+        Admins have all other permissions as well
+        """
+        response = await self.mission.post(f"users/{self.user.id}/", {"admin": value})
+        return response.status_code == HTTPStatus.OK
+
+    async def set_can_add_organizations(self, *, value: bool) -> bool:
+        """
+        Set whether this user can add organizations or not
+        """
+        response = await self.mission.post(f"users/{self.user.id}/", {"add_organization": value})
+        return response.status_code == HTTPStatus.OK
+
+    async def set_can_add_users(self, *, value: bool) -> bool:
+        """
+        Set whether this user can add members or not
+        """
+        response = await self.mission.post(f"users/{self.user.id}/", {"add_user": value})
+        return response.status_code == HTTPStatus.OK
+
+
+class AsyncSMMMissionExternalReference:
+    """
+    Search Management Map - External Reference for Mission (asyncio)
+    """
+
+    def __init__(self, mission: AsyncSMMMission, data) -> None:
+        self.mission = mission
+        self.id, self.name, self.code, self.url, self.notes = (
+            data[key] for key in ("id", "name", "code", "url", "notes")
+        )
+
+    async def delete(self) -> None:
+        """
+        Remove this reference
+        """
+        await self.mission.delete(f"externalreferences/{self.id}/")
+
+    async def update(self, name, code, url, notes) -> None:
+        """
+        Update this reference
+        """
+        await self.mission.post(
+            f"externalreferences/{self.id}/", {"name": name, "code": code, "url": url, "notes": notes}
+        )
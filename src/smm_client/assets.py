@@ -8,10 +8,15 @@ Search Management Map - Assets
 from __future__ import annotations
 
 from json import JSONDecodeError
+from typing import TYPE_CHECKING
 
+from smm_client.attributes import SMMCachedAttributes, cached_attribute
 from smm_client.search import SMMSearch
 from smm_client.types import SMMMalformedDataError, SMMPoint
 
+if TYPE_CHECKING:
+    from smm_client.decoding import SMMJSONDecoder
+
 
 class SMMAssetStatusValue:
     # pylint: disable=R0903
@@ -75,10 +80,29 @@ class SMMAssetCommand:
         return f"Command '{self.command}' issued to {self.asset.name} at {self.issued}: {self.reason}"
 
 
-class SMMAsset:
-    # pylint: disable=R0903
+def _parse_position_command(asset, response) -> SMMAssetCommand | None:
+    try:
+        return SMMAssetCommand(asset, asset.connection.json_decoder.loads(response.content))
+    except JSONDecodeError:
+        return None
+
+
+def _parse_search_id(response, decoder: SMMJSONDecoder) -> str | None:
+    try:
+        json_data = decoder.loads(response.content)
+        if "object_url" not in json_data:
+            return None
+        return list(filter(len, json_data["object_url"].split("/")))[-1]
+    except (JSONDecodeError, KeyError, IndexError):
+        return None
+
+
+class SMMAsset(SMMCachedAttributes):
     """
     Search Management Map - Asset
+
+    details, mission_data and status are fetched on first access and cached (see SMMCachedAttributes);
+    set_status() and set_position() invalidate them.
     """
 
     def __init__(self, connection, asset_id: int, name: str) -> None:
@@ -114,6 +138,7 @@ class SMMAsset:
                 "notes": notes,
             },
         )
+        self.invalidate("status", "details")
 
     def get_command(self) -> SMMAssetCommand | None:
         """
@@ -147,10 +172,8 @@ class SMMAsset:
             f"/data/assets/{self.id}/position/add/",
             data={"lat": lat, "lon": lon, "fix": fix, "alt": alt, "heading": heading},
         )
-        try:
-            return SMMAssetCommand(self, data.json())
-        except JSONDecodeError:
-            return None
+        self.invalidate("details")
+        return _parse_position_command(self, data)
 
     def get_next_search(self, lat: float, lon: float) -> SMMSearch | None:
         """
@@ -160,14 +183,8 @@ class SMMAsset:
         data = self.connection.post(
             "/search/find/closest/", data={"asset_id": self.id, "latitude": lat, "longitude": lon}
         )
-        try:
-            json_data = data.json()
-            if "object_url" not in json_data:
-                return None
-            search_id = list(filter(len, json_data["object_url"].split("/")))[-1]
-            return SMMSearch(self.connection, search_id)
-        except (JSONDecodeError, KeyError, IndexError):
-            return None
+        search_id = _parse_search_id(data, self.connection.json_decoder)
+        return SMMSearch(self.connection, search_id) if search_id is not None else None
 
     def get_asset_data(self):
         """
@@ -181,6 +198,27 @@ class SMMAsset:
         """
         return self.connection.get_json(self.__url_component("mission/"))
 
+    @cached_attribute
+    def details(self):
+        """
+        The current data for this asset (get_asset_data()), cached
+        """
+        return self.get_asset_data()
+
+    @cached_attribute
+    def mission_data(self):
+        """
+        The mission/search context for this asset (get_mission_data()), cached
+        """
+        return self.get_mission_data()
+
+    @cached_attribute
+    def status(self) -> SMMAssetStatus | None:
+        """
+        The current status of this asset (get_status()), cached
+        """
+        return self.get_status()
+
     def __str__(self) -> str:
         return f"{self.name} ({self.id})"
 
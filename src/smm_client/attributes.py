@@ -0,0 +1,125 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Lazily fetched, cached object attributes
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable
+
+_CACHE_ATTRIBUTE = "_attribute_cache"
+
+
+class _AttributeCache:
+    # pylint: disable=R0903
+    """
+    The fetched values of one object's cached attributes, with when they were fetched
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.values: dict[str, tuple[float, Any]] = {}
+        # Bumped by every invalidation, so a fetch that overlaps one doesn't store what it read
+        self.generation = 0
+
+
+def _cache(obj) -> _AttributeCache:
+    cache = obj.__dict__.get(_CACHE_ATTRIBUTE)
+    if cache is None:
+        # setdefault is atomic, so racing threads end up sharing one cache
+        cache = obj.__dict__.setdefault(_CACHE_ATTRIBUTE, _AttributeCache())
+    return cache
+
+
+class cached_attribute:  # noqa: N801
+    # pylint: disable=C0103,R0903
+    """
+    Decorator for a method that fetches a value from the server, turning it into an attribute that is fetched
+    on first access and reused until it is max_age seconds old (see SMMCachedAttributes)
+    """
+
+    def __init__(self, fetch: Callable[[Any], Any]) -> None:
+        self.fetch = fetch
+        self.name = fetch.__name__
+        self.__doc__ = fetch.__doc__
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj, owner: type | None = None):
+        if obj is None:
+            return self
+        cache = _cache(obj)
+        with cache.lock:
+            entry = cache.values.get(self.name)
+            generation = cache.generation
+        max_age = obj.max_age
+        if entry is not None and time.monotonic() - entry[0] < max_age:
+            return entry[1]
+        fetched = time.monotonic()
+        value = self.fetch(obj)
+        if max_age > 0:
+            with cache.lock:
+                if cache.generation == generation:
+                    cache.values[self.name] = (fetched, value)
+        return value
+
+
+class SMMCachedAttributes:
+    """
+    Mixin for objects with cached_attribute attributes
+
+    The maximum age of the cached values is the connection's attribute_ttl, unless max_age is set on the
+    object. Methods that change the object on the server call invalidate() so the next access fetches
+    the new value.
+    """
+
+    connection: Any
+    _max_age: float | None = None
+
+    @property
+    def max_age(self) -> float:
+        """
+        Seconds a cached attribute is reused for; 0 fetches it on every access
+        """
+        if self._max_age is not None:
+            return self._max_age
+        return getattr(self.connection, "attribute_ttl", 0.0)
+
+    @max_age.setter
+    def max_age(self, value: float | None) -> None:
+        self._max_age = value
+
+    def invalidate(self, *names: str) -> None:
+        """
+        Forget the cached values of the attributes named (all of them if none are), so they are fetched again
+        """
+        cache = _cache(self)
+        with cache.lock:
+            cache.generation += 1
+            if names:
+                for name in names:
+                    cache.values.pop(name, None)
+            else:
+                cache.values.clear()
+
+    def refresh(self, *names: str) -> None:
+        """
+        Fetch the attributes named (all of them if none are) from the server now
+        """
+        self.invalidate(*names)
+        for name in names or _cached_attribute_names(type(self)):
+            getattr(self, name)
+
+
+def _cached_attribute_names(cls: type) -> list[str]:
+    return [
+        name
+        for klass in reversed(cls.__mro__)
+        for name, value in vars(klass).items()
+        if isinstance(value, cached_attribute)
+    ]
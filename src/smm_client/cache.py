@@ -0,0 +1,80 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Reference data cache
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Iterable
+
+
+class SMMReferenceCache:
+    """
+    Time limited cache of reference data (asset types, status values, organizations), indexed by name
+
+    Each kind of reference data is stored as a complete list fetched from the server, so a name
+    that is missing from a fresh entry does not exist on the server (as far as this client knows).
+    """
+
+    ASSET_TYPES = "asset_types"
+    ASSET_STATUS_VALUES = "asset_status_values"
+    MISSION_ASSET_STATUS_VALUES = "mission_asset_status_values"
+    ORGANIZATIONS = "organizations"
+
+    def __init__(self, ttl: float = 60.0) -> None:
+        """
+        Args:
+            ttl (float): Seconds a fetched list stays fresh. 0 disables caching.
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[float, dict[str, object]]] = {}
+
+    def is_fresh(self, kind: str) -> bool:
+        """
+        Check if the list for kind was fetched within the ttl
+        """
+        with self._lock:
+            entry = self._entries.get(kind)
+            return entry is not None and time.monotonic() - entry[0] < self.ttl
+
+    def lookup(self, kind: str, name: str):
+        """
+        Find the cached object of kind with this name, or None
+        """
+        with self._lock:
+            entry = self._entries.get(kind)
+            return entry[1].get(name) if entry is not None else None
+
+    def store(self, kind: str, objects: Iterable) -> None:
+        """
+        Replace the cached list for kind with objects fetched from the server
+        """
+        index: dict[str, object] = {}
+        for obj in objects:
+            index.setdefault(obj.name, obj)
+        with self._lock:
+            self._entries[kind] = (time.monotonic(), index)
+
+    def add(self, kind: str, obj) -> None:
+        """
+        Add a newly created object to the cached list for kind
+        """
+        with self._lock:
+            entry = self._entries.get(kind)
+            if entry is not None:
+                entry[1].setdefault(obj.name, obj)
+
+    def invalidate(self, kind: str | None = None) -> None:
+        """
+        Drop the cached list for kind, or everything if kind is None
+        """
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(kind, None)
@@ -0,0 +1,388 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Command line batch tool
+
+Reads one JSON operation per line, e.g.
+
+    {"op": "set_position", "asset": 12, "lat": -43.5, "lon": 172.6, "fix": 3}
+    {"op": "add_waypoint", "mission": "Flood response", "lat": -43.51, "lon": 172.61, "label": "Car"}
+
+and runs them over one logged in connection, writing one JSON result per line as each finishes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import getpass
+import itertools
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable
+
+from smm_client.assets import SMMAsset
+from smm_client.connection import SMMConnection
+from smm_client.missions import SMMMission, SMMMissionAssetStatusValue
+from smm_client.search import SMMSearch
+from smm_client.session_store import SMMSessionStore
+from smm_client.snapshot import _command_json, _status_json
+from smm_client.types import SMMPoint
+
+if TYPE_CHECKING:
+    from smm_client.geometry import SMMGeometry
+
+# Operations queued per worker before reading more input waits
+_QUEUE_DEPTH = 64
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+
+class SMMBatchContext:
+    """
+    The connection a batch runs on, and the assets and missions its operations refer to
+
+    Assets and missions can be given by id, or by name (looked up once, on first use). The objects are kept for
+    the whole batch, so state such as cached attributes is shared between operations.
+    """
+
+    def __init__(self, connection: SMMConnection) -> None:
+        self.connection = connection
+        self._lock = threading.Lock()
+        self._objects: dict[tuple[type, int], Any] = {}
+        self._names: dict[type, dict[str, Any]] = {}
+
+    def _by_id(self, cls: type, object_id: int):
+        with self._lock:
+            obj = self._objects.get((cls, object_id))
+            if obj is None:
+                # The name is only a placeholder until something fetches the real one
+                identity_map = self.connection.identity_map
+                obj = identity_map.peek(cls, object_id) or identity_map.get(
+                    cls, self.connection, object_id, str(object_id)
+                )
+                self._objects[(cls, object_id)] = obj
+            return obj
+
+    def _by_name(self, cls: type, name: str, fetch: Callable[[], Iterable]):
+        with self._lock:
+            names = self._names.get(cls)
+            if names is None:
+                names = self._names[cls] = {obj.name: obj for obj in fetch()}
+        if name not in names:
+            msg = f"No {cls.__name__} named {name!r}"
+            raise LookupError(msg)
+        return names[name]
+
+    def asset(self, ref: int | str) -> SMMAsset:
+        """
+        The asset with id ref, or named ref
+        """
+        if isinstance(ref, int):
+            return self._by_id(SMMAsset, ref)
+        return self._by_name(SMMAsset, ref, self.connection.get_assets)
+
+    def mission(self, ref: int | str) -> SMMMission:
+        """
+        The mission with id ref, or named ref
+        """
+        if isinstance(ref, int):
+            return self._by_id(SMMMission, ref)
+        return self._by_name(SMMMission, ref, self.connection.get_missions)
+
+
+def _geometry_json(geometry: SMMGeometry | None) -> dict | None:
+    return {"id": geometry.geo_id} if geometry is not None else None
+
+
+def _points(operation: dict) -> list[SMMPoint]:
+    return [SMMPoint(lat, lon) for lat, lon in operation["points"]]
+
+
+def _set_position(context: SMMBatchContext, operation: dict):
+    asset = context.asset(operation["asset"])
+    command = asset.set_position(
+        operation["lat"], operation["lon"], operation.get("fix", 0), operation.get("alt"), operation.get("heading")
+    )
+    return _command_json(command)
+
+
+def _set_status(context: SMMBatchContext, operation: dict) -> None:
+    context.asset(operation["asset"]).set_status(operation["status"], operation.get("notes", ""))
+
+
+def _get_status(context: SMMBatchContext, operation: dict):
+    return _status_json(context.asset(operation["asset"]).get_status())
+
+
+def _get_command(context: SMMBatchContext, operation: dict):
+    return _command_json(context.asset(operation["asset"]).get_command())
+
+
+def _next_search(context: SMMBatchContext, operation: dict):
+    search = context.asset(operation["asset"]).get_next_search(operation["lat"], operation["lon"])
+    return {"id": search.id} if search is not None else None
+
+
+def _set_command(context: SMMBatchContext, operation: dict) -> None:
+    point = SMMPoint(operation["lat"], operation["lon"]) if "lat" in operation else None
+    context.mission(operation["mission"]).set_asset_command(
+        context.asset(operation["asset"]), operation["command"], operation.get("reason", ""), point
+    )
+
+
+def _set_mission_asset_status(context: SMMBatchContext, operation: dict) -> None:
+    status = SMMMissionAssetStatusValue(operation["status"], "", "")
+    context.mission(operation["mission"]).set_asset_status(
+        context.asset(operation["asset"]), status, operation.get("notes", "")
+    )
+
+
+def _add_asset(context: SMMBatchContext, operation: dict) -> None:
+    context.mission(operation["mission"]).add_asset(context.asset(operation["asset"]))
+
+
+def _remove_asset(context: SMMBatchContext, operation: dict) -> None:
+    context.mission(operation["mission"]).remove_asset(context.asset(operation["asset"]))
+
+
+def _add_waypoint(context: SMMBatchContext, operation: dict):
+    point = SMMPoint(operation["lat"], operation["lon"])
+    return _geometry_json(context.mission(operation["mission"]).add_waypoint(point, operation.get("label", "")))
+
+
+def _add_line(context: SMMBatchContext, operation: dict):
+    mission = context.mission(operation["mission"])
+    return _geometry_json(
+        mission.add_line(_points(operation), operation.get("label", ""), tolerance=operation.get("tolerance"))
+    )
+
+
+def _add_polygon(context: SMMBatchContext, operation: dict):
+    mission = context.mission(operation["mission"])
+    return _geometry_json(
+        mission.add_polygon(_points(operation), operation.get("label", ""), tolerance=operation.get("tolerance"))
+    )
+
+
+def _queue_search(context: SMMBatchContext, operation: dict) -> bool:
+    asset = context.asset(operation["asset"]) if operation.get("asset") is not None else None
+    return SMMSearch(context.connection, operation["search"]).queue(asset)
+
+
+def _finish_search(context: SMMBatchContext, operation: dict) -> bool:
+    return SMMSearch(context.connection, operation["search"]).finished(context.asset(operation["asset"]))
+
+
+OPERATIONS: dict[str, Callable[[SMMBatchContext, dict], Any]] = {
+    "set_position": _set_position,
+    "set_status": _set_status,
+    "get_status": _get_status,
+    "get_command": _get_command,
+    "next_search": _next_search,
+    "set_command": _set_command,
+    "set_mission_asset_status": _set_mission_asset_status,
+    "add_asset": _add_asset,
+    "remove_asset": _remove_asset,
+    "add_waypoint": _add_waypoint,
+    "add_line": _add_line,
+    "add_polygon": _add_polygon,
+    "queue_search": _queue_search,
+    "finish_search": _finish_search,
+}
+
+
+def run_operation(context: SMMBatchContext, operation: dict):
+    """
+    Run one operation, returning its JSON result
+
+    Raises:
+        LookupError: The operation is unknown, is missing a field or names an unknown asset/mission.
+        SMMRequestError: The request failed.
+    """
+    name = operation.get("op")
+    handler = OPERATIONS.get(name)  # type: ignore[arg-type]
+    if handler is None:
+        msg = f"Unknown operation: {name!r}"
+        raise LookupError(msg)
+    try:
+        return handler(context, operation)
+    except KeyError as exc:
+        msg = f"{name}: missing field {exc}"
+        raise LookupError(msg) from exc
+
+
+class SMMBatch:
+    # pylint: disable=R0902
+    """
+    Runs operations on a fixed number of worker threads, writing a JSON result line for each as it finishes
+
+    Operations on the same asset (or, for those without one, the same mission) always go to the same worker,
+    so they run in the order given; everything else runs concurrently.
+    """
+
+    def __init__(self, context: SMMBatchContext, output: IO[str], workers: int) -> None:
+        self.context = context
+        self.output = output
+        self.succeeded = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._next = itertools.cycle(range(workers))
+        self._queues: list[queue.Queue] = [queue.Queue(_QUEUE_DEPTH) for _ in range(workers)]
+        self._threads = [
+            threading.Thread(target=self._run, args=(work,), name=f"smm-batch-{i}", daemon=True)
+            for i, work in enumerate(self._queues)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, line: int, operation: dict) -> None:
+        """
+        Queue operation (read from input line), waiting if its worker is too far behind
+
+        An operation whose asset or mission isn't an id or a name is reported as failed instead.
+        """
+        field = "asset" if "asset" in operation else "mission"
+        key = operation.get(field)
+        if key is not None and (isinstance(key, bool) or not isinstance(key, (int, str))):
+            self.fail(line, f"{field} must be an id or a name, not {json.dumps(key)}")
+            return
+        index = hash(key) % len(self._queues) if key is not None else next(self._next)
+        self._queues[index].put((line, operation))
+
+    def fail(self, line: int, error: str) -> None:
+        """
+        Report an input line that couldn't be run
+        """
+        self._write({"line": line, "ok": False, "error": error})
+
+    def close(self) -> None:
+        """
+        Wait for every queued operation to finish
+        """
+        for work in self._queues:
+            work.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self, work: queue.Queue) -> None:
+        while True:
+            item = work.get()
+            if item is None:
+                return
+            line, operation = item
+            result: dict[str, Any] = {"line": line, "op": operation.get("op")}
+            if "id" in operation:
+                result["id"] = operation["id"]
+            try:
+                value = run_operation(self.context, operation)
+            except Exception as exc:  # noqa: BLE001 # pylint: disable=W0718
+                result.update(ok=False, error=str(exc), type=type(exc).__name__)
+            else:
+                result.update(ok=True, result=value)
+            self._write(result)
+
+    def _write(self, result: dict) -> None:
+        text = json.dumps(result, default=str)
+        with self._lock:
+            if result["ok"]:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            self.output.write(text + "\n")
+            self.output.flush()
+
+
+def run_batch(context: SMMBatchContext, lines: Iterable[str], output: IO[str], workers: int) -> SMMBatch:
+    """
+    Run the JSON operations in lines (blank lines are skipped) on workers threads, writing the results to output
+    """
+    batch = SMMBatch(context, output, workers)
+    try:
+        for number, text in enumerate(lines, 1):
+            if not text.strip():
+                continue
+            try:
+                operation = json.loads(text)
+            except ValueError as exc:
+                batch.fail(number, f"Invalid JSON: {exc}")
+                continue
+            if not isinstance(operation, dict):
+                batch.fail(number, "Operation is not a JSON object")
+                continue
+            batch.submit(number, operation)
+    finally:
+        batch.close()
+    return batch
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="smm",
+        description="Run Search Management Map operations, one JSON object per line, over a single session. "
+        f"Operations: {', '.join(OPERATIONS)}.",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file of operations (default: stdin)")
+    parser.add_argument("--url", default=os.environ.get("SMM_URL"), help="server URL (default: $SMM_URL)")
+    parser.add_argument("--username", default=os.environ.get("SMM_USERNAME"), help="username (default: $SMM_USERNAME)")
+    parser.add_argument("--session", help="file to keep the session in between runs, to skip logging in")
+    parser.add_argument("-j", "--concurrency", type=int, default=8, help="operations run at once (default: 8)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="don't write a summary to stderr")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    The smm command; the password is read from $SMM_PASSWORD, or prompted for
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if not args.url or not args.username:
+        parser.error("--url and --username (or $SMM_URL and $SMM_USERNAME) are required")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    try:
+        lines = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")  # noqa: SIM115 # pylint: disable=R1732
+    except OSError as exc:
+        sys.stderr.write(f"smm: can't read {args.input}: {exc.strerror or exc}\n")
+        return EXIT_USAGE
+    try:
+        return _run(args, lines)
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+
+
+def _run(args: argparse.Namespace, lines: IO[str]) -> int:
+    password = os.environ.get("SMM_PASSWORD") or getpass.getpass(f"Password for {args.username}: ")
+    started = time.monotonic()
+    try:
+        connection = SMMConnection(
+            args.url,
+            args.username,
+            password,
+            pool_maxsize=args.concurrency,
+            session_store=SMMSessionStore(args.session) if args.session else None,
+        )
+    except Exception as exc:  # noqa: BLE001 # pylint: disable=W0718
+        sys.stderr.write(f"smm: can't connect to {args.url}: {exc}\n")
+        return EXIT_USAGE
+    batch = run_batch(SMMBatchContext(connection), lines, sys.stdout, args.concurrency)
+    if not args.quiet:
+        elapsed = time.monotonic() - started
+        total = batch.succeeded + batch.failed
+        sys.stderr.write(
+            f"smm: {batch.succeeded} succeeded, {batch.failed} failed in {elapsed:.2f}s "
+            f"({total / elapsed if elapsed else 0:.0f} operations/s)\n"
+        )
+    return EXIT_FAILED if batch.failed else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
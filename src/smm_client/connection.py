@@ -7,11 +7,22 @@ Search Management Map Connection Handlers
 
 from __future__ import annotations
 
+import importlib
+import threading
+import time
+from typing import TYPE_CHECKING, Iterable, Iterator
+from urllib.parse import urlsplit
+
 import requests
 
 from smm_client.assets import SMMAsset, SMMAssetStatusValue, SMMAssetType
+from smm_client.cache import SMMReferenceCache
+from smm_client.decoding import JSON_AUTO, SMMJSONDecoder, get_json_decoder
+from smm_client.identity import SMMIdentityMap
+from smm_client.metrics import endpoint_template
 from smm_client.missions import SMMMission, SMMMissionAssetStatusValue
 from smm_client.organizations import SMMOrganization
+from smm_client.transport import SMMCookieJar, SMMHTTPAdapter
 from smm_client.types import (
     SMMCSRFTokenError,
     SMMDeleteCSRFError,
@@ -23,10 +34,20 @@ from smm_client.types import (
     SMMParseError,
     SMMPostCSRFError,
     SMMPostHTTPError,
+    SMMRequestError,
     SMMUnexpectedRedirectError,
 )
 
+if TYPE_CHECKING:
+    from smm_client.fleet import SMMFleetReport
+    from smm_client.http_cache import SMMResponseCache
+    from smm_client.metrics import SMMInstrumentation
+    from smm_client.ratelimit import SMMRateLimiter
+    from smm_client.session_store import SMMSessionStore
+    from smm_client.watch import SMMWatcher
+
 _MIN_REDIRECT_URL_PARTS = 3
+_LOGIN_PATH = "/accounts/login/"
 
 
 def _parse_redirect_id(resource: str, url: str) -> int:
@@ -36,6 +57,37 @@ def _parse_redirect_id(resource: str, url: str) -> int:
     return int(url_parts[-_MIN_REDIRECT_URL_PARTS])
 
 
+def _body_size(body) -> int:
+    if isinstance(body, str):
+        return len(body.encode())
+    if isinstance(body, bytes):
+        return len(body)
+    return 0
+
+
+def _response_size(response: requests.Response, *, stream: bool) -> int:
+    if not stream:
+        return len(response.content)
+    try:
+        return int(response.headers.get("Content-Length", 0))
+    except ValueError:
+        return 0
+
+
+def _session_expired(response) -> bool:
+    """
+    Check if the server rejected a request because the session or CSRF token is no longer valid
+
+    Works for requests.Response and the aio module's SMMAsyncResponse.
+    """
+    if response.status_code == requests.codes["unauthorized"]:
+        return True
+    if response.status_code == requests.codes["forbidden"]:
+        return b"CSRF" in response.content
+    # Views that need a login redirect expired sessions to the login page
+    return bool(response.history) and urlsplit(response.url).path.endswith(_LOGIN_PATH)
+
+
 # pylint: disable = R0903
 class SMMUser:
     """
@@ -48,12 +100,35 @@ class SMMUser:
 
 
 class SMMConnection:
-    # pylint: disable=R0904
+    # pylint: disable=R0902,R0904
     """
     Manages the connection and authentication to a Search Management Map (SMM) server.
+
+    A connection can be shared between threads. Size the connection pool (pool_maxsize) to the
+    number of threads making requests at once, otherwise connections beyond the pool size are
+    opened and discarded for every request (or, with pool_block=True, threads wait for a free one).
     """
 
-    def __init__(self, url: str, username: str, password: str) -> None:
+    def __init__(
+        self,
+        url: str,
+        username: str,
+        password: str,
+        *,
+        reference_ttl: float = 60.0,
+        attribute_ttl: float = 5.0,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        tcp_keepalive: bool = True,
+        reauthenticate: bool = True,
+        session_store: SMMSessionStore | None = None,
+        instrumentation: SMMInstrumentation | None = None,
+        response_cache: SMMResponseCache | None = None,
+        json_decoder: str | SMMJSONDecoder = JSON_AUTO,
+        rate_limiter: SMMRateLimiter | None = None,
+    ) -> None:
+        # pylint: disable=R0913,R0914
         """
         Initializes the connection and logs in to the SMM server.
 
@@ -61,12 +136,174 @@ class SMMConnection:
             url (str): The base URL of the SMM server.
             username (str): The username for authentication.
             password (str): The password for authentication.
+            reference_ttl (float): Seconds the get_or_create_* methods reuse fetched reference data. 0 disables.
+            attribute_ttl (float): Seconds cached asset/mission attributes (e.g. SMMAsset.status) are reused. 0 disables.
+            pool_connections (int): Number of per-host connection pools to keep.
+            pool_maxsize (int): Maximum number of connections kept open to the server.
+            pool_block (bool): Wait for a free pooled connection instead of opening an extra one.
+            tcp_keepalive (bool): Enable TCP keep-alive on pooled connections.
+            reauthenticate (bool): Log in again and retry once when the server rejects an expired session.
+            session_store (SMMSessionStore, optional): Reuse a stored session instead of logging in, and store
+                new sessions in it. The stored session is only checked when the first request is made.
+            instrumentation (SMMInstrumentation, optional): Receives the endpoint, status, latency and sizes of
+                every request, e.g. an SMMMetrics. Can also be set later through the instrumentation attribute.
+            response_cache (SMMResponseCache, optional): Revalidate and reuse get_json responses with
+                ETag/Last-Modified conditional requests.
+            json_decoder (str | SMMJSONDecoder): How responses are decoded: "orjson", "json" (the standard library)
+                or "auto" (orjson if it is installed), see smm_client.decoding.
+            rate_limiter (SMMRateLimiter, optional): Limit the request rate per endpoint class and adapt the number
+                of requests in flight to how the server copes, see smm_client.ratelimit.
         """
         self.base_url = url
         self.username = username
         self.password = password
         self.session = requests.Session()
-        self.login()
+        self.session.cookies = SMMCookieJar()
+        adapter = SMMHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            tcp_keepalive=tcp_keepalive,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.pool_maxsize = pool_maxsize
+        self.reference_cache = SMMReferenceCache(reference_ttl)
+        self.attribute_ttl = attribute_ttl
+        self.reauthenticate = reauthenticate
+        self._login_lock = threading.RLock()
+        self._login_generation = 0
+        self.session_store = session_store
+        self.instrumentation = instrumentation
+        self.response_cache = response_cache
+        self.json_decoder = get_json_decoder(json_decoder)
+        self.rate_limiter = rate_limiter
+        self.identity_map = SMMIdentityMap()
+        if not self._restore_session():
+            self.login()
+
+    def _restore_session(self) -> bool:
+        """
+        Load the session from the session store, returning False if there isn't one to use
+
+        A stored session may have expired, so it's only used when requests can log in again.
+        """
+        if self.session_store is None or not self.reauthenticate:
+            return False
+        cookies = self.session_store.load(self.base_url, self.username)
+        if not any(cookie.name == "sessionid" for cookie in cookies):
+            return False
+        for cookie in cookies:
+            self.session.cookies.set_cookie(cookie)
+        return True
+
+    def _send(self, method: str, url: str, csrf_error: type[SMMRequestError] | None, headers=None, **kwargs):
+        if csrf_error is not None:
+            csrftoken = self.session.cookies.value("csrftoken")
+            if csrftoken is None:
+                # Another thread logging in again clears the jar until the server sets a new token; wait for it
+                with self._login_lock:
+                    csrftoken = self.session.cookies.value("csrftoken")
+            if csrftoken is None:
+                raise csrf_error
+            headers = {**(headers or {}), "X-CSRFToken": csrftoken}
+        return self.session.request(method, url, headers=headers, **kwargs)
+
+    def _request(
+        self,
+        method: str,
+        path: str | None,
+        *,
+        csrf_error: type[SMMRequestError] | None = None,
+        reauthenticate: bool = True,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send a request, logging in again and replaying it once if the session has expired
+        """
+        url = f"{self.base_url}/{path}" if path else self.base_url
+        generation = self._login_generation
+        response = self._attempt(method, path, url, csrf_error, kwargs)
+        if reauthenticate and self.reauthenticate and _session_expired(response):
+            response.close()
+            self._relogin(generation)
+            response = self._attempt(method, path, url, csrf_error, kwargs, retry=True)
+        return response
+
+    def _attempt(
+        self,
+        method: str,
+        path: str | None,
+        url: str,
+        csrf_error: type[SMMRequestError] | None,
+        kwargs: dict,
+        *,
+        retry: bool = False,
+    ) -> requests.Response:
+        # pylint: disable=R0913
+        """
+        Send a request, waiting for the rate limiter (if any) first
+        """
+        limiter = self.rate_limiter
+        if limiter is None:
+            return self._instrumented(method, path, url, csrf_error, kwargs, retry=retry)
+        permit = limiter.acquire(method, path)
+        try:
+            response = self._instrumented(method, path, url, csrf_error, kwargs, retry=retry)
+        except requests.RequestException:
+            # No response (connection error, timeout): a sign the server may be overloaded
+            permit.done(None)
+            raise
+        except BaseException:
+            # Anything else (e.g. a missing CSRF token, raised before sending) says nothing about the server
+            permit.cancel()
+            raise
+        permit.done(response.status_code, response.headers.get("Retry-After"))
+        return response
+
+    def _instrumented(
+        self,
+        method: str,
+        path: str | None,
+        url: str,
+        csrf_error: type[SMMRequestError] | None,
+        kwargs: dict,
+        *,
+        retry: bool = False,
+    ) -> requests.Response:
+        # pylint: disable=R0913
+        """
+        Send a request, reporting it to the instrumentation (if any)
+        """
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return self._send(method, url, csrf_error, **kwargs)
+        start = time.perf_counter()
+        try:
+            response = self._send(method, url, csrf_error, **kwargs)
+        except Exception:
+            instrumentation.record(
+                method, endpoint_template(path), None, time.perf_counter() - start, 0, 0, retry=retry
+            )
+            raise
+        instrumentation.record(
+            method,
+            endpoint_template(path),
+            response.status_code,
+            response.elapsed.total_seconds(),
+            _body_size(response.request.body),
+            _response_size(response, stream=kwargs.get("stream", False)),
+            retry=retry,
+        )
+        return response
+
+    def _relogin(self, generation: int) -> None:
+        """
+        Log in again, unless another thread already has since the failed request was sent
+        """
+        with self._login_lock:
+            if self._login_generation == generation:
+                self.login()
 
     def get(self, path=None) -> requests.Response:
         """
@@ -78,8 +315,7 @@ class SMMConnection:
         Returns:
             requests.Response: The response from the server.
         """
-        url = f"{self.base_url}/{path}" if path else self.base_url
-        return self.session.get(url)
+        return self._request("GET", path)
 
     def get_json(self, path: str):
         """
@@ -88,21 +324,66 @@ class SMMConnection:
         Args:
             path (str): The path to request, relative to the base URL.
 
+        With a response_cache, a previously fetched response is revalidated with the server and reused
+        (without downloading or decoding it again) if it hasn't changed.
+
         Returns:
             dict: The parsed JSON response.
 
         Raises:
             SMMRequestError: If the request fails or returns non-JSON content.
         """
-        url = f"{self.base_url}/{path}"
-        response = self.session.get(url, headers={"Accept": "application/json"})
+        cache = self.response_cache
+        if cache is None:
+            response = self._request("GET", path, headers={"Accept": "application/json"})
+            return self._decode_json(path, response)
+        key = f"{self.username}@{self.base_url}/{path}"
+        cached = cache.get(key, self.json_decoder)
+        headers = {"Accept": "application/json", **(cached.validators() if cached is not None else {})}
+        response = self._request("GET", path, headers=headers)
+        if cached is not None and response.status_code == requests.codes["not_modified"]:
+            cache.revalidated(key)
+            return cached.data
+        data = self._decode_json(path, response)
+        cache.store(key, response, data)
+        return data
+
+    def _decode_json(self, path: str, response: requests.Response):
+        try:
+            response.raise_for_status()
+            return self.json_decoder.loads(response.content)
+        except requests.HTTPError as exc:
+            raise SMMGetHTTPError(path, exc) from exc
+        except ValueError as exc:
+            raise SMMJSONDecodeError(path, exc) from exc
+
+    def iter_json(self, path: str, key: str, chunk_size: int = 65536) -> Iterator:
+        """
+        Performs a GET request and yields the items of the key array in the JSON response.
+
+        The response body is streamed and parsed as it arrives, so only one item is held in memory at a time.
+
+        Args:
+            path (str): The path to request, relative to the base URL.
+            key (str): The key of the array in the top-level JSON object.
+            chunk_size (int): Number of bytes to read from the response at a time.
+
+        Raises:
+            SMMRequestError: If the request fails, returns non-JSON content or has no key array.
+        """
+        iter_json_array = importlib.import_module("smm_client.streaming").iter_json_array
+        response = self._request("GET", path, headers={"Accept": "application/json"}, stream=True)
         try:
             response.raise_for_status()
-            return response.json()
+            yield from iter_json_array(response.iter_content(chunk_size), key)
         except requests.HTTPError as exc:
             raise SMMGetHTTPError(path, exc) from exc
+        except KeyError as exc:
+            raise SMMMissingKeyError(path, key) from exc
         except ValueError as exc:
             raise SMMJSONDecodeError(path, exc) from exc
+        finally:
+            response.close()
 
     def post(self, path: str, data=None) -> requests.Response:
         """
@@ -118,11 +399,10 @@ class SMMConnection:
         Raises:
             SMMRequestError: If the request fails or CSRF token is missing.
         """
-        if "csrftoken" not in self.session.cookies:
-            raise SMMPostCSRFError
+        return self._post(path, data)
 
-        url = f"{self.base_url}/{path}"
-        response = self.session.post(url, data=data, headers={"X-CSRFToken": str(self.session.cookies["csrftoken"])})
+    def _post(self, path: str, data=None, *, reauthenticate: bool = True) -> requests.Response:
+        response = self._request("POST", path, csrf_error=SMMPostCSRFError, reauthenticate=reauthenticate, data=data)
         try:
             response.raise_for_status()
         except requests.HTTPError as exc:
@@ -142,11 +422,7 @@ class SMMConnection:
         Raises:
             SMMRequestError: If the request fails or CSRF token is missing.
         """
-        if "csrftoken" not in self.session.cookies:
-            raise SMMDeleteCSRFError
-
-        url = f"{self.base_url}/{path}"
-        response = self.session.delete(url, headers={"X-CSRFToken": str(self.session.cookies["csrftoken"])})
+        response = self._request("DELETE", path, csrf_error=SMMDeleteCSRFError)
         try:
             response.raise_for_status()
         except requests.HTTPError as exc:
@@ -157,16 +433,29 @@ class SMMConnection:
         """
         Authenticates with the SMM server using the provided credentials.
         """
-        self.get()
-        if "csrftoken" not in self.session.cookies:
+        # Start from a clean cookie jar so a stale session cookie can't be mistaken for a new one
+        self.session.cookies.clear()
+        self._request("GET", None, reauthenticate=False)
+        if self.session.cookies.value("csrftoken") is None:
             raise SMMCSRFTokenError
 
-        self.post("/accounts/login/", data={"username": self.username, "password": self.password})
+        self._post(_LOGIN_PATH, data={"username": self.username, "password": self.password}, reauthenticate=False)
 
-        # Any non-2xx response is already raised by post() as SMMPostHTTPError.
+        # Any non-2xx response is already raised by _post() as SMMPostHTTPError.
         # We verify a session cookie was established to confirm authentication succeeded.
-        if "sessionid" not in self.session.cookies:
+        if self.session.cookies.value("sessionid") is None:
             raise SMMLoginNoSessionError
+        self._login_generation += 1
+        if self.session_store is not None:
+            self.session_store.save(self.base_url, self.username, self.session.cookies.all_cookies())
+
+    def _lookup_reference(self, kind: str, name: str, fetch):
+        """
+        Find reference data by name, only going to the server when the cached list is stale
+        """
+        if not self.reference_cache.is_fresh(kind):
+            fetch()
+        return self.reference_cache.lookup(kind, name)
 
     def get_assets(self) -> list[SMMAsset]:
         """
@@ -179,7 +468,64 @@ class SMMConnection:
         if "assets" not in data:
             raise SMMMissingKeyError("/assets/", "assets")
         assets_json = data["assets"]
-        return [SMMAsset(self, asset_json["id"], asset_json["name"]) for asset_json in assets_json]
+        return [
+            self.identity_map.get(SMMAsset, self, asset_json["id"], asset_json["name"]) for asset_json in assets_json
+        ]
+
+    def iter_assets(self) -> Iterator[SMMAsset]:
+        """
+        Iterates over all assets associated with the authenticated user, parsing the response as it arrives.
+
+        Yields:
+            SMMAsset: Each asset in turn.
+        """
+        for asset_json in self.iter_json("/assets/", "assets"):
+            yield self.identity_map.get(SMMAsset, self, asset_json["id"], asset_json["name"])
+
+    def get_fleet_status(
+        self,
+        assets: Iterable[SMMAsset] | None = None,
+        *,
+        workers: int | None = None,
+        include: Iterable[str] | None = None,
+    ) -> dict[int, SMMFleetReport]:
+        """
+        Fetches the status, command and mission context of many assets concurrently.
+
+        Args:
+            assets (Iterable[SMMAsset], optional): The assets to poll, defaults to every asset from get_assets().
+            workers (int, optional): Maximum number of requests in flight at once, defaults to pool_maxsize.
+            include (Iterable[str], optional): Which of FLEET_STATUS, FLEET_COMMAND and FLEET_MISSION to fetch,
+                defaults to all of them (FLEET_ALL).
+
+        Returns:
+            dict[int, SMMFleetReport]: A report for each asset keyed by asset id, with any per-asset errors.
+        """
+        fleet = importlib.import_module("smm_client.fleet")
+        return fleet.poll_fleet(
+            self.get_assets() if assets is None else assets,
+            workers=self.pool_maxsize if workers is None else workers,
+            include=fleet.FLEET_ALL if include is None else include,
+        )
+
+    def watch(self, *, missions: str | None = "active", assets: Iterable[SMMAsset] = (), **options) -> SMMWatcher:
+        """
+        Watch the list of missions and the status and command of assets for changes
+
+        Args:
+            missions (str, optional): Filter for the missions list (e.g. 'all', 'active'), or None not to watch it.
+            assets (Iterable[SMMAsset]): Assets to watch the status and command of.
+            options: Passed to SMMWatcher (min_interval, max_interval, backoff, workers, initial).
+
+        Returns:
+            SMMWatcher: Iterate over it (or async for) to receive an SMMChangeEvent per change.
+        """
+        watcher = importlib.import_module("smm_client.watch").SMMWatcher(self, **options)
+        if missions is not None:
+            watcher.watch_missions(missions)
+        for asset in assets:
+            watcher.watch_asset_status(asset).watch_asset_command(asset)
+        return watcher
 
     def get_missions(self, only: str = "all") -> list[SMMMission]:
         """
@@ -195,7 +541,23 @@ class SMMConnection:
         if "missions" not in data:
             raise SMMMissingKeyError(f"/mission/list/?only={only}", "missions")
         missions_json = data["missions"]
-        return [SMMMission(self, mission_json["id"], mission_json["name"]) for mission_json in missions_json]
+        return [
+            self.identity_map.get(SMMMission, self, mission_json["id"], mission_json["name"])
+            for mission_json in missions_json
+        ]
+
+    def iter_missions(self, only: str = "all") -> Iterator[SMMMission]:
+        """
+        Iterates over missions the authenticated user is a member of, parsing the response as it arrives.
+
+        Args:
+            only (str): Filter for missions (e.g., 'all', 'active'). Defaults to 'all'.
+
+        Yields:
+            SMMMission: Each mission in turn.
+        """
+        for mission_json in self.iter_json(f"/mission/list/?only={only}", "missions"):
+            yield self.identity_map.get(SMMMission, self, mission_json["id"], mission_json["name"])
 
     def get_asset_types(self) -> list[SMMAssetType]:
         """
@@ -205,9 +567,11 @@ class SMMConnection:
         if "asset_types" not in data:
             raise SMMMissingKeyError("/assets/assettypes/", "asset_types")
         asset_types_json = data["asset_types"]
-        return [
+        asset_types = [
             SMMAssetType(self, asset_type_json["id"], asset_type_json["name"]) for asset_type_json in asset_types_json
         ]
+        self.reference_cache.store(SMMReferenceCache.ASSET_TYPES, asset_types)
+        return asset_types
 
     def create_asset_status_value(self, name: str, description: str, *, inop: bool) -> SMMAssetStatusValue:
         """
@@ -217,7 +581,11 @@ class SMMConnection:
             "/admin/assets/assetstatusvalue/add/",
             {"name": name, "description": description, "inop": inop, "_continue": "Save+and+continue+editing"},
         )
-        return SMMAssetStatusValue(_parse_redirect_id("asset status value", result.url), name, description, inop=inop)
+        status_value = SMMAssetStatusValue(
+            _parse_redirect_id("asset status value", result.url), name, description, inop=inop
+        )
+        self.reference_cache.add(SMMReferenceCache.ASSET_STATUS_VALUES, status_value)
+        return status_value
 
     def get_asset_status_values(self) -> list[SMMAssetStatusValue]:
         """
@@ -227,7 +595,7 @@ class SMMConnection:
         if "values" not in data:
             raise SMMMissingKeyError("/assets/status/values/", "values")
         asset_status_values_json = data["values"]
-        return [
+        status_values = [
             SMMAssetStatusValue(
                 asset_status_value["id"],
                 asset_status_value["name"],
@@ -236,17 +604,16 @@ class SMMConnection:
             )
             for asset_status_value in asset_status_values_json
         ]
+        self.reference_cache.store(SMMReferenceCache.ASSET_STATUS_VALUES, status_values)
+        return status_values
 
     def get_or_create_asset_status_value(self, name: str, description: str, *, inop: bool) -> SMMAssetStatusValue:
         """
         Get the asset status value that matches this name
         Otherwise create it
         """
-        status_values = self.get_asset_status_values()
-        for sv in status_values:
-            if sv.name == name:
-                return sv
-        return self.create_asset_status_value(name, description, inop=inop)
+        status_value = self._lookup_reference(SMMReferenceCache.ASSET_STATUS_VALUES, name, self.get_asset_status_values)
+        return status_value or self.create_asset_status_value(name, description, inop=inop)
 
     def create_mission_asset_status_value(self, name: str, description: str) -> SMMMissionAssetStatusValue:
         """
@@ -256,9 +623,11 @@ class SMMConnection:
             "/admin/mission/missionassetstatusvalue/add/",
             {"name": name, "description": description, "_continue": "Save+and+continue+editing"},
         )
-        return SMMMissionAssetStatusValue(
+        status_value = SMMMissionAssetStatusValue(
             _parse_redirect_id("mission asset status value", result.url), name, description
         )
+        self.reference_cache.add(SMMReferenceCache.MISSION_ASSET_STATUS_VALUES, status_value)
+        return status_value
 
     def get_mission_asset_status_values(self) -> list[SMMMissionAssetStatusValue]:
         """
@@ -268,23 +637,24 @@ class SMMConnection:
         if "values" not in data:
             raise SMMMissingKeyError("/mission/asset/status/values/", "values")
         mission_asset_status_values_json = data["values"]
-        return [
+        status_values = [
             SMMMissionAssetStatusValue(
                 asset_status_value["id"], asset_status_value["name"], asset_status_value["description"]
             )
             for asset_status_value in mission_asset_status_values_json
         ]
+        self.reference_cache.store(SMMReferenceCache.MISSION_ASSET_STATUS_VALUES, status_values)
+        return status_values
 
     def get_or_create_mission_asset_status_value(self, name: str, description: str) -> SMMMissionAssetStatusValue:
         """
         Get the mission asset status value that matches this name
         Otherwise create it
         """
-        status_values = self.get_mission_asset_status_values()
-        for sv in status_values:
-            if sv.name == name:
-                return sv
-        return self.create_mission_asset_status_value(name, description)
+        status_value = self._lookup_reference(
+            SMMReferenceCache.MISSION_ASSET_STATUS_VALUES, name, self.get_mission_asset_status_values
+        )
+        return status_value or self.create_mission_asset_status_value(name, description)
 
     def get_organizations(self, *, all_orgs=False) -> list[SMMOrganization]:
         """
@@ -295,10 +665,14 @@ class SMMConnection:
         if "organizations" not in data:
             raise SMMMissingKeyError(url, "organizations")
         organizations_json = data["organizations"]
-        return [
-            SMMOrganization(self, organization_json["id"], organization_json["name"])
+        organizations = [
+            self.identity_map.get(SMMOrganization, self, organization_json["id"], organization_json["name"])
             for organization_json in organizations_json
         ]
+        if not all_orgs:
+            # get_or_create_organization() only considers the organizations this user is in
+            self.reference_cache.store(SMMReferenceCache.ORGANIZATIONS, organizations)
+        return organizations
 
     def create_user(self, username: str, password: str) -> SMMUser:
         """
@@ -318,18 +692,17 @@ class SMMConnection:
             "/admin/assets/assettype/add/",
             {"name": asset_type, "description": description, "_continue": "Save+and+continue+editing"},
         )
-        return SMMAssetType(self, _parse_redirect_id("asset type", result.url), asset_type)
+        new_asset_type = SMMAssetType(self, _parse_redirect_id("asset type", result.url), asset_type)
+        self.reference_cache.add(SMMReferenceCache.ASSET_TYPES, new_asset_type)
+        return new_asset_type
 
     def get_or_create_asset_type(self, asset_type: str, description: str) -> SMMAssetType:
         """
         Get the asset type that matches this asset type
         Otherwise create it
         """
-        asset_types = self.get_asset_types()
-        for at in asset_types:
-            if at.name == asset_type:
-                return at
-        return self.create_asset_type(asset_type, description)
+        found = self._lookup_reference(SMMReferenceCache.ASSET_TYPES, asset_type, self.get_asset_types)
+        return found or self.create_asset_type(asset_type, description)
 
     def create_asset(self, user: SMMUser, asset: str, asset_type: SMMAssetType) -> SMMAsset:
         """
@@ -339,7 +712,7 @@ class SMMConnection:
             "/admin/assets/asset/add/",
             {"name": asset, "owner": user.id, "asset_type": asset_type.id, "_continue": "Save+and+continue+editing"},
         )
-        return SMMAsset(self, _parse_redirect_id("asset", result.url), asset)
+        return self.identity_map.get(SMMAsset, self, _parse_redirect_id("asset", result.url), asset)
 
     def create_mission(self, name: str, description: str) -> SMMMission | None:
         """
@@ -347,7 +720,7 @@ class SMMConnection:
         """
         res = self.post("/mission/new/", {"mission_name": name, "mission_description": description})
         if res.status_code == requests.codes["ok"]:
-            return SMMMission(self, _parse_redirect_id("mission", res.url), name)
+            return self.identity_map.get(SMMMission, self, _parse_redirect_id("mission", res.url), name)
         return None
 
     def create_organization(self, name: str) -> SMMOrganization:
@@ -356,18 +729,17 @@ class SMMConnection:
         """
         res = self.post("/organization/", {"name": name})
         try:
-            org_json = res.json()
-            return SMMOrganization(self, org_json["id"], org_json["name"])
+            org_json = self.json_decoder.loads(res.content)
+            organization = self.identity_map.get(SMMOrganization, self, org_json["id"], org_json["name"])
         except (ValueError, KeyError) as exc:
             raise SMMParseError("organization", exc) from exc
+        self.reference_cache.add(SMMReferenceCache.ORGANIZATIONS, organization)
+        return organization
 
     def get_or_create_organization(self, name: str) -> SMMOrganization:
         """
         Get the organization that matches name
         Will be created if it doesn't already exist
         """
-        organizations = self.get_organizations()
-        for org in organizations:
-            if org.name == name:
-                return org
-        return self.create_organization(name)
+        organization = self._lookup_reference(SMMReferenceCache.ORGANIZATIONS, name, self.get_organizations)
+        return organization or self.create_organization(name)
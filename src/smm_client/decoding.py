@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - JSON decoding backends
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib
+import json
+
+JSON_AUTO = "auto"
+JSON_STDLIB = "json"
+JSON_ORJSON = "orjson"
+
+
+@functools.lru_cache(maxsize=None)
+def _orjson():
+    """
+    orjson, or None if it isn't installed; imported on first use like the other optional dependencies
+    """
+    try:
+        return importlib.import_module("orjson")
+    except ImportError:  # no cov
+        return None
+
+
+class SMMJSONDecoder:
+    # pylint: disable=R0903
+    """
+    Decodes JSON response bodies with the standard library json module
+
+    loads() takes the raw body (bytes, in any of the encodings JSON allows) and raises a ValueError
+    (json.JSONDecodeError) if it isn't valid JSON.
+    """
+
+    name = JSON_STDLIB
+
+    def loads(self, data: bytes | str):
+        """
+        The JSON value in data
+        """
+        return json.loads(data)
+
+
+class SMMOrjsonDecoder(SMMJSONDecoder):
+    # pylint: disable=R0903
+    """
+    Decodes JSON response bodies with orjson, which is several times faster on large documents such as
+    search GeoJSON (requires orjson: pip install smm-client[orjson])
+
+    orjson rejects some documents the json module accepts (NaN, integers over 64 bits, other encodings than
+    UTF-8), so those are decoded with the json module instead of failing.
+    """
+
+    name = JSON_ORJSON
+
+    def __init__(self) -> None:
+        self._orjson = _orjson()
+        if self._orjson is None:
+            msg = "SMMOrjsonDecoder requires orjson: pip install smm-client[orjson]"
+            raise RuntimeError(msg)
+
+    def loads(self, data: bytes | str):
+        try:
+            return self._orjson.loads(data)
+        except self._orjson.JSONDecodeError:
+            return json.loads(data)
+
+
+def get_json_decoder(backend: str | SMMJSONDecoder = JSON_AUTO) -> SMMJSONDecoder:
+    """
+    The decoder for backend: JSON_ORJSON, JSON_STDLIB, JSON_AUTO (orjson if it is installed, otherwise the json
+    module), or an SMMJSONDecoder to use as it is
+    """
+    if isinstance(backend, SMMJSONDecoder):
+        return backend
+    if backend == JSON_AUTO:
+        return SMMOrjsonDecoder() if _orjson() is not None else SMMJSONDecoder()
+    if backend == JSON_ORJSON:
+        return SMMOrjsonDecoder()
+    if backend == JSON_STDLIB:
+        return SMMJSONDecoder()
+    msg = f"Unknown JSON backend: {backend}"
+    raise ValueError(msg)
@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Concurrent fleet polling
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from smm_client.assets import SMMAsset, SMMAssetCommand, SMMAssetStatus
+
+FLEET_STATUS = "status"
+FLEET_COMMAND = "command"
+FLEET_MISSION = "mission"
+FLEET_ALL = (FLEET_STATUS, FLEET_COMMAND, FLEET_MISSION)
+
+
+def _fetch_status(asset: SMMAsset):
+    return asset.get_status()
+
+
+def _fetch_command(asset: SMMAsset):
+    return asset.get_command()
+
+
+def _fetch_mission(asset: SMMAsset):
+    return asset.get_mission_data()
+
+
+_FETCHERS = {
+    FLEET_STATUS: _fetch_status,
+    FLEET_COMMAND: _fetch_command,
+    FLEET_MISSION: _fetch_mission,
+}
+
+
+def _timed(fetch, asset: SMMAsset) -> tuple[object, Exception | None, float, float]:
+    started = time.monotonic()
+    try:
+        return fetch(asset), None, started, time.monotonic()
+    except Exception as exc:  # noqa: BLE001 # pylint: disable=W0718
+        return None, exc, started, time.monotonic()
+
+
+class SMMFleetReport:
+    # pylint: disable=R0903
+    """
+    The status, command and mission context fetched for one asset by poll_fleet
+
+    A part that was not requested, or that failed, is None; the exception raised while fetching each
+    failed part is kept in errors, keyed by part name (FLEET_STATUS, FLEET_COMMAND or FLEET_MISSION).
+    """
+
+    def __init__(self, asset: SMMAsset) -> None:
+        self.asset = asset
+        self.status: SMMAssetStatus | None = None
+        self.command: SMMAssetCommand | None = None
+        self.mission: dict | None = None
+        self.errors: dict[str, Exception] = {}
+        self.elapsed = 0.0
+        self._span: tuple[float, float] | None = None
+
+    def _record(self, part: str, result: tuple[object, Exception | None, float, float]) -> None:
+        value, error, started, finished = result
+        if error is None:
+            setattr(self, part, value)
+        else:
+            self.errors[part] = error
+        if self._span is not None:
+            started, finished = min(started, self._span[0]), max(finished, self._span[1])
+        self._span = (started, finished)
+        self.elapsed = finished - started
+
+    @property
+    def ok(self) -> bool:
+        """
+        True if every requested part was fetched
+        """
+        return not self.errors
+
+    def __str__(self) -> str:
+        failed = f" failed: {', '.join(sorted(self.errors))}" if self.errors else ""
+        return f"Fleet report for {self.asset} in {self.elapsed * 1000:.0f}ms{failed}"
+
+
+def poll_fleet(
+    assets: Iterable[SMMAsset], *, workers: int = 10, include: Iterable[str] = FLEET_ALL
+) -> dict[int, SMMFleetReport]:
+    """
+    Fetch the status, command and/or mission context of many assets at once
+
+    Every request is made on a bounded pool of threads, so with enough workers the whole fleet is
+    refreshed in about the time of a single round trip. A request that fails is recorded in the
+    asset's report instead of being raised.
+
+    Args:
+        assets (Iterable[SMMAsset]): The assets to poll.
+        workers (int): Maximum number of requests in flight at once.
+        include (Iterable[str]): Which of FLEET_STATUS, FLEET_COMMAND and FLEET_MISSION to fetch.
+
+    Returns:
+        dict[int, SMMFleetReport]: A report for each asset, keyed by asset id.
+    """
+    parts = tuple(include)
+    for part in parts:
+        if part not in _FETCHERS:
+            msg = f"Unknown fleet report part: {part}"
+            raise ValueError(msg)
+    reports = {asset.id: SMMFleetReport(asset) for asset in assets}
+    jobs = [(report, part) for report in reports.values() for part in parts]
+    if not jobs:
+        return reports
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs))), thread_name_prefix="smm-fleet") as pool:
+        futures = [(report, part, pool.submit(_timed, _FETCHERS[part], report.asset)) for report, part in jobs]
+        for report, part, future in futures:
+            report._record(part, future.result())  # noqa: SLF001 # pylint: disable=W0212
+    return reports
@@ -15,14 +15,16 @@ from smm_client.types import SMMParseError
 
 if TYPE_CHECKING:
     from smm_client.assets import SMMAssetType
+    from smm_client.decoding import SMMJSONDecoder
     from smm_client.missions import SMMMission
+    from smm_client.simplify import SMMSimplification
 
 
-def _parse_features_pk(result: requests.Response, context: str) -> int | None:
+def _parse_features_pk(result: requests.Response, context: str, decoder: SMMJSONDecoder) -> int | None:
     if result.status_code != requests.codes["ok"]:
         return None
     try:
-        return result.json()["features"][0]["properties"]["pk"]
+        return decoder.loads(result.content)["features"][0]["properties"]["pk"]
     except (ValueError, KeyError, IndexError) as exc:
         raise SMMParseError(context, exc) from exc
 
@@ -33,10 +35,11 @@ class SMMGeometry:
     Search Management Map - Parent class for user geometry
     """
 
-    def __init__(self, mission: SMMMission, geo_id: int) -> None:
+    def __init__(self, mission: SMMMission, geo_id: int, simplification: SMMSimplification | None = None) -> None:
         self.connection = mission.connection
         self.mission = mission
         self.geo_id = geo_id
+        self.simplification = simplification
 
 
 class SMMPoi(SMMGeometry):
@@ -52,7 +55,7 @@ class SMMPoi(SMMGeometry):
             "search/sector/create/",
             data={"poi_id": self.geo_id, "asset_type_id": asset_type.id, "sweep_width": sweep_width},
         )
-        return _parse_features_pk(result, "sector search")
+        return _parse_features_pk(result, "sector search", self.connection.json_decoder)
 
     def create_expanding_box_search(
         self, sweep_width: int, asset_type: SMMAssetType, iterations: int, first_bearing: int = 0
@@ -70,7 +73,7 @@ class SMMPoi(SMMGeometry):
                 "first_bearing": first_bearing,
             },
         )
-        return _parse_features_pk(result, "expanding box search")
+        return _parse_features_pk(result, "expanding box search", self.connection.json_decoder)
 
 
 class SMMLine(SMMGeometry):
@@ -86,7 +89,7 @@ class SMMLine(SMMGeometry):
             "search/shoreline/create/",
             data={"poi_id": self.geo_id, "asset_type_id": asset_type.id, "sweep_width": sweep_width},
         )
-        return _parse_features_pk(result, "shoreline search")
+        return _parse_features_pk(result, "shoreline search", self.connection.json_decoder)
 
     def create_trackline_search(self, sweep_width: int, asset_type: SMMAssetType) -> int | None:
         """
@@ -96,7 +99,7 @@ class SMMLine(SMMGeometry):
             "search/trackline/create/",
             data={"poi_id": self.geo_id, "asset_type_id": asset_type.id, "sweep_width": sweep_width},
         )
-        return _parse_features_pk(result, "trackline search")
+        return _parse_features_pk(result, "trackline search", self.connection.json_decoder)
 
     def create_creepingline_search(self, sweep_width: int, asset_type: SMMAssetType, width: int) -> int | None:
         """
@@ -106,7 +109,7 @@ class SMMLine(SMMGeometry):
             "search/creepingline/create/track/",
             data={"poi_id": self.geo_id, "asset_type_id": asset_type.id, "sweep_width": sweep_width, "width": width},
         )
-        return _parse_features_pk(result, "creeping line search")
+        return _parse_features_pk(result, "creeping line search", self.connection.json_decoder)
 
 
 class SMMPolygon(SMMGeometry):
@@ -122,4 +125,4 @@ class SMMPolygon(SMMGeometry):
             "search/creepingline/create/polygon/",
             data={"poi_id": self.geo_id, "asset_type_id": asset_type.id, "sweep_width": sweep_width},
         )
-        return _parse_features_pk(result, "polygon creeping line search")
+        return _parse_features_pk(result, "polygon creeping line search", self.connection.json_decoder)
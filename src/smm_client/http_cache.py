@@ -0,0 +1,210 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Conditional GET response cache
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from smm_client.decoding import SMMJSONDecoder
+
+if TYPE_CHECKING:
+    import requests
+
+_FILE_MODE = 0o600
+_DIRECTORY_MODE = 0o700
+
+
+class SMMCachedResponse:
+    # pylint: disable=R0903
+    """
+    A decoded JSON response and the validators needed to check it is still current
+    """
+
+    __slots__ = ("data", "etag", "last_modified", "size")
+
+    def __init__(self, data, etag: str | None, last_modified: str | None, size: int) -> None:
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.size = size
+
+    def validators(self) -> dict[str, str]:
+        """
+        The conditional request headers that ask the server for a 304 if this response is still current
+        """
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class SMMResponseCache:
+    # pylint: disable=R0902
+    """
+    Least recently used cache of get_json responses, revalidated with ETag/Last-Modified
+
+    Every lookup still makes a request, so data is never stale; an unchanged resource costs a 304 with no
+    body instead of a full download and JSON decode. Only responses with an ETag or Last-Modified header
+    (and without Cache-Control: no-store) are cached.
+
+    The same decoded object is returned each time a response is reused, so it must not be modified.
+
+    With a directory, responses are also written to disk (readable only by the current user) and reloaded
+    on a memory miss, e.g. by a new process; the directory holds at most max_entries files.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024, directory: str | None = None):
+        """
+        Args:
+            max_entries (int): Maximum number of responses kept.
+            max_bytes (int): Maximum total size of the response bodies kept in memory.
+            directory (str, optional): Directory to also keep responses in.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = os.fspath(directory) if directory is not None else None
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, SMMCachedResponse] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, decoder: SMMJSONDecoder | None = None) -> SMMCachedResponse | None:
+        """
+        Find the cached response for key, marking it most recently used
+
+        A response only cached on disk is decoded with decoder (by default the json module).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        entry = self._load(key, decoder or SMMJSONDecoder())
+        if entry is not None:
+            with self._lock:
+                self._insert(key, entry)
+        return entry
+
+    def revalidated(self, key: str) -> None:
+        """
+        Record that the server confirmed the cached response for key is still current
+        """
+        with self._lock:
+            self.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def store(self, key: str, response: requests.Response, data) -> None:
+        """
+        Cache data decoded from response, if the response can be revalidated
+        """
+        with self._lock:
+            self.misses += 1
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if (etag is None and last_modified is None) or "no-store" in response.headers.get("Cache-Control", ""):
+            self.invalidate(key)
+            return
+        entry = SMMCachedResponse(data, etag, last_modified, len(response.content))
+        with self._lock:
+            self._insert(key, entry)
+        self._save(key, entry, response.content)
+
+    def invalidate(self, key: str | None = None) -> None:
+        """
+        Drop the cached response for key, or everything if key is None
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._bytes = 0
+            elif key in self._entries:
+                self._bytes -= self._entries.pop(key).size
+        if self.directory is None:
+            return
+        paths = [self._path(key)] if key is not None else self._disk_files()
+        for path in paths:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+    def _insert(self, key: str, entry: SMMCachedResponse) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.size
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._bytes -= self._entries.popitem(last=False)[1].size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory or "", f"{hashlib.sha256(key.encode()).hexdigest()}.json")
+
+    def _disk_files(self) -> list[str]:
+        if self.directory is None:
+            return []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.directory, name) for name in names if name.endswith(".json")]
+
+    def _load(self, key: str, decoder: SMMJSONDecoder) -> SMMCachedResponse | None:
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as cache_file:
+                stored = json.load(cache_file)
+            if stored["key"] != key:
+                return None
+            body = stored["body"]
+            os.utime(self._path(key))
+            return SMMCachedResponse(decoder.loads(body), stored["etag"], stored["last_modified"], len(body))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save(self, key: str, entry: SMMCachedResponse, content: bytes) -> None:
+        if self.directory is None:
+            return
+        try:
+            os.makedirs(self.directory, mode=_DIRECTORY_MODE, exist_ok=True)
+            path = self._path(key)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, _FILE_MODE)
+            with os.fdopen(fd, "w", encoding="utf-8") as cache_file:
+                json.dump(
+                    {
+                        "key": key,
+                        "etag": entry.etag,
+                        "last_modified": entry.last_modified,
+                        "body": content.decode("utf-8"),
+                    },
+                    cache_file,
+                )
+            os.replace(temp_path, path)
+            self._prune()
+        except (OSError, UnicodeDecodeError):
+            # The disk copy is only an optimisation, the response is still cached in memory
+            return
+
+    def _prune(self) -> None:
+        files = self._disk_files()
+        if len(files) <= self.max_entries:
+            return
+        excess = len(files) - self.max_entries
+        files.sort(key=lambda path: os.stat(path).st_mtime)
+        for path in files[:excess]:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
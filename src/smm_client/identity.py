@@ -0,0 +1,65 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Identity map
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class SMMIdentityMap:
+    """
+    Weak references to the assets, missions and organizations created for one connection, by class and id
+
+    Looking up an id that is already in use returns the same object, so state attached to it is shared by
+    every caller. Objects are only referenced weakly: once nothing else holds one it is dropped, and the next
+    lookup creates a new object.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._objects: dict[type, weakref.WeakValueDictionary] = {}
+
+    def get(self, cls: type[T], connection, object_id: int, name: str) -> T:
+        """
+        The object of class cls with object_id, created as cls(connection, object_id, name) if there isn't one
+
+        The name of an existing object is updated, as the server's name is the current one.
+        """
+        with self._lock:
+            objects = self._objects.get(cls)
+            if objects is None:
+                objects = self._objects[cls] = weakref.WeakValueDictionary()
+            obj = objects.get(object_id)
+            if obj is None:
+                obj = cls(connection, object_id, name)  # type: ignore[call-arg]
+                objects[object_id] = obj
+            elif obj.name != name:
+                obj.name = name
+            return obj
+
+    def peek(self, cls: type[T], object_id: int) -> T | None:
+        """
+        The object of class cls with object_id if there is one in use, without creating it
+        """
+        with self._lock:
+            objects = self._objects.get(cls)
+            return objects.get(object_id) if objects is not None else None
+
+    def clear(self) -> None:
+        """
+        Forget every object, so later lookups create new ones
+        """
+        with self._lock:
+            self._objects.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(objects) for objects in self._objects.values())
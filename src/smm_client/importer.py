@@ -0,0 +1,456 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Bulk geometry import from GeoJSON, KML and GPX files
+"""
+
+from __future__ import annotations
+
+import contextlib
+import importlib
+import os
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import IO, TYPE_CHECKING, Callable, Iterator, Union
+
+from smm_client.streaming import iter_json_array
+from smm_client.types import SMMPoint, SMMPointArray, SMMRequestError
+
+if TYPE_CHECKING:
+    from smm_client.aio import AsyncSMMMission
+    from smm_client.geometry import SMMLine, SMMPoi, SMMPolygon
+    from smm_client.missions import SMMMission
+
+IMPORT_POI = "poi"
+IMPORT_LINE = "line"
+IMPORT_POLYGON = "polygon"
+
+FORMAT_GEOJSON = "geojson"
+FORMAT_KML = "kml"
+FORMAT_GPX = "gpx"
+
+_EXTENSIONS = {".geojson": FORMAT_GEOJSON, ".json": FORMAT_GEOJSON, ".kml": FORMAT_KML, ".gpx": FORMAT_GPX}
+_MIN_POINTS = {IMPORT_POI: 1, IMPORT_LINE: 2, IMPORT_POLYGON: 3}
+_LABEL_PROPERTIES = ("name", "label", "title")
+_CHUNK_SIZE = 65536
+
+# GeoJSON geometry type: (kind, function from the coordinates to the [lng, lat] lists of each part).
+# Polygons are imported as their exterior ring.
+_GEOJSON_PARTS: dict[str, tuple[str, Callable[[list], list]]] = {
+    "Point": (IMPORT_POI, lambda coordinates: [[coordinates]]),
+    "MultiPoint": (IMPORT_POI, lambda coordinates: [[point] for point in coordinates]),
+    "LineString": (IMPORT_LINE, lambda coordinates: [coordinates]),
+    "MultiLineString": (IMPORT_LINE, lambda coordinates: coordinates),
+    "Polygon": (IMPORT_POLYGON, lambda coordinates: [coordinates[0]]),
+    "MultiPolygon": (IMPORT_POLYGON, lambda coordinates: [polygon[0] for polygon in coordinates]),
+}
+
+ImportSource = Union[str, os.PathLike, IO[bytes]]
+
+
+class SMMImportFeature:
+    # pylint: disable=R0903
+    """
+    One feature read from an import file, and what happened when it was uploaded
+
+    After the import, geometry is the created SMMPoi/SMMLine/SMMPolygon, or error is the exception that
+    stopped the feature being read or created.
+    """
+
+    __slots__ = ("error", "geometry", "index", "kind", "label", "points")
+
+    def __init__(self, index: int, kind: str | None, label: str | None, points: SMMPointArray | None = None) -> None:
+        self.index = index
+        self.kind = kind
+        self.label = label
+        self.points = points
+        self.geometry: SMMPoi | SMMLine | SMMPolygon | None = None
+        self.error: Exception | None = None
+
+    def __str__(self) -> str:
+        outcome = f"failed: {self.error}" if self.error is not None else "created"
+        name = f" ({self.kind or 'unknown'} '{self.label}')" if self.label is not None else ""
+        return f"Feature {self.index}{name} {outcome}"
+
+
+class SMMImportResult:
+    """
+    The features read by an import, in file order
+    """
+
+    def __init__(self) -> None:
+        self.features: list[SMMImportFeature] = []
+
+    @property
+    def created(self) -> list[SMMPoi | SMMLine | SMMPolygon]:
+        """
+        The geometry created on the server, in file order
+        """
+        return [feature.geometry for feature in self.features if feature.geometry is not None]
+
+    @property
+    def errors(self) -> list[SMMImportFeature]:
+        """
+        The features that could not be read or created
+        """
+        return [feature for feature in self.features if feature.error is not None]
+
+    def __str__(self) -> str:
+        return f"Imported {len(self.created)} of {len(self.features)} features ({len(self.errors)} errors)"
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _closed_ring(points: SMMPointArray) -> SMMPointArray:
+    """
+    Drop the closing point GeoJSON and KML repeat at the end of a polygon ring
+    """
+    if len(points) > 1 and points.lats[0] == points.lats[-1] and points.lngs[0] == points.lngs[-1]:
+        end = len(points) - 1
+        return points[:end]
+    return points
+
+
+class _FeatureReader:
+    """
+    Numbers features as they are read, turning a bad source feature into a feature with an error
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def feature(self, kind: str, label: str | None, points: SMMPointArray) -> SMMImportFeature:
+        """
+        The next feature, with a default label and an error if there are too few points for its kind
+        """
+        self.count += 1
+        feature = SMMImportFeature(self.count - 1, kind, label or f"Imported {kind} {self.count}", points)
+        if len(points) < _MIN_POINTS[kind]:
+            feature.error = ValueError(f"A {kind} needs at least {_MIN_POINTS[kind]} points, got {len(points)}")
+        return feature
+
+    def failed(self, label: str | None, error: Exception) -> SMMImportFeature:
+        """
+        The next feature, which could not be read
+        """
+        self.count += 1
+        feature = SMMImportFeature(self.count - 1, None, label)
+        feature.error = error
+        return feature
+
+
+def _geojson_geometries(geometry: dict | None) -> Iterator[tuple[str, SMMPointArray]]:
+    if geometry is None:
+        msg = "Feature has no geometry"
+        raise ValueError(msg)
+    geometry_type = geometry["type"]
+    if geometry_type == "GeometryCollection":
+        for member in geometry["geometries"]:
+            yield from _geojson_geometries(member)
+        return
+    if geometry_type not in _GEOJSON_PARTS:
+        msg = f"Unsupported GeoJSON geometry type: {geometry_type}"
+        raise ValueError(msg)
+    kind, parts = _GEOJSON_PARTS[geometry_type]
+    for part in parts(geometry["coordinates"]):
+        points = SMMPointArray.from_lnglat(part)
+        yield kind, _closed_ring(points) if kind == IMPORT_POLYGON else points
+
+
+def read_geojson(stream: IO[bytes]) -> Iterator[SMMImportFeature]:
+    """
+    Read the features of a GeoJSON FeatureCollection, parsing the file as it is read
+
+    Polygons are imported as their exterior ring (holes are ignored) and multi-part geometry as one
+    feature per part. The label is the name, label or title property, if there is one.
+    """
+    reader = _FeatureReader()
+    for source in iter_json_array(iter(lambda: stream.read(_CHUNK_SIZE), b""), "features"):
+        properties = (source.get("properties") if isinstance(source, dict) else None) or {}
+        label = next((str(properties[key]) for key in _LABEL_PROPERTIES if properties.get(key)), None)
+        try:
+            parts = list(_geojson_geometries(source.get("geometry")))
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as exc:
+            yield reader.failed(label, exc)
+            continue
+        for kind, points in parts:
+            yield reader.feature(kind, label, points)
+
+
+def _kml_coordinates(element: ET.Element) -> SMMPointArray:
+    """
+    The points in the coordinates element within element ("lng,lat[,alt]" tuples separated by whitespace)
+    """
+    for child in element.iter():
+        if _local_name(child.tag) == "coordinates":
+            tuples = (child.text or "").split()
+            return SMMPointArray.from_lnglat(
+                [[float(value) for value in coordinates.split(",")] for coordinates in tuples]
+            )
+    msg = f"KML {_local_name(element.tag)} has no coordinates"
+    raise ValueError(msg)
+
+
+def _kml_geometries(placemark: ET.Element) -> Iterator[tuple[str, SMMPointArray]]:
+    for element in placemark.iter():
+        name = _local_name(element.tag)
+        if name == "Point":
+            yield IMPORT_POI, _kml_coordinates(element)
+        elif name == "LineString":
+            yield IMPORT_LINE, _kml_coordinates(element)
+        elif name == "outerBoundaryIs":
+            yield IMPORT_POLYGON, _closed_ring(_kml_coordinates(element))
+
+
+def read_kml(stream: IO[bytes]) -> Iterator[SMMImportFeature]:
+    """
+    Read the Points, LineStrings and Polygons (outer boundary) of each KML Placemark, labelled by its name
+    """
+    reader = _FeatureReader()
+    for _, element in ET.iterparse(stream, events=("end",)):  # noqa: S314
+        if _local_name(element.tag) != "Placemark":
+            continue
+        name = next((child.text for child in element if _local_name(child.tag) == "name"), None)
+        try:
+            parts = list(_kml_geometries(element))
+        except (ValueError, IndexError) as exc:
+            yield reader.failed(name, exc)
+            parts = []
+        for kind, points in parts:
+            yield reader.feature(kind, name, points)
+        element.clear()
+
+
+def _gpx_points(elements: list[ET.Element], point_tag: str) -> SMMPointArray:
+    points = SMMPointArray()
+    for element in elements:
+        if _local_name(element.tag) == point_tag:
+            points.append(float(element.attrib["lat"]), float(element.attrib["lon"]))
+    return points
+
+
+def read_gpx(stream: IO[bytes]) -> Iterator[SMMImportFeature]:
+    """
+    Read GPX waypoints as POIs, and routes and track segments as lines
+    """
+    reader = _FeatureReader()
+    for _, element in ET.iterparse(stream, events=("end",)):  # noqa: S314
+        tag = _local_name(element.tag)
+        if tag not in ("wpt", "rte", "trk"):
+            continue
+        name = next((child.text for child in element if _local_name(child.tag) == "name"), None)
+        try:
+            if tag == "wpt":
+                parts = [(IMPORT_POI, _gpx_points([element], "wpt"))]
+            elif tag == "rte":
+                parts = [(IMPORT_LINE, _gpx_points(list(element), "rtept"))]
+            else:
+                segments = [child for child in element if _local_name(child.tag) == "trkseg"]
+                parts = [(IMPORT_LINE, _gpx_points(list(segment), "trkpt")) for segment in segments]
+        except (ValueError, KeyError) as exc:
+            yield reader.failed(name, exc)
+            parts = []
+        for kind, points in parts:
+            yield reader.feature(kind, name, points)
+        element.clear()
+
+
+_READERS: dict[str, Callable[[IO[bytes]], Iterator[SMMImportFeature]]] = {
+    FORMAT_GEOJSON: read_geojson,
+    FORMAT_KML: read_kml,
+    FORMAT_GPX: read_gpx,
+}
+
+
+def _create(mission: SMMMission | AsyncSMMMission, feature: SMMImportFeature, tolerance: float | None):
+    """
+    Create feature in mission, returning the geometry (an awaitable of it for an AsyncSMMMission)
+    """
+    if feature.kind == IMPORT_POI:
+        return mission.add_waypoint(SMMPoint(feature.points.lats[0], feature.points.lngs[0]), feature.label)
+    if feature.kind == IMPORT_LINE:
+        return mission.add_line(feature.points, feature.label, tolerance=tolerance)
+    return mission.add_polygon(feature.points, feature.label, tolerance=tolerance)
+
+
+def _created(feature: SMMImportFeature, geometry) -> None:
+    feature.geometry = geometry
+    if geometry is None:
+        feature.error = SMMRequestError(f"Server did not create the {feature.kind}")
+
+
+def _upload(mission: SMMMission, feature: SMMImportFeature, tolerance: float | None) -> SMMImportFeature:
+    try:
+        _created(feature, _create(mission, feature, tolerance))
+    except Exception as exc:  # noqa: BLE001 # pylint: disable=W0718
+        feature.error = exc
+    return feature
+
+
+async def _upload_async(
+    mission: AsyncSMMMission, feature: SMMImportFeature, tolerance: float | None
+) -> SMMImportFeature:
+    try:
+        _created(feature, await _create(mission, feature, tolerance))
+    except Exception as exc:  # noqa: BLE001 # pylint: disable=W0718
+        feature.error = exc
+    return feature
+
+
+class _ImportProgress:
+    """
+    Counts finished features for the progress callback
+    """
+
+    def __init__(self, on_progress: Callable[[int, int], None] | None) -> None:
+        self.result = SMMImportResult()
+        self.on_progress = on_progress
+        self.completed = 0
+        self.failed = 0
+
+    def finished(self, feature: SMMImportFeature) -> None:
+        """
+        Count a feature that has been created or has failed
+        """
+        self.completed += 1
+        self.failed += feature.error is not None
+        if self.on_progress is not None:
+            self.on_progress(self.completed, self.failed)
+
+    def wait(self, pending: set[Future]) -> set[Future]:
+        """
+        Wait for at least one upload to finish, returning those still pending
+        """
+        done, still_pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            self.finished(future.result())
+        return still_pending
+
+    async def wait_async(self, pending: set) -> set:
+        """
+        Wait for at least one upload task to finish, returning those still pending
+        """
+        asyncio = importlib.import_module("asyncio")
+        done, still_pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            self.finished(task.result())
+        return still_pending
+
+    def malformed(self, exc: Exception) -> None:
+        """
+        Record that the file is malformed past the features read so far
+        """
+        failed = SMMImportFeature(len(self.result.features), None, None)
+        failed.error = exc
+        self.result.features.append(failed)
+        self.finished(failed)
+
+
+@contextlib.contextmanager
+def _open(source: ImportSource) -> Iterator[IO[bytes]]:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as stream:
+            yield stream
+    else:
+        yield source
+
+
+def _file_format(source: ImportSource, file_format: str | None) -> str:
+    if file_format is None:
+        name = os.fspath(source) if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+        file_format = _EXTENSIONS.get(os.path.splitext(str(name))[1].lower())
+        if file_format is None:
+            msg = f"Can't tell the format of {name!r}, pass file_format"
+            raise ValueError(msg)
+    if file_format not in _READERS:
+        msg = f"Unsupported import format: {file_format}"
+        raise ValueError(msg)
+    return file_format
+
+
+def import_geometry(
+    mission: SMMMission,
+    source: ImportSource,
+    *,
+    file_format: str | None = None,
+    workers: int = 4,
+    on_progress: Callable[[int, int], None] | None = None,
+    tolerance: float | None = None,
+) -> SMMImportResult:
+    # pylint: disable=R0913
+    """
+    Create a POI, line or polygon in mission for every feature in a GeoJSON, KML or GPX file
+
+    The file is read as features are uploaded, with at most workers uploads in flight (and a few more
+    features read ahead). A feature that can't be read or created is recorded in the result rather than
+    stopping the import; if the file itself is malformed, the features before the error are still imported.
+
+    Args:
+        mission (SMMMission): The mission to add the geometry to.
+        source (str | PathLike | binary file): The file to import.
+        file_format (str, optional): FORMAT_GEOJSON, FORMAT_KML or FORMAT_GPX, by default from the file extension.
+        workers (int): Maximum number of uploads at once.
+        on_progress (callable, optional): Called with (finished, failed) feature counts as each feature finishes.
+        tolerance (float, optional): Simplify lines and polygons to within this many metres before uploading.
+
+    Returns:
+        SMMImportResult: Every feature read, with the created geometry or the error.
+    """
+    reader = _READERS[_file_format(source, file_format)]
+    progress = _ImportProgress(on_progress)
+    pending: set = set()
+    with _open(source) as stream, ThreadPoolExecutor(max_workers=workers, thread_name_prefix="smm-import") as pool:
+        try:
+            for feature in reader(stream):
+                progress.result.features.append(feature)
+                if feature.error is not None:
+                    progress.finished(feature)
+                    continue
+                if len(pending) >= 2 * workers:
+                    pending = progress.wait(pending)
+                pending.add(pool.submit(_upload, mission, feature, tolerance))
+        except (ValueError, KeyError, SyntaxError) as exc:
+            # The file is malformed past this point (ET.ParseError is a SyntaxError)
+            progress.malformed(exc)
+        while pending:
+            pending = progress.wait(pending)
+    return progress.result
+
+
+async def import_geometry_async(
+    mission: AsyncSMMMission,
+    source: ImportSource,
+    *,
+    file_format: str | None = None,
+    workers: int = 4,
+    on_progress: Callable[[int, int], None] | None = None,
+    tolerance: float | None = None,
+) -> SMMImportResult:
+    # pylint: disable=R0913
+    """
+    import_geometry for an AsyncSMMMission: the uploads are tasks in the running event loop
+
+    The file is read (and parsed) in the event loop too, between uploads.
+    """
+    asyncio = importlib.import_module("asyncio")
+    reader = _READERS[_file_format(source, file_format)]
+    progress = _ImportProgress(on_progress)
+    pending: set = set()
+    with _open(source) as stream:
+        try:
+            for feature in reader(stream):
+                progress.result.features.append(feature)
+                if feature.error is not None:
+                    progress.finished(feature)
+                    continue
+                if len(pending) >= workers:
+                    pending = await progress.wait_async(pending)
+                pending.add(asyncio.ensure_future(_upload_async(mission, feature, tolerance)))
+        except (ValueError, KeyError, SyntaxError) as exc:
+            progress.malformed(exc)
+        while pending:
+            pending = await progress.wait_async(pending)
+    return progress.result
@@ -0,0 +1,212 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Request instrumentation and metrics
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import re
+import threading
+
+_ID_SEGMENT = re.compile(r"(?<=/)\d+(?=/|$)")
+_MULTIPLE_SLASHES = re.compile("/{2,}")
+
+# The Prometheus client's default latency buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (SMMEndpointMetrics field, Prometheus counter name, description); requests are labelled by status
+_PROMETHEUS_COUNTERS = (
+    ("requests", "requests_total", "Requests sent to the SMM server by response status."),
+    ("errors", "request_errors_total", "Requests that failed or returned a 4xx/5xx status."),
+    ("retries", "request_retries_total", "Requests replayed after logging in again."),
+    ("request_bytes", "request_bytes_total", "Request body bytes sent."),
+    ("response_bytes", "response_bytes_total", "Response body bytes received."),
+)
+
+
+def endpoint_template(path: str | None) -> str:
+    """
+    Reduce a request path to its endpoint, e.g. "assets/42/status/?x=1" to "/assets/{id}/status/"
+    """
+    if not path:
+        return "/"
+    path = path.split("?", 1)[0]
+    return _ID_SEGMENT.sub("{id}", _MULTIPLE_SLASHES.sub("/", f"/{path}"))
+
+
+class SMMInstrumentation:
+    # pylint: disable=R0903
+    """
+    Receives a call for every HTTP request an SMMConnection makes
+
+    Subclass this and pass an instance to SMMConnection(instrumentation=...) to collect your own metrics
+    or traces. The method is called on the thread that made the request, so it must be thread safe and fast.
+    """
+
+    def record(
+        self,
+        method: str,
+        endpoint: str,
+        status: int | None,
+        elapsed: float,
+        request_bytes: int,
+        response_bytes: int,
+        *,
+        retry: bool = False,
+    ) -> None:
+        # pylint: disable=R0913,R0917
+        """
+        Record one request
+
+        Args:
+            method (str): The HTTP method.
+            endpoint (str): The endpoint template of the path, see endpoint_template().
+            status (int, optional): The HTTP status code, or None if no response was received.
+            elapsed (float): Seconds until the response headers were received (or the request failed).
+            request_bytes (int): Size of the request body.
+            response_bytes (int): Size of the response body, if known.
+            retry (bool): This request replays one rejected because the session had expired.
+        """
+
+
+class SMMEndpointMetrics:
+    # pylint: disable=R0902,R0903
+    """
+    Counters and a latency histogram for one method and endpoint
+    """
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.latency_sum = 0.0
+        self.latency_counts = [0] * (len(buckets) + 1)
+        self.statuses: dict[str, int] = {}
+
+    def to_json(self, buckets: tuple[float, ...]) -> dict:
+        """
+        The metrics as JSON-compatible data, with cumulative histogram bucket counts
+        """
+        cumulative = 0
+        histogram = {}
+        for bound, count in zip((*buckets, "+Inf"), self.latency_counts):
+            cumulative += count
+            histogram[str(bound)] = cumulative
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "latency_sum": self.latency_sum,
+            "latency_buckets": histogram,
+            "statuses": dict(self.statuses),
+        }
+
+
+class SMMMetrics(SMMInstrumentation):
+    """
+    Collects per-endpoint request metrics, exportable as JSON or in the Prometheus text format
+
+    Requests are grouped by method and endpoint template (ids in the path replaced by {id}), so
+    /assets/1/status/ and /assets/2/status/ are both counted under /assets/{id}/status/.
+    A request counts as an error if no response was received or the status was 4xx/5xx.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS, namespace: str = "smm_client") -> None:
+        """
+        Args:
+            buckets (tuple[float]): Upper bounds of the latency histogram buckets, in seconds.
+            namespace (str): Prefix for the Prometheus metric names.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._endpoints: dict[tuple[str, str], SMMEndpointMetrics] = {}
+
+    def record(
+        self,
+        method: str,
+        endpoint: str,
+        status: int | None,
+        elapsed: float,
+        request_bytes: int,
+        response_bytes: int,
+        *,
+        retry: bool = False,
+    ) -> None:
+        # pylint: disable=R0913,R0917
+        bucket = bisect.bisect_left(self.buckets, elapsed)
+        status_label = str(status) if status is not None else "error"
+        with self._lock:
+            metrics = self._endpoints.get((method, endpoint))
+            if metrics is None:
+                metrics = self._endpoints[(method, endpoint)] = SMMEndpointMetrics(self.buckets)
+            metrics.requests += 1
+            metrics.latency_sum += elapsed
+            metrics.latency_counts[bucket] += 1
+            metrics.request_bytes += request_bytes
+            metrics.response_bytes += response_bytes
+            metrics.statuses[status_label] = metrics.statuses.get(status_label, 0) + 1
+            if status is None or status >= 400:  # noqa: PLR2004
+                metrics.errors += 1
+            if retry:
+                metrics.retries += 1
+
+    def reset(self) -> None:
+        """
+        Forget everything recorded so far
+        """
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self) -> dict:
+        """
+        A consistent copy of the metrics, as {"METHOD /endpoint/": {...}}
+        """
+        with self._lock:
+            return {
+                f"{method} {endpoint}": metrics.to_json(self.buckets)
+                for (method, endpoint), metrics in sorted(self._endpoints.items())
+            }
+
+    def to_json(self, **kwargs) -> str:
+        """
+        The snapshot() encoded as JSON, kwargs are passed to json.dumps
+        """
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self) -> str:
+        """
+        The metrics in the Prometheus text exposition format
+        """
+        name = self.namespace
+        lines = [
+            f"# HELP {name}_request_duration_seconds Time until the SMM server's response headers were received.",
+            f"# TYPE {name}_request_duration_seconds histogram",
+        ]
+        samples: dict[str, list[str]] = {counter: [] for _, counter, _ in _PROMETHEUS_COUNTERS}
+        for key, metrics in self.snapshot().items():
+            method, endpoint = key.split(" ", 1)
+            labels = f'method="{method}",endpoint="{_escape_label(endpoint)}"'
+            for bound, count in metrics["latency_buckets"].items():
+                lines.append(f'{name}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{name}_request_duration_seconds_sum{{{labels}}} {metrics['latency_sum']}")
+            lines.append(f"{name}_request_duration_seconds_count{{{labels}}} {metrics['requests']}")
+            for status, count in sorted(metrics["statuses"].items()):
+                samples["requests_total"].append(f'{name}_requests_total{{{labels},status="{status}"}} {count}')
+            for field, counter, _ in _PROMETHEUS_COUNTERS[1:]:
+                samples[counter].append(f"{name}_{counter}{{{labels}}} {metrics[field]}")
+        for _, counter, description in _PROMETHEUS_COUNTERS:
+            lines += [f"# HELP {name}_{counter} {description}", f"# TYPE {name}_{counter} counter", *samples[counter]]
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
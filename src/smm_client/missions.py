@@ -7,18 +7,55 @@ Search Management Map - Missions
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import importlib
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
 
 import requests
 
+from smm_client.attributes import SMMCachedAttributes, cached_attribute
 from smm_client.geometry import SMMLine, SMMPoi, SMMPolygon, _parse_features_pk
 from smm_client.organizations import SMMOrganization
-from smm_client.types import SMMMissingKeyError
+from smm_client.types import SMMMissingKeyError, SMMPointArray
 
 if TYPE_CHECKING:
     from smm_client.assets import SMMAsset
     from smm_client.connection import SMMConnection, SMMUser
+    from smm_client.importer import ImportSource, SMMImportResult
+    from smm_client.simplify import SMMSimplification
+    from smm_client.snapshot import SMMMissionSnapshot
     from smm_client.types import SMMPoint
+    from smm_client.watch import SMMWatcher
+
+
+def _populate_points(points: list[SMMPoint] | SMMPointArray, label: str) -> dict:
+    """
+    Build the form data for a line/polygon: the point count, label and pointN_lat/pointN_lng fields
+    """
+    data: dict = {
+        "points": len(points),
+        "label": label,
+    }
+    if isinstance(points, SMMPointArray):
+        coordinates = zip(points.lats, points.lngs)
+    else:
+        coordinates = ((point.lat, point.lng) for point in points)
+    for i, (lat, lng) in enumerate(coordinates):
+        data[f"point{i}_lat"] = lat
+        data[f"point{i}_lng"] = lng
+    return data
+
+
+def _simplify_points(
+    points: list[SMMPoint] | SMMPointArray, tolerance: float | None, method: str | None, *, closed: bool
+) -> tuple[list[SMMPoint] | SMMPointArray, SMMSimplification | None]:
+    """
+    Simplify the points of a line/polygon if a tolerance is given (by default with DOUGLAS_PEUCKER)
+    """
+    if tolerance is None:
+        return points, None
+    simplify = importlib.import_module("smm_client.simplify")
+    simplification = simplify.simplify(points, tolerance, method=method or simplify.DOUGLAS_PEUCKER, closed=closed)
+    return simplification.points, simplification
 
 
 class SMMMissionAssetStatusValue:
@@ -123,9 +160,13 @@ class SMMMissionExternalReference:
         )
 
 
-class SMMMission:
+class SMMMission(SMMCachedAttributes):
+    # pylint: disable=R0904
     """
     Represents a specific Search and Rescue mission in SMM.
+
+    active_assets and organizations are fetched on first access and cached (see SMMCachedAttributes);
+    the methods that change them invalidate them.
     """
 
     def __init__(self, connection: SMMConnection, mission_id: int, name: str) -> None:
@@ -202,6 +243,7 @@ class SMMMission:
             SMMMissionOrganization: The organization membership object.
         """
         self.post("organizations/", data={"organization": organization.id})
+        self.invalidate("organizations")
         return SMMMissionOrganization(self, organization)
 
     def get_organizations(self) -> list[SMMMissionOrganization]:
@@ -214,8 +256,11 @@ class SMMMission:
         return [
             SMMMissionOrganization(
                 self,
-                SMMOrganization(
-                    self.connection, organization["organization"]["id"], organization["organization"]["name"]
+                self.connection.identity_map.get(
+                    SMMOrganization,
+                    self.connection,
+                    organization["organization"]["id"],
+                    organization["organization"]["name"],
                 ),
             )
             for organization in data["organizations"]
@@ -226,12 +271,19 @@ class SMMMission:
         Add an asset to this mission
         """
         self.post("assets/", data={"asset": asset.id})
+        self._asset_changed(asset)
 
     def remove_asset(self, asset: SMMAsset) -> None:
         """
         Remove an asset from this mission
         """
         self.connection.get(self.__url_component(f"assets/{asset.id}/remove/"))
+        self._asset_changed(asset)
+
+    def _asset_changed(self, asset: SMMAsset) -> None:
+        self.invalidate("active_assets")
+        if isinstance(asset, SMMCachedAttributes):
+            asset.invalidate("mission_data")
 
     def set_asset_command(self, asset: SMMAsset, command: str, reason: str, point: SMMPoint | None = None) -> None:
         """
@@ -256,12 +308,14 @@ class SMMMission:
             "notes": notes,
         }
         self.post(f"assets/{asset.id}/status/", data)
+        self.invalidate("active_assets")
 
     def close(self) -> None:
         """
         Close this mission
         """
         self.connection.get(self.__url_component("close/"))
+        self.invalidate()
 
     def assets(self, include: str = "active") -> list[str]:
         """
@@ -275,55 +329,154 @@ class SMMMission:
             raise SMMMissingKeyError("assets/", "assets")
         return data["assets"]
 
+    def iter_assets(self, include: str = "active") -> Iterator[dict]:
+        """
+        Iterate over the assets in this mission, parsing the response as it arrives
+
+        Use include="removed" to see get all assets that were ever in the mission
+        """
+        include_removed = str(include == "removed")
+        return self.connection.iter_json(self.__url_component(f"assets/?include_removed={include_removed}"), "assets")
+
+    @cached_attribute
+    def active_assets(self) -> list:
+        """
+        The assets currently in this mission (assets()), cached
+        """
+        return self.assets()
+
+    @cached_attribute
+    def organizations(self) -> list[SMMMissionOrganization]:
+        """
+        The organizations in this mission (get_organizations()), cached
+        """
+        return self.get_organizations()
+
     def add_waypoint(self, point: SMMPoint, label: str) -> SMMPoi | None:
         """
         Add a way point to this mission
         """
         results = self.post("data/pois/create/", {"lat": point.lat, "lon": point.lng, "label": label})
-        pk = _parse_features_pk(results, "mission waypoint")
+        pk = _parse_features_pk(results, "mission waypoint", self.connection.json_decoder)
         return SMMPoi(self, pk) if pk is not None else None
 
-    def _populate_points(self, points: list[SMMPoint], label) -> object:
+    def _populate_points(self, points: list[SMMPoint] | SMMPointArray, label) -> object:
         """
         Add the points to data
         """
-        data = {
-            "points": len(points),
-            "label": label,
-        }
-        i = 0
-        for point in points:
-            data[f"point{i}_lat"] = point.lat
-            data[f"point{i}_lng"] = point.lng
-            i = i + 1
-        return data
+        return _populate_points(points, label)
 
-    def add_line(self, points: list[SMMPoint], label: str) -> SMMLine | None:
+    def add_line(
+        self,
+        points: list[SMMPoint] | SMMPointArray,
+        label: str,
+        *,
+        tolerance: float | None = None,
+        simplify_method: str | None = None,
+    ) -> SMMLine | None:
         """
         Add a line to this mission
+
+        With a tolerance (in metres) the line is simplified before it is sent with simplify_method (by default
+        DOUGLAS_PEUCKER), see smm_client.simplify; the returned line's simplification attribute reports the
+        points removed and the maximum deviation.
         """
+        points, simplification = _simplify_points(points, tolerance, simplify_method, closed=False)
         data = self._populate_points(points, label)
         results = self.post("data/userlines/create/", data)
-        pk = _parse_features_pk(results, "mission line")
-        return SMMLine(self, pk) if pk is not None else None
-
-    def add_polygon(self, points: list[SMMPoint], label: str) -> SMMPolygon | None:
+        pk = _parse_features_pk(results, "mission line", self.connection.json_decoder)
+        return SMMLine(self, pk, simplification) if pk is not None else None
+
+    def add_polygon(
+        self,
+        points: list[SMMPoint] | SMMPointArray,
+        label: str,
+        *,
+        tolerance: float | None = None,
+        simplify_method: str | None = None,
+    ) -> SMMPolygon | None:
         """
         Add a polygon to this mission
+
+        With a tolerance (in metres) the polygon is simplified before it is sent with simplify_method (by default
+        DOUGLAS_PEUCKER), see smm_client.simplify; the returned polygon's simplification attribute reports the
+        points removed and the maximum deviation.
         """
+        points, simplification = _simplify_points(points, tolerance, simplify_method, closed=True)
         data = self._populate_points(points, label)
         results = self.post("data/userpolygons/create/", data)
-        pk = _parse_features_pk(results, "mission polygon")
-        return SMMPolygon(self, pk) if pk is not None else None
+        pk = _parse_features_pk(results, "mission polygon", self.connection.json_decoder)
+        return SMMPolygon(self, pk, simplification) if pk is not None else None
+
+    def import_geometry(
+        self,
+        source: ImportSource,
+        *,
+        file_format: str | None = None,
+        workers: int = 4,
+        on_progress: Callable[[int, int], None] | None = None,
+        tolerance: float | None = None,
+    ) -> SMMImportResult:
+        """
+        Add the waypoints, lines and polygons in a GeoJSON, KML or GPX file to this mission
+
+        Features are uploaded concurrently (at most workers at once) while the file is read. A feature
+        that can't be read or created is reported in the result instead of stopping the import.
+
+        Args:
+            source (str | PathLike | binary file): The file to import.
+            file_format (str, optional): "geojson", "kml" or "gpx", by default from the file extension.
+            workers (int): Maximum number of uploads at once.
+            on_progress (callable, optional): Called with (finished, failed) feature counts as each feature finishes.
+            tolerance (float, optional): Simplify lines and polygons to within this many metres before uploading.
+
+        Returns:
+            SMMImportResult: Every feature read, with the created SMMPoi/SMMLine/SMMPolygon or the error.
+        """
+        return importlib.import_module("smm_client.importer").import_geometry(
+            self, source, file_format=file_format, workers=workers, on_progress=on_progress, tolerance=tolerance
+        )
+
+    def snapshot(self, *, assets: Iterable[SMMAsset] | None = None, workers: int | None = None) -> SMMMissionSnapshot:
+        """
+        Fetch the assets (with their status and command), organizations and external references of this
+        mission in parallel, as one immutable SMMMissionSnapshot that can be saved as JSON or MessagePack
+
+        Args:
+            assets (Iterable[SMMAsset], optional): The assets to include, instead of fetching the asset list first.
+            workers (int, optional): Maximum number of requests at once, by default the connection's pool_maxsize.
+
+        Returns:
+            SMMMissionSnapshot: The mission state, with the time each part took and any errors.
+        """
+        return importlib.import_module("smm_client.snapshot").snapshot_mission(self, assets=assets, workers=workers)
+
+    def watch(self, *, follow: bool = True, **options) -> SMMWatcher:
+        """
+        Watch the assets in this mission for changes
+
+        Args:
+            follow (bool): Also watch the status and command of each asset in the mission, as it joins.
+            options: Passed to SMMWatcher (min_interval, max_interval, backoff, workers, initial).
+
+        Returns:
+            SMMWatcher: Iterate over it (or async for) to receive an SMMChangeEvent per change.
+        """
+        watcher = importlib.import_module("smm_client.watch").SMMWatcher(self.connection, **options)
+        return watcher.watch_mission_assets(self, follow=follow)
 
     @classmethod
     def get_mission_for_asset(cls, asset: SMMAsset) -> SMMMission | None:
         """
         Get the current mission for the asset
+
+        Always asks the server; use asset.mission_data for a cached answer.
         """
         data = asset.get_mission_data()
         try:
-            return SMMMission(asset.connection, data["mission_id"], data["mission_name"])
+            return asset.connection.identity_map.get(
+                SMMMission, asset.connection, data["mission_id"], data["mission_name"]
+            )
         except KeyError:
             return None
 
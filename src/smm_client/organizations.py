@@ -7,7 +7,7 @@ Search Management Map - Organizations
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterator
 
 from smm_client.assets import SMMAsset
 from smm_client.types import SMMMalformedDataError, SMMMissingKeyError
@@ -57,6 +57,48 @@ class SMMOrganizationAsset:
         return f"{self.asset} in {self.organization}"
 
 
+def _parse_organization_member(organization, member_json: dict) -> SMMOrganizationUser:
+    try:
+        return SMMOrganizationUser(
+            organization,
+            member_json["user"],
+            member_json["role"],
+            member_json["added"],
+            member_json["added_by"],
+            member_json["removed"],
+            member_json["removed_by"],
+        )
+    except KeyError as exc:
+        raise SMMMalformedDataError("organization member", exc) from exc
+
+
+def _parse_organization_members(organization, path: str, data: dict) -> list[SMMOrganizationUser]:
+    if "members" not in data:
+        raise SMMMissingKeyError(path, "members")
+    return [_parse_organization_member(organization, member_json) for member_json in data["members"]]
+
+
+def _parse_organization_assets(organization, path: str, data: dict, asset_class) -> list[SMMOrganizationAsset]:
+    if "assets" not in data:
+        raise SMMMissingKeyError(path, "assets")
+    try:
+        return [
+            SMMOrganizationAsset(
+                organization,
+                organization.connection.identity_map.get(
+                    asset_class, organization.connection, asset_json["asset"]["id"], asset_json["asset"]["name"]
+                ),
+                asset_json["added"],
+                asset_json["added_by"],
+                asset_json["removed"],
+                asset_json["removed_by"],
+            )
+            for asset_json in data["assets"]
+        ]
+    except KeyError as exc:
+        raise SMMMalformedDataError("organization asset", exc) from exc
+
+
 class SMMOrganization:
     """
     Search Management Map - Organization
@@ -78,23 +120,14 @@ class SMMOrganization:
         Get all the members of this organization
         """
         organization = self.connection.get_json(self.__url_component(""))
-        if "members" not in organization:
-            raise SMMMissingKeyError(self.__url_component(""), "members")
-        try:
-            return [
-                SMMOrganizationUser(
-                    self,
-                    member_json["user"],
-                    member_json["role"],
-                    member_json["added"],
-                    member_json["added_by"],
-                    member_json["removed"],
-                    member_json["removed_by"],
-                )
-                for member_json in organization["members"]
-            ]
-        except KeyError as exc:
-            raise SMMMalformedDataError("organization member", exc) from exc
+        return _parse_organization_members(self, self.__url_component(""), organization)
+
+    def iter_members(self) -> Iterator[SMMOrganizationUser]:
+        """
+        Iterate over the members of this organization, parsing the response as it arrives
+        """
+        for member_json in self.connection.iter_json(self.__url_component(""), "members"):
+            yield _parse_organization_member(self, member_json)
 
     def add_member(self, user: SMMUser, role: str = "M") -> None:
         """
@@ -113,22 +146,7 @@ class SMMOrganization:
         Get all the assets in this organization
         """
         data = self.connection.get_json(self.__url_component("assets/"))
-        if "assets" not in data:
-            raise SMMMissingKeyError(self.__url_component("assets/"), "assets")
-        try:
-            return [
-                SMMOrganizationAsset(
-                    self,
-                    SMMAsset(self.connection, asset_json["asset"]["id"], asset_json["asset"]["name"]),
-                    asset_json["added"],
-                    asset_json["added_by"],
-                    asset_json["removed"],
-                    asset_json["removed_by"],
-                )
-                for asset_json in data["assets"]
-            ]
-        except KeyError as exc:
-            raise SMMMalformedDataError("organization asset", exc) from exc
+        return _parse_organization_assets(self, self.__url_component("assets/"), data, SMMAsset)
 
     def add_asset(self, asset: SMMAsset) -> None:
         """
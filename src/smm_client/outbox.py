@@ -0,0 +1,341 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Store-and-forward outbox
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import requests
+
+from smm_client.types import SMMAuthenticationError
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from smm_client.assets import SMMAsset
+    from smm_client.connection import SMMConnection
+    from smm_client.missions import SMMMission, SMMMissionAssetStatusValue
+    from smm_client.search import SMMSearch
+
+OUTBOX_POSITION = "position"
+OUTBOX_STATUS = "status"
+OUTBOX_MISSION_ASSET_STATUS = "mission asset status"
+OUTBOX_SEARCH_FINISHED = "search finished"
+
+# Status codes that mean the server (or a proxy in front of it) is unavailable, rather than the request being wrong
+_RETRY_STATUSES = (408, 425, 429)
+_SERVER_ERROR = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    data TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_queue ON outbox (failed, id);
+"""
+
+
+class SMMOutboxEntry:
+    # pylint: disable=R0902,R0903
+    """
+    A write waiting in (or rejected from) an SMMOutbox
+    """
+
+    def __init__(self, row: tuple) -> None:
+        self.id, self.created, self.kind, self.path, data, self.attempts, failed, self.error = row
+        self.data = json.loads(data)
+        self.failed = bool(failed)
+
+    def __str__(self) -> str:
+        state = f"failed: {self.error}" if self.failed else f"{self.attempts} attempts"
+        return f"{self.kind} {self.path} queued {time.ctime(self.created)} ({state})"
+
+
+def _unavailable(exc: Exception) -> bool:
+    """
+    Check if exc means the server couldn't be reached, so the write should be kept and tried again later
+    """
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout, SMMAuthenticationError)):
+        return True
+    cause = exc.__cause__
+    if isinstance(cause, requests.HTTPError) and cause.response is not None:
+        status = cause.response.status_code
+        return status >= _SERVER_ERROR or status in _RETRY_STATUSES
+    return False
+
+
+class SMMOutbox:
+    # pylint: disable=R0902
+    """
+    Sends writes to the SMM server, keeping them in an SQLite database while the server can't be reached
+
+    Each write is sent straight away if nothing is queued. If the server is unreachable (connection error,
+    timeout, 5xx, 408/429) it is stored and replayed later, in the order written, by replay() or by the
+    background thread started by start(). A write the server rejects (any other 4xx) is kept aside as
+    failed instead of blocking the queue; see failed().
+
+    The server records positions and statuses when it receives them, so replayed writes are stamped
+    with the replay time, not the time they were made.
+
+    Delivery is at least once: a write that times out may still have reached the server, and is sent
+    again when it is replayed (e.g. a second copy of a position).
+    """
+
+    def __init__(
+        self,
+        connection: SMMConnection,
+        path: str | os.PathLike,
+        *,
+        batch_size: int = 500,
+        rate: float | None = None,
+        retry_interval: float = 10.0,
+    ) -> None:
+        # pylint: disable=R0913
+        """
+        Args:
+            connection (SMMConnection): The connection to send writes with.
+            path (str): The SQLite database file, created if it doesn't exist.
+            batch_size (int): Number of queued writes read (and removed once sent) per database transaction.
+            rate (float, optional): Maximum writes per second while replaying.
+            retry_interval (float): Seconds the background thread waits after the server was unreachable.
+        """
+        self.connection = connection
+        self.path = os.fspath(path)
+        self.batch_size = batch_size
+        self.rate = rate
+        self.retry_interval = retry_interval
+        # One database connection, shared by the writer threads and the replay thread under _lock
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        # Serializes replays; _replaying (guarded by _lock) tells writers one is running so they queue behind it
+        self._replay_lock = threading.Lock()
+        self._replaying = False
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def set_position(
+        self, asset: SMMAsset, lat: float, lon: float, fix: int, alt: int | None = None, heading: int | None = None
+    ) -> bool:
+        # pylint: disable=R0913,R0917
+        """
+        SMMAsset.set_position, queued if the server can't be reached. Returns True if it was sent now.
+        """
+        data = {"lat": lat, "lon": lon, "fix": fix, "alt": alt, "heading": heading}
+        return self.post(OUTBOX_POSITION, f"/data/assets/{asset.id}/position/add/", data)
+
+    def set_status(self, asset: SMMAsset, status: str, notes: str) -> bool:
+        """
+        SMMAsset.set_status, queued if the server can't be reached. Returns True if it was sent now.
+        """
+        return self.post(OUTBOX_STATUS, f"/assets/{asset.id}/status/", {"value_id": status, "notes": notes})
+
+    def set_asset_status(
+        self, mission: SMMMission, asset: SMMAsset, status: SMMMissionAssetStatusValue, notes: str
+    ) -> bool:
+        """
+        SMMMission.set_asset_status, queued if the server can't be reached. Returns True if it was sent now.
+        """
+        return self.post(
+            OUTBOX_MISSION_ASSET_STATUS,
+            f"/mission/{mission.id}/assets/{asset.id}/status/",
+            {"value_id": status.id, "notes": notes},
+        )
+
+    def search_finished(self, search: SMMSearch, asset: SMMAsset) -> bool:
+        """
+        SMMSearch.finished, queued if the server can't be reached. Returns True if it was sent now.
+        """
+        return self.post(OUTBOX_SEARCH_FINISHED, f"/search/{search.id}/finished/", {"asset_id": asset.id})
+
+    def post(self, kind: str, path: str, data: dict) -> bool:
+        """
+        POST data to path now if nothing is queued and the server is reachable, otherwise queue it
+
+        Raises the error if the server rejects the write outright (e.g. a 4xx for a bad id), as nothing
+        would be gained by retrying it.
+
+        A write that times out is queued too, although the server may have applied it, so it can reach
+        the server twice.
+
+        Returns:
+            bool: True if the write was sent now, False if it was queued.
+        """
+        if self._closed:
+            raise RuntimeError("SMMOutbox is closed")
+        # Writes are only sent straight away when they can't overtake queued ones; other live sends don't matter
+        with self._lock:
+            direct = not self._replaying and not self._queued_locked()
+        if direct:
+            try:
+                self.connection.post(path, data)
+            except Exception as exc:  # pylint: disable=W0718
+                if not _unavailable(exc):
+                    raise
+            else:
+                return True
+        self._enqueue(kind, path, data)
+        self._wake.set()
+        return False
+
+    def _enqueue(self, kind: str, path: str, data: dict) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO outbox (created, kind, path, data) VALUES (?, ?, ?, ?)",
+                (time.time(), kind, path, json.dumps(data)),
+            )
+
+    def _queued(self) -> bool:
+        with self._lock:
+            return self._queued_locked()
+
+    def _queued_locked(self) -> bool:
+        return self._db.execute("SELECT EXISTS (SELECT 1 FROM outbox WHERE failed = 0)").fetchone()[0] == 1
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of writes waiting to be sent
+        """
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM outbox WHERE failed = 0").fetchone()[0]
+
+    def failed(self) -> list[SMMOutboxEntry]:
+        """
+        The writes the server rejected, oldest first
+        """
+        with self._lock:
+            rows = self._db.execute("SELECT * FROM outbox WHERE failed = 1 ORDER BY id").fetchall()
+        return [SMMOutboxEntry(row) for row in rows]
+
+    def clear_failed(self) -> None:
+        """
+        Delete the writes the server rejected
+        """
+        with self._lock:
+            self._db.execute("DELETE FROM outbox WHERE failed = 1")
+
+    def replay(self, limit: int | None = None) -> int:
+        """
+        Send queued writes in order until the queue is empty, the server is unreachable or limit have been sent
+
+        Returns:
+            int: The number of writes sent.
+        """
+        sent = 0
+        with self._replay_lock:
+            with self._lock:
+                self._replaying = True
+            try:
+                last_id = 0
+                next_send = time.monotonic()
+                while (limit is None or sent < limit) and not self._closed:
+                    with self._lock:
+                        rows = self._db.execute(
+                            "SELECT * FROM outbox WHERE failed = 0 AND id > ? ORDER BY id LIMIT ?",
+                            (last_id, self.batch_size if limit is None else min(self.batch_size, limit - sent)),
+                        ).fetchall()
+                        # Writers can go straight to the server again as soon as the queue is seen empty
+                        if not rows:
+                            self._replaying = False
+                    if not rows:
+                        break
+                    done, rejected, next_send, reachable = self._send_batch(rows, next_send)
+                    self._finish_batch(done, rejected)
+                    sent += len(done)
+                    if not reachable:
+                        break
+                    last_id = rows[-1][0]
+            finally:
+                with self._lock:
+                    self._replaying = False
+        return sent
+
+    def _send_batch(self, rows: list[tuple], next_send: float) -> tuple[list[int], list[tuple], float, bool]:
+        """
+        Send the writes in rows, returning the ids sent, the (id, error) of those rejected, when the next
+        write may be sent and whether the server was reachable throughout
+        """
+        done: list[int] = []
+        rejected: list[tuple] = []
+        for row in rows:
+            if self.rate:
+                delay = next_send - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                next_send = max(next_send, time.monotonic() - 1 / self.rate) + 1 / self.rate
+            entry = SMMOutboxEntry(row)
+            try:
+                self.connection.post(entry.path, entry.data)
+            except Exception as exc:  # noqa: BLE001 # pylint: disable=W0718
+                if _unavailable(exc):
+                    with self._lock:
+                        self._db.execute("UPDATE outbox SET attempts = attempts + 1 WHERE id = ?", (entry.id,))
+                    return done, rejected, next_send, False
+                rejected.append((str(exc), entry.id))
+            else:
+                done.append(entry.id)
+        return done, rejected, next_send, True
+
+    def _finish_batch(self, done: list[int], rejected: list[tuple]) -> None:
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany("DELETE FROM outbox WHERE id = ?", [(entry_id,) for entry_id in done])
+            self._db.executemany(
+                "UPDATE outbox SET failed = 1, attempts = attempts + 1, error = ? WHERE id = ?", rejected
+            )
+            self._db.execute("COMMIT")
+
+    def start(self) -> None:
+        """
+        Start a background thread that replays queued writes, retrying every retry_interval seconds
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="smm-outbox", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._closed:
+            if self._queued():
+                # e.g. the database is locked by another process; try again later
+                with contextlib.suppress(sqlite3.Error):
+                    self.replay()
+            self._wake.wait(self.retry_interval if self._queued() else None)
+            self._wake.clear()
+
+    def close(self, timeout: float | None = None) -> None:
+        """
+        Stop the background thread and close the database; queued writes stay in it for next time
+        """
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._replay_lock, self._lock:
+            self._db.close()
@@ -0,0 +1,373 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Local search pattern preview
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+from smm_client.simplify import EARTH_RADIUS
+from smm_client.types import SMMPointArray
+
+if TYPE_CHECKING:
+    from smm_client.types import SMMPoint
+
+PATTERN_SECTOR = "sector"
+PATTERN_EXPANDING_BOX = "expanding box"
+PATTERN_TRACKLINE = "trackline"
+PATTERN_SHORELINE = "shoreline"
+PATTERN_CREEPING_LINE = "creeping line"
+
+KNOT = 1852 / 3600  # Metres per second
+SECTOR_RADIUS_SWEEPS = 5  # Default sector search radius, in sweep widths
+_MAX_MITER = 4  # Longest offset corner, in offset distances
+_MIN_POLYGON_POINTS = 3
+
+
+class SMMPatternPreview:
+    # pylint: disable=R0902
+    """
+    A search pattern generated locally, with its track and planning metrics
+
+    Distances are in metres and areas in square metres. area is the region the pattern is planned to
+    search (e.g. the circle of a sector search, or the polygon of a creeping line search), swept_area is
+    the track length times the sweep width, and coverage (swept_area / area) is the coverage factor.
+    """
+
+    def __init__(
+        self, pattern: str, points: SMMPointArray, sweep_width: float, track_length: float, legs: int, area: float
+    ) -> None:
+        # pylint: disable=R0913,R0917
+        self.pattern = pattern
+        self.points = points
+        self.sweep_width = sweep_width
+        self.track_length = track_length
+        self.legs = legs
+        self.area = area
+
+    @property
+    def swept_area(self) -> float:
+        """
+        Track length times sweep width, counting overlapping sweeps twice
+        """
+        return self.track_length * self.sweep_width
+
+    @property
+    def coverage(self) -> float:
+        """
+        Coverage factor, the swept area over the area searched
+        """
+        return self.swept_area / self.area if self.area else 0.0
+
+    def duration(self, speed: float) -> float:
+        """
+        Seconds to fly/drive/sail the track at speed knots
+        """
+        return self.track_length / (speed * KNOT)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.pattern} search: {self.legs} legs, {self.track_length / 1000:.2f}km track, "
+            f"{self.area / 1e6:.3f}km² area, coverage {self.coverage:.2f}"
+        )
+
+
+class _LocalPlane:
+    """
+    Equirectangular projection to metres east (x) and north (y) of an origin
+    """
+
+    def __init__(self, lat: float, lng: float) -> None:
+        self.lat = lat
+        self.lng = lng
+        self.x_scale = math.radians(1) * EARTH_RADIUS * math.cos(math.radians(lat))
+        self.y_scale = math.radians(1) * EARTH_RADIUS
+
+    @classmethod
+    def around(cls, points: SMMPointArray) -> _LocalPlane:
+        """
+        A plane centred on the mean latitude of points, with longitudes unwrapped across the antimeridian
+        """
+        return cls(sum(points.lats) / len(points.lats), points.lngs[0])
+
+    def to_xy(self, points: SMMPointArray) -> tuple[list[float], list[float]]:
+        """
+        Project points to the plane
+        """
+        xs = [((lng - self.lng + 180) % 360 - 180) * self.x_scale for lng in points.lngs]
+        ys = [(lat - self.lat) * self.y_scale for lat in points.lats]
+        return xs, ys
+
+    def to_points(self, xs: list[float], ys: list[float]) -> SMMPointArray:
+        """
+        Points on the plane back to latitudes and longitudes
+        """
+        return SMMPointArray(
+            [self.lat + y / self.y_scale for y in ys],
+            [(self.lng + x / self.x_scale + 180) % 360 - 180 for x in xs],
+        )
+
+
+def _length(xs: list[float], ys: list[float]) -> float:
+    return sum(math.hypot(xs[i] - xs[i - 1], ys[i] - ys[i - 1]) for i in range(1, len(xs)))
+
+
+def _rotate(xs: list[float], ys: list[float], bearing: float) -> tuple[list[float], list[float]]:
+    """
+    Rotate clockwise by bearing degrees, so a track heading north ends up heading along bearing
+    """
+    sin, cos = math.sin(math.radians(bearing)), math.cos(math.radians(bearing))
+    return [x * cos + y * sin for x, y in zip(xs, ys)], [y * cos - x * sin for x, y in zip(xs, ys)]
+
+
+def _check_sweep_width(sweep_width: float) -> None:
+    if sweep_width <= 0:
+        msg = f"The sweep width must be positive, got {sweep_width}"
+        raise ValueError(msg)
+
+
+def _line(points: list[SMMPoint] | SMMPointArray, minimum: int = 2) -> SMMPointArray:
+    line = SMMPointArray.from_points(points)
+    if len(line) < minimum:
+        msg = f"The search needs at least {minimum} points, got {len(line)}"
+        raise ValueError(msg)
+    return line
+
+
+def sector(
+    datum: SMMPoint, sweep_width: float, *, radius: float | None = None, first_bearing: float = 0
+) -> SMMPatternPreview:
+    """
+    Preview a sector (VS) search: three triangles through the datum, nine legs of one radius each
+
+    Args:
+        datum (SMMPoint): The point the search is centred on.
+        sweep_width (float): Sweep width in metres.
+        radius (float, optional): Length of each leg in metres, by default SECTOR_RADIUS_SWEEPS sweep widths.
+        first_bearing (float): Bearing of the first leg, in degrees true.
+    """
+    _check_sweep_width(sweep_width)
+    radius = radius if radius is not None else SECTOR_RADIUS_SWEEPS * sweep_width
+    xs, ys = [0.0], [0.0]
+    for triangle in (0, 240, 120):
+        for turn in (0, 120):
+            bearing = math.radians(first_bearing + triangle + turn)
+            xs.append(xs[-1] + radius * math.sin(bearing))
+            ys.append(ys[-1] + radius * math.cos(bearing))
+        xs.append(0.0)
+        ys.append(0.0)
+    plane = _LocalPlane(datum.lat, datum.lng)
+    return SMMPatternPreview(
+        PATTERN_SECTOR, plane.to_points(xs, ys), sweep_width, 9 * radius, 9, math.pi * radius * radius
+    )
+
+
+def expanding_box(
+    datum: SMMPoint, sweep_width: float, iterations: int, *, first_bearing: float = 0
+) -> SMMPatternPreview:
+    """
+    Preview an expanding box (SS) search: legs turning right, lengthening by a sweep width every second leg
+
+    Args:
+        datum (SMMPoint): The point the search starts at.
+        sweep_width (float): Sweep width in metres, also the spacing between the sides of the box.
+        iterations (int): Number of times around the box (four legs each).
+        first_bearing (float): Bearing of the first leg, in degrees true.
+    """
+    _check_sweep_width(sweep_width)
+    xs, ys = [0.0], [0.0]
+    directions = ((0.0, 1.0), (1.0, 0.0), (0.0, -1.0), (-1.0, 0.0))
+    for leg in range(4 * iterations):
+        dx, dy = directions[leg % 4]
+        length = (leg // 2 + 1) * sweep_width
+        xs.append(xs[-1] + dx * length)
+        ys.append(ys[-1] + dy * length)
+    area = (max(xs) - min(xs) + sweep_width) * (max(ys) - min(ys) + sweep_width) if iterations > 0 else 0.0
+    xs, ys = _rotate(xs, ys, first_bearing)
+    plane = _LocalPlane(datum.lat, datum.lng)
+    return SMMPatternPreview(
+        PATTERN_EXPANDING_BOX, plane.to_points(xs, ys), sweep_width, _length(xs, ys), 4 * iterations, area
+    )
+
+
+def trackline(points: list[SMMPoint] | SMMPointArray, sweep_width: float) -> SMMPatternPreview:
+    """
+    Preview a trackline (TS) search: follow the line, searching half a sweep width either side
+
+    Args:
+        points (list[SMMPoint] | SMMPointArray): The line to follow.
+        sweep_width (float): Sweep width in metres.
+    """
+    _check_sweep_width(sweep_width)
+    line = _line(points)
+    length = _length(*_LocalPlane.around(line).to_xy(line))
+    return SMMPatternPreview(PATTERN_TRACKLINE, line, sweep_width, length, len(line) - 1, length * sweep_width)
+
+
+def _miter(before: tuple[float, float], after: tuple[float, float], distance: float) -> tuple[float, float]:
+    """
+    Offset of a corner between segments with unit normals before and after, limited on sharp turns
+    """
+    mx, my = before[0] + after[0], before[1] + after[1]
+    cos_half = math.hypot(mx, my) / 2  # Cosine of half the turn
+    if not cos_half:
+        return 0.0, 0.0
+    scale = distance / max(cos_half, 1 / _MAX_MITER) / (2 * cos_half)
+    return mx * scale, my * scale
+
+
+def _offset(xs: list[float], ys: list[float], distance: float) -> tuple[list[float], list[float]]:
+    """
+    The line moved distance metres to its right (left if negative), with mitred corners
+    """
+    normals = []
+    for i in range(1, len(xs)):
+        dx, dy = xs[i] - xs[i - 1], ys[i] - ys[i - 1]
+        length = math.hypot(dx, dy) or 1.0
+        normals.append((dy / length, -dx / length))
+    corners = [_miter(normals[max(i - 1, 0)], normals[min(i, len(normals) - 1)], distance) for i in range(len(xs))]
+    return [x + cx for x, (cx, _) in zip(xs, corners)], [y + cy for y, (_, cy) in zip(ys, corners)]
+
+
+def shoreline(
+    points: list[SMMPoint] | SMMPointArray, sweep_width: float, *, offset: float | None = None
+) -> SMMPatternPreview:
+    """
+    Preview a shoreline search: a track parallel to the shore, sweeping the strip along it
+
+    Args:
+        points (list[SMMPoint] | SMMPointArray): The shoreline.
+        sweep_width (float): Sweep width in metres.
+        offset (float, optional): How far to the right of the line (in its direction) the track runs, in
+            metres; negative for the left. Half the sweep width by default, so the sweep reaches the shore.
+    """
+    _check_sweep_width(sweep_width)
+    line = _line(points)
+    plane = _LocalPlane.around(line)
+    xs, ys = _offset(*plane.to_xy(line), sweep_width / 2 if offset is None else offset)
+    length = _length(xs, ys)
+    return SMMPatternPreview(
+        PATTERN_SHORELINE, plane.to_points(xs, ys), sweep_width, length, len(line) - 1, length * sweep_width
+    )
+
+
+def _along(xs: list[float], ys: list[float], distances: list[float]):
+    """
+    Yield the point and unit direction at each distance along the line (distances in increasing order)
+    """
+    segment = 1
+    start = 0.0
+    for distance in distances:
+        while True:
+            dx, dy = xs[segment] - xs[segment - 1], ys[segment] - ys[segment - 1]
+            length = math.hypot(dx, dy)
+            if distance <= start + length or segment == len(xs) - 1:
+                break
+            start += length
+            segment += 1
+        t = (distance - start) / length if length else 0.0
+        yield xs[segment - 1] + t * dx, ys[segment - 1] + t * dy, dx / (length or 1.0), dy / (length or 1.0)
+
+
+def _cross_legs(
+    line_xs: list[float], line_ys: list[float], distances: list[float], width: float
+) -> tuple[list[float], list[float]]:
+    """
+    Legs width long, centred on and square to the line at each distance along it, in alternating directions
+    """
+    xs, ys = [], []
+    half = width / 2
+    for leg, (x, y, dx, dy) in enumerate(_along(line_xs, line_ys, distances)):
+        ends = [(x - dy * half, y + dx * half), (x + dy * half, y - dx * half)]
+        for end_x, end_y in ends if leg % 2 == 0 else reversed(ends):
+            xs.append(end_x)
+            ys.append(end_y)
+    return xs, ys
+
+
+def creeping_line(points: list[SMMPoint] | SMMPointArray, sweep_width: float, width: float) -> SMMPatternPreview:
+    """
+    Preview a creeping line ahead (CS) search along a line: legs across the line, one sweep width apart
+
+    Args:
+        points (list[SMMPoint] | SMMPointArray): The line the search advances along.
+        sweep_width (float): Sweep width in metres, also the spacing between legs.
+        width (float): Length of each leg in metres, centred on the line.
+    """
+    _check_sweep_width(sweep_width)
+    line = _line(points)
+    plane = _LocalPlane.around(line)
+    line_xs, line_ys = plane.to_xy(line)
+    length = _length(line_xs, line_ys)
+    legs = max(1, int(length // sweep_width))
+    distances = [min(sweep_width * (leg + 0.5), length) for leg in range(legs)]
+    xs, ys = _cross_legs(line_xs, line_ys, distances, width)
+    return SMMPatternPreview(
+        PATTERN_CREEPING_LINE, plane.to_points(xs, ys), sweep_width, _length(xs, ys), legs, length * width
+    )
+
+
+def _longest_edge_bearing(xs: list[float], ys: list[float]) -> float:
+    edges = [(xs[i] - xs[i - 1], ys[i] - ys[i - 1]) for i in range(len(xs))]
+    dx, dy = max(edges, key=lambda edge: math.hypot(*edge))
+    return math.degrees(math.atan2(dx, dy))
+
+
+def _polygon_area(xs: list[float], ys: list[float]) -> float:
+    return abs(sum(xs[i - 1] * ys[i] - xs[i] * ys[i - 1] for i in range(len(xs)))) / 2
+
+
+def _parallel_legs(poly_xs: list[float], poly_ys: list[float], spacing: float) -> tuple[list[float], list[float]]:
+    """
+    Legs along the x axis spacing apart, each spanning the outermost crossings of the polygon's edges
+    """
+    edges = list(zip(poly_xs[-1:] + poly_xs[:-1], poly_ys[-1:] + poly_ys[:-1], poly_xs, poly_ys))
+    xs: list[float] = []
+    ys: list[float] = []
+    y = min(poly_ys) + spacing / 2
+    while y < max(poly_ys):
+        crossings = [
+            x1 + (y - y1) * (x2 - x1) / (y2 - y1) for x1, y1, x2, y2 in edges if (y1 <= y < y2) or (y2 <= y < y1)
+        ]
+        if crossings:
+            ends = [min(crossings), max(crossings)]
+            xs += ends if len(xs) % 4 == 0 else ends[::-1]
+            ys += [y, y]
+        y += spacing
+    return xs, ys
+
+
+def polygon_creeping_line(
+    points: list[SMMPoint] | SMMPointArray, sweep_width: float, *, bearing: float | None = None
+) -> SMMPatternPreview:
+    """
+    Preview a creeping line (parallel track) search of a polygon, legs one sweep width apart
+
+    Each leg spans the outermost edges of the polygon, so a concave polygon's gaps are crossed, not avoided.
+
+    Args:
+        points (list[SMMPoint] | SMMPointArray): The polygon.
+        sweep_width (float): Sweep width in metres, also the spacing between legs.
+        bearing (float, optional): Direction of the legs in degrees true, by default along the longest edge.
+    """
+    _check_sweep_width(sweep_width)
+    polygon = _line(points, _MIN_POLYGON_POINTS)
+    plane = _LocalPlane.around(polygon)
+    poly_xs, poly_ys = plane.to_xy(polygon)
+    if bearing is None:
+        bearing = _longest_edge_bearing(poly_xs, poly_ys)
+    # Turn the polygon so the legs run along the x axis, then turn the legs back
+    xs, ys = _parallel_legs(*_rotate(poly_xs, poly_ys, 90 - bearing), sweep_width)
+    xs, ys = _rotate(xs, ys, bearing - 90)
+    return SMMPatternPreview(
+        PATTERN_CREEPING_LINE,
+        plane.to_points(xs, ys),
+        sweep_width,
+        _length(xs, ys),
+        len(xs) // 2,
+        _polygon_area(poly_xs, poly_ys),
+    )
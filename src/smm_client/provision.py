@@ -0,0 +1,509 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Bulk provisioning of organizations, asset types, users and assets
+"""
+
+from __future__ import annotations
+
+import contextlib
+import csv
+import functools
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, Iterator, Mapping, Union
+
+from smm_client.connection import SMMUser
+
+if TYPE_CHECKING:
+    from smm_client.assets import SMMAsset, SMMAssetType
+    from smm_client.connection import SMMConnection
+    from smm_client.organizations import SMMOrganization
+
+PROVISION_ORGANIZATION = "organization"
+PROVISION_ASSET_TYPE = "asset type"
+PROVISION_USER = "user"
+PROVISION_ASSET = "asset"
+PROVISION_MEMBER = "organization member"
+PROVISION_ORGANIZATION_ASSET = "organization asset"
+
+CREATED = "created"
+EXISTING = "existing"
+FAILED = "failed"
+# Not on the server, and not created because of dry_run
+MISSING = "missing"
+
+DEFAULT_ROLE = "M"
+
+PlanSource = Union[str, os.PathLike, IO[str]]
+
+
+class SMMUserSpec:
+    # pylint: disable=R0903
+    """
+    A user to provision, with the role they should have in each of their organizations
+    """
+
+    def __init__(self, username: str, password: str, organizations: Mapping[str, str] | None = None) -> None:
+        self.username = username
+        self.password = password
+        self.organizations = dict(organizations or {})
+
+
+class SMMAssetSpec:
+    # pylint: disable=R0903
+    """
+    An asset to provision, with the organizations it should be in
+
+    owner is the username of a user provisioned in the same plan, or the id of an existing user.
+    """
+
+    def __init__(self, name: str, asset_type: str, owner: str | int, organizations: Iterable[str] = ()) -> None:
+        self.name = name
+        self.asset_type = asset_type
+        self.owner = owner
+        self.organizations = list(organizations)
+
+
+class SMMProvisionPlan:
+    """
+    The organizations, asset types, users and assets that should exist, and the organization membership of the
+    users and assets
+
+    Organizations and asset types referred to by users and assets are added to the plan automatically.
+    """
+
+    def __init__(self) -> None:
+        self.organizations: list[str] = []
+        self.asset_types: dict[str, str] = {}
+        self.users: dict[str, SMMUserSpec] = {}
+        self.assets: dict[str, SMMAssetSpec] = {}
+
+    def __len__(self) -> int:
+        memberships = sum(len(user.organizations) for user in self.users.values())
+        memberships += sum(len(asset.organizations) for asset in self.assets.values())
+        return len(self.organizations) + len(self.asset_types) + len(self.users) + len(self.assets) + memberships
+
+    def add_organization(self, name: str) -> None:
+        """
+        An organization that should exist
+        """
+        if name not in self.organizations:
+            self.organizations.append(name)
+
+    def add_asset_type(self, name: str, description: str | None = None) -> None:
+        """
+        An asset type that should exist (the description is only used when it is created)
+        """
+        if description or name not in self.asset_types:
+            self.asset_types[name] = description or name
+
+    def add_user(self, username: str, password: str, organizations: Mapping[str, str] | Iterable[str] = ()) -> None:
+        """
+        A user that should exist, and be in organizations: a list of names, or a dict of name to role
+
+        Adding a user again adds to their organizations.
+        """
+        if not isinstance(organizations, Mapping):
+            organizations = dict.fromkeys(organizations, DEFAULT_ROLE)
+        user = self.users.setdefault(username, SMMUserSpec(username, password))
+        user.organizations.update(organizations)
+        for name in organizations:
+            self.add_organization(name)
+
+    def add_asset(self, name: str, asset_type: str, owner: str | int, organizations: Iterable[str] = ()) -> None:
+        """
+        An asset that should exist, and be in organizations
+
+        Adding an asset again adds to its organizations.
+        """
+        asset = self.assets.setdefault(name, SMMAssetSpec(name, asset_type, owner))
+        for organization in organizations:
+            if organization not in asset.organizations:
+                asset.organizations.append(organization)
+            self.add_organization(organization)
+        self.add_asset_type(asset_type)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> SMMProvisionPlan:
+        """
+        A plan from parsed YAML/JSON:
+
+            organizations: [name, ...]
+            asset_types: [{name, description}, ...]
+            users: [{username, password, organizations: {name: role} or [name, ...]}, ...]
+            assets: [{name, asset_type, owner, organizations: [name, ...]}, ...]
+        """
+        plan = cls()
+        for name in data.get("organizations") or []:
+            plan.add_organization(name)
+        for asset_type in data.get("asset_types") or []:
+            plan.add_asset_type(asset_type["name"], asset_type.get("description"))
+        for user in data.get("users") or []:
+            plan.add_user(user["username"], user["password"], user.get("organizations") or ())
+        for asset in data.get("assets") or []:
+            plan.add_asset(asset["name"], asset["asset_type"], asset["owner"], asset.get("organizations") or ())
+        return plan
+
+    @classmethod
+    def from_json(cls, source: PlanSource) -> SMMProvisionPlan:
+        """
+        A plan from a JSON file, laid out as for from_dict()
+        """
+        with _open(source) as stream:
+            return cls.from_dict(json.load(stream))
+
+    @classmethod
+    def from_yaml(cls, source: PlanSource) -> SMMProvisionPlan:
+        """
+        A plan from a YAML file, laid out as for from_dict() (requires PyYAML: pip install smm-client[yaml])
+        """
+        try:
+            yaml = importlib.import_module("yaml")
+        except ImportError as exc:
+            msg = "from_yaml() requires PyYAML: pip install smm-client[yaml]"
+            raise RuntimeError(msg) from exc
+        with _open(source) as stream:
+            return cls.from_dict(yaml.safe_load(stream) or {})
+
+    @classmethod
+    def from_csv(cls, source: PlanSource) -> SMMProvisionPlan:
+        """
+        A plan from a CSV file with a header row and one item per row
+
+        The kind column is organization, asset_type, user or asset; the other columns are name, description,
+        password, asset_type, owner, organization and role, as needed by the kind. A user or asset in several
+        organizations has a row for each.
+        """
+        plan = cls()
+        with _open(source) as stream:
+            for line, row in enumerate(csv.DictReader(stream), 2):
+                _add_csv_row(plan, line, {key: (value or "").strip() for key, value in row.items() if key})
+        return plan
+
+    @classmethod
+    def from_file(cls, path: str | os.PathLike) -> SMMProvisionPlan:
+        """
+        A plan from a .csv, .yaml/.yml or .json file
+        """
+        extension = os.path.splitext(os.fspath(path))[1].lower()
+        loaders: dict[str, Callable[[PlanSource], SMMProvisionPlan]] = {
+            ".csv": cls.from_csv,
+            ".yaml": cls.from_yaml,
+            ".yml": cls.from_yaml,
+            ".json": cls.from_json,
+        }
+        if extension not in loaders:
+            msg = f"Can't tell the format of {os.fspath(path)!r}, expected .csv, .yaml, .yml or .json"
+            raise ValueError(msg)
+        return loaders[extension](path)
+
+
+def _add_csv_row(plan: SMMProvisionPlan, line: int, row: dict[str, str]) -> None:
+    kind = row.get("kind", "").lower().replace(" ", "_")
+    organizations = [row["organization"]] if row.get("organization") else []
+    try:
+        if kind == "organization":
+            plan.add_organization(row["name"])
+        elif kind == "asset_type":
+            plan.add_asset_type(row["name"], row.get("description"))
+        elif kind == "user":
+            plan.add_user(
+                row["name"], row["password"], {name: row.get("role") or DEFAULT_ROLE for name in organizations}
+            )
+        elif kind == "asset":
+            owner = row["owner"]
+            plan.add_asset(row["name"], row["asset_type"], int(owner) if owner.isdigit() else owner, organizations)
+        else:
+            msg = f"line {line}: unknown kind {row.get('kind')!r}"
+            raise ValueError(msg)
+    except KeyError as exc:
+        msg = f"line {line}: a {kind} needs a {exc} column"
+        raise ValueError(msg) from exc
+
+
+@contextlib.contextmanager
+def _open(source: PlanSource) -> Iterator[IO[str]]:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8", newline="") as stream:
+            yield stream
+    else:
+        yield source
+
+
+class SMMProvisionItem:
+    # pylint: disable=R0903
+    """
+    One thing a provisioning run made sure of, and whether it was created, already existed or failed
+
+    name is the organization, asset type, user or asset name; for memberships it is "member in organization".
+    value is the created or existing object, where there is one.
+    """
+
+    __slots__ = ("error", "kind", "name", "outcome", "seconds", "value")
+
+    def __init__(self, kind: str, name: str, outcome: str = MISSING, value=None) -> None:
+        self.kind = kind
+        self.name = name
+        self.outcome = outcome
+        self.value = value
+        self.error: Exception | None = None
+        self.seconds = 0.0
+
+    def __str__(self) -> str:
+        detail = f": {self.error}" if self.error is not None else ""
+        return f"{self.kind} {self.name} {self.outcome}{detail}"
+
+
+class SMMProvisionReport:
+    """
+    The items of a provisioning run, in the order they were planned, with the total time taken
+    """
+
+    def __init__(self) -> None:
+        self.items: list[SMMProvisionItem] = []
+        self.elapsed = 0.0
+
+    def _with(self, outcome: str) -> list[SMMProvisionItem]:
+        return [item for item in self.items if item.outcome == outcome]
+
+    @property
+    def created(self) -> list[SMMProvisionItem]:
+        """
+        The items created on the server
+        """
+        return self._with(CREATED)
+
+    @property
+    def existing(self) -> list[SMMProvisionItem]:
+        """
+        The items that were already on the server
+        """
+        return self._with(EXISTING)
+
+    @property
+    def failed(self) -> list[SMMProvisionItem]:
+        """
+        The items that could not be created, with the error
+        """
+        return self._with(FAILED)
+
+    @property
+    def missing(self) -> list[SMMProvisionItem]:
+        """
+        The items a dry run would have created
+        """
+        return self._with(MISSING)
+
+    @property
+    def ok(self) -> bool:
+        """
+        Check if nothing failed
+        """
+        return not self.failed
+
+    def __str__(self) -> str:
+        missing = f", {len(self.missing)} missing" if self.missing else ""
+        return (
+            f"Provisioned {len(self.items)} items in {self.elapsed:.2f}s: {len(self.created)} created, "
+            f"{len(self.existing)} existing, {len(self.failed)} failed{missing}"
+        )
+
+
+def _timed_create(item: SMMProvisionItem, create: Callable[[], Any]) -> None:
+    started = time.monotonic()
+    try:
+        item.value = create()
+    except Exception as exc:  # noqa: BLE001 # pylint: disable=W0718
+        item.outcome = FAILED
+        item.error = exc
+    else:
+        item.outcome = CREATED
+    item.seconds = time.monotonic() - started
+
+
+def _failed(item: SMMProvisionItem, message: str) -> SMMProvisionItem:
+    item.outcome = FAILED
+    item.error = LookupError(message)
+    return item
+
+
+class _Provisioner:
+    # pylint: disable=R0902
+    """
+    The state of one provisioning run: what the server has, and the report of what was done
+    """
+
+    def __init__(self, connection: SMMConnection, pool: ThreadPoolExecutor, *, dry_run: bool) -> None:
+        self.connection = connection
+        self.pool = pool
+        self.dry_run = dry_run
+        self.report = SMMProvisionReport()
+        self.organizations: dict[str, SMMOrganization] = {}
+        self.asset_types: dict[str, SMMAssetType] = {}
+        self.assets: dict[str, SMMAsset] = {}
+        # Users are only known by name unless they are created, as the server doesn't list them
+        self.users: dict[str, SMMUser | None] = {}
+        self.failed_users: set[str] = set()
+        self.members: dict[str, dict[str, str]] = {}
+        self.organization_assets: dict[str, set[int]] = {}
+
+    def prefetch(self, plan: SMMProvisionPlan) -> None:
+        """
+        Fetch the existing organizations, asset types and assets, and the members and assets of the planned
+        organizations, all at once
+        """
+        organizations = self.pool.submit(self.connection.get_organizations, all_orgs=True)
+        asset_types = self.pool.submit(self.connection.get_asset_types)
+        assets = self.pool.submit(self.connection.get_assets)
+        self.organizations = {organization.name: organization for organization in organizations.result()}
+        planned = [self.organizations[name] for name in plan.organizations if name in self.organizations]
+        members = {org.name: self.pool.submit(org.get_members) for org in planned}
+        org_assets = {org.name: self.pool.submit(org.get_assets) for org in planned}
+        self.asset_types = {asset_type.name: asset_type for asset_type in asset_types.result()}
+        self.assets = {asset.name: asset for asset in assets.result()}
+        for name, future in members.items():
+            self.members[name] = {member.username: member.role for member in future.result() if member.removed is None}
+            self.users.update(dict.fromkeys(self.members[name]))
+        for name, future in org_assets.items():
+            self.organization_assets[name] = {entry.asset.id for entry in future.result() if entry.removed is None}
+
+    def run(self, tasks: list[tuple[SMMProvisionItem, Callable[[], Any] | None]]) -> list[SMMProvisionItem]:
+        """
+        Record the items, running the create of each one that is missing (concurrently), unless this is a dry run
+        """
+        futures = []
+        for item, create in tasks:
+            self.report.items.append(item)
+            if item.outcome == MISSING and create is not None and not self.dry_run:
+                futures.append(self.pool.submit(_timed_create, item, create))
+        for future in futures:
+            future.result()
+        return [item for item, _ in tasks]
+
+    def _item(self, kind: str, name: str, existing) -> SMMProvisionItem:
+        return SMMProvisionItem(kind, name, EXISTING if existing is not None else MISSING, existing)
+
+    def create_independent(self, plan: SMMProvisionPlan) -> None:
+        """
+        Create the missing organizations, asset types and users
+        """
+        connection = self.connection
+        tasks: list[tuple[SMMProvisionItem, Callable[[], Any] | None]] = []
+        for name in plan.organizations:
+            item = self._item(PROVISION_ORGANIZATION, name, self.organizations.get(name))
+            tasks.append((item, functools.partial(connection.create_organization, name)))
+        for name, description in plan.asset_types.items():
+            item = self._item(PROVISION_ASSET_TYPE, name, self.asset_types.get(name))
+            tasks.append((item, functools.partial(connection.create_asset_type, name, description)))
+        for user in plan.users.values():
+            item = self._item(PROVISION_USER, user.username, None)
+            if user.username in self.users:
+                item.outcome = EXISTING
+            tasks.append((item, functools.partial(connection.create_user, user.username, user.password)))
+        for item in self.run(tasks):
+            if item.outcome == FAILED and item.kind == PROVISION_USER:
+                self.failed_users.add(item.name)
+            if item.outcome != CREATED:
+                continue
+            if item.kind == PROVISION_ORGANIZATION:
+                self.organizations[item.name] = item.value
+            elif item.kind == PROVISION_ASSET_TYPE:
+                self.asset_types[item.name] = item.value
+            else:
+                self.users[item.name] = item.value
+
+    def _asset_task(self, asset: SMMAssetSpec) -> tuple[SMMProvisionItem, Callable[[], Any] | None]:
+        item = self._item(PROVISION_ASSET, asset.name, self.assets.get(asset.name))
+        if item.outcome == EXISTING or self.dry_run:
+            return item, None
+        asset_type = self.asset_types.get(asset.asset_type)
+        owner = SMMUser(asset.owner, "") if isinstance(asset.owner, int) else self.users.get(asset.owner)
+        if asset_type is None:
+            return _failed(item, f"asset type {asset.asset_type} is not on the server"), None
+        if owner is None:
+            reason = "already existed, so its id isn't known" if asset.owner in self.users else "is not in the plan"
+            return _failed(item, f"owner {asset.owner} {reason}; give the owner's user id instead"), None
+        return item, functools.partial(self.connection.create_asset, owner, asset.name, asset_type)
+
+    def create_assets(self, plan: SMMProvisionPlan) -> None:
+        """
+        Create the missing assets, which needs their asset types and owners
+        """
+        for item in self.run([self._asset_task(asset) for asset in plan.assets.values()]):
+            if item.outcome == CREATED:
+                self.assets[item.name] = item.value
+
+    def _membership(self, kind: str, name: str, organization: str, *, existing: bool) -> SMMProvisionItem:
+        item = SMMProvisionItem(kind, f"{name} in {organization}", EXISTING if existing else MISSING)
+        if not existing and not self.dry_run and organization not in self.organizations:
+            _failed(item, f"organization {organization} is not on the server")
+        return item
+
+    def _add_member(self, organization: str, user: SMMUser, role: str) -> None:
+        self.organizations[organization].add_member(user, role)
+
+    def _add_asset(self, organization: str, asset: SMMAsset) -> None:
+        self.organizations[organization].add_asset(asset)
+
+    def create_memberships(self, plan: SMMProvisionPlan) -> None:
+        """
+        Add the users and assets to their organizations, where they aren't already
+        """
+        tasks: list[tuple[SMMProvisionItem, Callable[[], Any] | None]] = []
+        for user in plan.users.values():
+            for organization, role in user.organizations.items():
+                existing = self.members.get(organization, {}).get(user.username) == role
+                item = self._membership(PROVISION_MEMBER, user.username, organization, existing=existing)
+                if user.username in self.failed_users and item.outcome == MISSING:
+                    _failed(item, f"user {user.username} could not be created")
+                # add_member() only needs the username, which is all that is known of an existing user
+                member = self.users.get(user.username) or SMMUser(0, user.username)
+                tasks.append((item, functools.partial(self._add_member, organization, member, role)))
+        for spec in plan.assets.values():
+            asset = self.assets.get(spec.name)
+            for organization in spec.organizations:
+                existing = asset is not None and asset.id in self.organization_assets.get(organization, ())
+                item = self._membership(PROVISION_ORGANIZATION_ASSET, spec.name, organization, existing=existing)
+                if asset is None and item.outcome == MISSING and not self.dry_run:
+                    _failed(item, f"asset {spec.name} is not on the server")
+                tasks.append((item, functools.partial(self._add_asset, organization, asset)))
+        self.run(tasks)
+
+
+def provision(
+    connection: SMMConnection, plan: SMMProvisionPlan, *, workers: int | None = None, dry_run: bool = False
+) -> SMMProvisionReport:
+    """
+    Make sure everything in plan exists on the server, creating only what is missing
+
+    The existing organizations, asset types and assets (and the members and assets of the planned organizations)
+    are fetched once, up front. The missing organizations, asset types and users are then created concurrently,
+    followed by the assets, then the organization memberships. Something that can't be created is recorded in
+    the report rather than raised, along with anything that depended on it.
+
+    The server doesn't list users, so a user is only known to exist if they are a member of one of the planned
+    organizations; otherwise creating them fails, and is reported as failed.
+
+    Args:
+        connection (SMMConnection): The connection to provision with, which needs admin access.
+        plan (SMMProvisionPlan): What should exist.
+        workers (int, optional): Maximum number of requests at once, by default the connection's pool_maxsize.
+        dry_run (bool): Only report what is missing, without creating anything.
+
+    Returns:
+        SMMProvisionReport: Each item's outcome (created, existing, failed, or missing for a dry run) and time taken.
+    """
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers or connection.pool_maxsize, thread_name_prefix="smm-provision") as pool:
+        provisioner = _Provisioner(connection, pool, dry_run=dry_run)
+        provisioner.prefetch(plan)
+        provisioner.create_independent(plan)
+        provisioner.create_assets(plan)
+        provisioner.create_memberships(plan)
+    provisioner.report.elapsed = time.monotonic() - started
+    return provisioner.report
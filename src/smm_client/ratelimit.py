@@ -0,0 +1,316 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Client-side rate limiting and adaptive concurrency
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from smm_client.metrics import endpoint_template
+
+ENDPOINT_TELEMETRY = "telemetry"
+ENDPOINT_READ = "read"
+ENDPOINT_WRITE = "write"
+
+# Requests per second and burst size for each endpoint class
+DEFAULT_RATES: dict[str, tuple[float, float] | None] = {
+    ENDPOINT_TELEMETRY: (20.0, 40.0),
+    ENDPOINT_READ: (20.0, 40.0),
+    ENDPOINT_WRITE: (5.0, 10.0),
+}
+
+_TELEMETRY_ENDPOINTS = frozenset({"/data/assets/{id}/position/add/", "/assets/{id}/status/"})
+_TOO_MANY_REQUESTS = 429
+_SERVICE_UNAVAILABLE = 503
+_SERVER_ERROR = 500
+# Longest Retry-After that is honoured, so a bad header can't stop a client for hours
+_MAX_RETRY_AFTER = 300.0
+# Responses faster than this never count as slow, so scheduling noise on a fast server isn't mistaken for overload
+_MIN_SLOW_LATENCY = 0.05
+# How quickly the latency baseline follows latencies above it
+_BASELINE_DRIFT = 0.01
+
+
+def endpoint_class(method: str, path: str | None) -> str:
+    """
+    The class a request is limited under: ENDPOINT_TELEMETRY for asset position and status updates,
+    ENDPOINT_READ for other GETs and ENDPOINT_WRITE for other POSTs and DELETEs
+    """
+    if method == "GET":
+        return ENDPOINT_READ
+    if endpoint_template(path) in _TELEMETRY_ENDPOINTS:
+        return ENDPOINT_TELEMETRY
+    return ENDPOINT_WRITE
+
+
+def _retry_after(value: str | None) -> float | None:
+    """
+    The delay in a Retry-After header given in seconds (HTTP dates aren't used by SMM)
+    """
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    return min(max(seconds, 0.0), _MAX_RETRY_AFTER)
+
+
+class SMMTokenBucket:
+    """
+    A token bucket: allows rate requests per second on average, and bursts of up to burst requests
+
+    Tokens are reserved in the order acquire() is called, so waiting threads are served first come first served.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None) -> None:
+        """
+        Args:
+            rate (float): Tokens added per second.
+            burst (float, optional): Most tokens the bucket holds, defaults to rate (and at least 1).
+        """
+        if rate <= 0:
+            msg = f"Token bucket rate must be positive: {rate}"
+            raise ValueError(msg)
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, returning how many seconds to wait before using it
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now > self._updated:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            self._tokens -= 1
+            return max(self._updated - now, 0.0) + max(-self._tokens, 0.0) / self.rate
+
+    def acquire(self) -> None:
+        """
+        Wait for a token
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Don't hand out tokens for the next seconds (e.g. from a Retry-After header)
+
+        Requests that already have a token aren't held back.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now > self._updated:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = max(self._updated, now + seconds)
+            self._tokens = min(self._tokens, 1.0)
+
+
+class SMMAdaptiveConcurrency:
+    # pylint: disable=R0902
+    """
+    Limits the number of requests in flight, adjusting the limit with AIMD (additive increase, multiplicative
+    decrease) like TCP congestion control
+
+    Every successful, timely response while the limit is reached raises it by 1/limit, so it grows by about one
+    per round trip.
+    A 429, 5xx, failed or slow request multiplies it by backoff, at most once per round trip: requests that were
+    sent before the last decrease don't decrease it again.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 64,
+        *,
+        latency_target: float | None = None,
+        latency_tolerance: float = 2.0,
+        backoff: float = 0.5,
+    ) -> None:
+        # pylint: disable=R0913
+        """
+        Args:
+            initial (int): The limit to start with.
+            minimum (int): The lowest the limit goes.
+            maximum (int): The highest the limit goes.
+            latency_target (float, optional): Responses slower than this many seconds count as overload. By default
+                responses slower than latency_tolerance times the fastest recent response do.
+            latency_tolerance (float): How much slower than the baseline a response can be without counting as
+                overload, when there is no latency_target.
+            backoff (float): What the limit is multiplied by on overload.
+        """
+        if not 1 <= minimum <= initial <= maximum:
+            msg = f"Concurrency limits must satisfy 1 <= minimum <= initial <= maximum: {minimum}, {initial}, {maximum}"
+            raise ValueError(msg)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._baseline: float | None = None
+        self._decreased = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """
+        The number of requests currently allowed in flight
+        """
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """
+        The number of requests in flight
+        """
+        return self._in_flight
+
+    def acquire(self) -> float:
+        """
+        Wait until a request can be sent, returning the time (time.monotonic()) it was allowed to start
+        """
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+            return time.monotonic()
+
+    def release(self, started: float, *, overloaded: bool) -> None:
+        """
+        Record the outcome of a request started at started (returned by acquire())
+
+        Args:
+            started (float): The time acquire() returned.
+            overloaded (bool): The server rejected the request or failed (429, 5xx or no response).
+        """
+        with self._condition:
+            now = time.monotonic()
+            saturated = self._in_flight >= int(self._limit)
+            self._in_flight -= 1
+            if overloaded or self._slow(now - started):
+                if started >= self._decreased:
+                    self._limit = max(float(self.minimum), self._limit * self.backoff)
+                    self._decreased = now
+            elif saturated:
+                # Only grow a limit that is holding requests back, so it can't creep up while the token buckets
+                # are what limits the rate and then let a burst through
+                self._limit = min(float(self.maximum), self._limit + 1 / self._limit)
+            self._notify()
+
+    def cancel(self) -> None:
+        """
+        Release a request that says nothing about the server (e.g. it failed before being sent), without
+        changing the limit
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._notify()
+
+    def _notify(self) -> None:
+        free = int(self._limit) - self._in_flight
+        if free > 0:
+            self._condition.notify(free)
+
+    def _slow(self, latency: float) -> bool:
+        if self.latency_target is not None:
+            return latency > self.latency_target
+        baseline = self._baseline
+        if baseline is None or latency < baseline:
+            self._baseline = latency
+            return False
+        # Follow slower responses slowly, so the baseline adapts to a server that got slower for good
+        self._baseline = baseline + (latency - baseline) * _BASELINE_DRIFT
+        return latency > max(baseline * self.latency_tolerance, _MIN_SLOW_LATENCY)
+
+
+class SMMRatePermit:
+    # pylint: disable=R0903
+    """
+    Permission to send one request, from SMMRateLimiter.acquire(); call done() when the response arrives
+    """
+
+    __slots__ = ("_bucket", "_concurrency", "_started")
+
+    def __init__(self, bucket: SMMTokenBucket | None, concurrency: SMMAdaptiveConcurrency, started: float) -> None:
+        self._bucket = bucket
+        self._concurrency = concurrency
+        self._started = started
+
+    def done(self, status: int | None, retry_after: str | None = None) -> None:
+        """
+        Release the permit
+
+        Args:
+            status (int, optional): The response status, None if the request failed without a response
+                (a connection error or timeout).
+            retry_after (str, optional): The response's Retry-After header.
+        """
+        overloaded = status is None or status == _TOO_MANY_REQUESTS or status >= _SERVER_ERROR
+        if status in (_TOO_MANY_REQUESTS, _SERVICE_UNAVAILABLE) and self._bucket is not None:
+            delay = _retry_after(retry_after)
+            if delay:
+                self._bucket.pause(delay)
+        self._concurrency.release(self._started, overloaded=overloaded)
+
+    def cancel(self) -> None:
+        """
+        Release the permit of a request that failed for a reason unrelated to the server, e.g. a missing CSRF token
+        """
+        self._concurrency.cancel()
+
+
+class SMMRateLimiter:
+    # pylint: disable=R0903
+    """
+    Spaces out the requests an SMMConnection makes, so a fleet of clients reconnecting at once doesn't overwhelm
+    the server
+
+    Each endpoint class (see endpoint_class()) has its own token bucket, so a flood of position updates doesn't
+    hold up reads. The number of requests in flight is limited by an SMMAdaptiveConcurrency, which backs off when
+    the server answers 429/5xx or slows down and creeps back up while it keeps up. A 429 or 503 with a Retry-After
+    header also pauses that class's bucket for the time given.
+
+    Thread safe; pass it to SMMConnection(rate_limiter=...). Share one between connections to limit them together.
+    """
+
+    def __init__(
+        self,
+        rates: dict[str, tuple[float, float] | None] | None = None,
+        *,
+        concurrency: SMMAdaptiveConcurrency | None = None,
+    ) -> None:
+        """
+        Args:
+            rates (dict, optional): (requests per second, burst) for each endpoint class, or None for no limit.
+                Classes not given use DEFAULT_RATES.
+            concurrency (SMMAdaptiveConcurrency, optional): The concurrency limit, defaults to SMMAdaptiveConcurrency().
+                Use minimum == maximum for a fixed limit.
+        """
+        rates = {**DEFAULT_RATES, **(rates or {})}
+        self.buckets = {
+            endpoint: SMMTokenBucket(*rate) if rate is not None else None for endpoint, rate in rates.items()
+        }
+        self.concurrency = concurrency if concurrency is not None else SMMAdaptiveConcurrency()
+
+    def acquire(self, method: str, path: str | None) -> SMMRatePermit:
+        """
+        Wait until a request can be sent: for a token from its endpoint class's bucket, then for room under the
+        concurrency limit
+        """
+        bucket = self.buckets.get(endpoint_class(method, path))
+        if bucket is not None:
+            bucket.acquire()
+        return SMMRatePermit(bucket, self.concurrency, self.concurrency.acquire())
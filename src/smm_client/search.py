@@ -10,7 +10,7 @@ from __future__ import annotations
 from json import JSONDecodeError
 from typing import TYPE_CHECKING
 
-from smm_client.types import SMMMalformedDataError, SMMPoint
+from smm_client.types import SMMMalformedDataError, SMMPointArray
 
 if TYPE_CHECKING:
     from smm_client.assets import SMMAsset
@@ -27,7 +27,7 @@ class SMMSearchData:
         try:
             self.id = geojson["id"]
             self.properties = geojson["properties"]
-            self.coords = [SMMPoint(p[1], p[0]) for p in geojson["geometry"]["coordinates"]]
+            self.coords = SMMPointArray.from_lnglat(geojson["geometry"]["coordinates"])
         except (KeyError, IndexError, TypeError) as exc:
             raise SMMMalformedDataError("search", exc) from exc
 
@@ -70,7 +70,7 @@ class SMMSearch:
         """
         res = self.connection.post(self.__url_component("begin/"), data={"asset_id": asset.id})
         try:
-            return SMMSearchData(res.json()["features"][0])
+            return SMMSearchData(self.connection.json_decoder.loads(res.content)["features"][0])
         except JSONDecodeError:
             return None
 
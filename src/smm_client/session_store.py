@@ -0,0 +1,130 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Persistent session store
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import time
+from typing import TYPE_CHECKING, Iterator
+
+from requests.cookies import create_cookie
+
+try:
+    import fcntl
+except ImportError:  # no cov
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from http.cookiejar import Cookie, CookieJar
+
+_FILE_MODE = 0o600
+_DIRECTORY_MODE = 0o700
+
+
+def _cookie_to_json(cookie: Cookie) -> dict:
+    return {
+        "name": cookie.name,
+        "value": cookie.value,
+        "domain": cookie.domain,
+        "path": cookie.path,
+        "secure": cookie.secure,
+        "expires": cookie.expires,
+    }
+
+
+class SMMSessionStore:
+    """
+    Keeps SMM session cookies on disk so a new SMMConnection can skip logging in
+
+    The file holds session cookies (which grant access to the account), so it is created readable
+    only by the current user. Sessions are keyed by server URL and username; passwords are never stored.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        """
+        Args:
+            path (str): The file to keep sessions in, created if it doesn't exist.
+        """
+        self.path = os.fspath(path)
+
+    @staticmethod
+    def _key(url: str, username: str) -> str:
+        return f"{username}@{url}"
+
+    @contextlib.contextmanager
+    def _locked(self, *, exclusive: bool) -> Iterator[None]:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=_DIRECTORY_MODE, exist_ok=True)
+        lock_fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, _FILE_MODE)
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+        finally:
+            os.close(lock_fd)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as store_file:
+                sessions = json.load(store_file)
+        except (OSError, ValueError):
+            return {}
+        return sessions if isinstance(sessions, dict) else {}
+
+    def _write(self, sessions: dict) -> None:
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, _FILE_MODE)
+        with os.fdopen(fd, "w", encoding="utf-8") as store_file:
+            json.dump(sessions, store_file)
+        os.replace(temp_path, self.path)
+
+    def load(self, url: str, username: str) -> list[Cookie]:
+        """
+        Get the stored (unexpired) cookies for username on the server at url
+        """
+        with self._locked(exclusive=False):
+            session = self._read().get(self._key(url, username), {})
+        now = time.time()
+        try:
+            return [
+                create_cookie(
+                    cookie["name"],
+                    cookie["value"],
+                    domain=cookie["domain"],
+                    path=cookie["path"],
+                    secure=cookie["secure"],
+                    expires=cookie["expires"],
+                )
+                for cookie in session.get("cookies", [])
+                if cookie["expires"] is None or cookie["expires"] > now
+            ]
+        except (KeyError, TypeError):
+            return []
+
+    def save(self, url: str, username: str, cookies: CookieJar) -> None:
+        """
+        Store the cookies for username on the server at url
+        """
+        with self._locked(exclusive=True):
+            sessions = self._read()
+            sessions[self._key(url, username)] = {
+                "saved": time.time(),
+                "cookies": [_cookie_to_json(cookie) for cookie in cookies],
+            }
+            self._write(sessions)
+
+    def clear(self, url: str, username: str) -> None:
+        """
+        Forget the stored session for username on the server at url
+        """
+        with self._locked(exclusive=True):
+            sessions = self._read()
+            if sessions.pop(self._key(url, username), None) is not None:
+                self._write(sessions)
@@ -0,0 +1,250 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Line and polygon simplification
+"""
+
+from __future__ import annotations
+
+import functools
+import heapq
+import importlib
+import math
+from typing import TYPE_CHECKING, Callable, Sequence
+
+from smm_client.types import SMMPointArray
+
+if TYPE_CHECKING:
+    from smm_client.types import SMMPoint
+
+DOUGLAS_PEUCKER = "douglas-peucker"
+VISVALINGAM = "visvalingam"
+
+EARTH_RADIUS = 6371008.8  # Mean radius in metres
+_MIN_POLYGON_POINTS = 3
+# Spans shorter than this are measured in Python, where NumPy's per-call overhead would dominate
+_VECTORIZE_SPAN = 64
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """
+    NumPy, or None if it isn't installed
+
+    Imported on first use rather than with this module, as importing NumPy takes longer than the rest of the client.
+    """
+    try:
+        return importlib.import_module("numpy")
+    except ImportError:  # no cov
+        return None
+
+
+class SMMSimplification:
+    # pylint: disable=R0903
+    """
+    The result of simplifying a line or polygon
+
+    max_deviation is the furthest (in metres) any of the original points is from the simplified
+    line, which is never more than the tolerance.
+    """
+
+    def __init__(
+        self, points: SMMPointArray, original_count: int, max_deviation: float, tolerance: float, method: str
+    ) -> None:
+        # pylint: disable=R0913,R0917
+        self.points = points
+        self.original_count = original_count
+        self.max_deviation = max_deviation
+        self.tolerance = tolerance
+        self.method = method
+
+    @property
+    def count(self) -> int:
+        """
+        Number of points after simplification
+        """
+        return len(self.points)
+
+    @property
+    def reduction(self) -> float:
+        """
+        Fraction of the original points removed
+        """
+        return 1 - self.count / self.original_count if self.original_count else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.original_count} -> {self.count} points ({self.reduction:.1%} fewer), "
+            f"max deviation {self.max_deviation:.1f}m (tolerance {self.tolerance}m)"
+        )
+
+
+def _project(points: SMMPointArray) -> tuple[list[float], list[float]]:
+    """
+    Project to metres on a plane tangent at the mean latitude (equirectangular), which is accurate
+    to well under 1% over the extent of a search area. Longitudes are unwrapped across the antimeridian.
+    """
+    scale = math.cos(math.radians(sum(points.lats) / len(points.lats)))
+    xs = []
+    previous = points.lngs[0]
+    offset = 0.0
+    for lng in points.lngs:
+        if lng - previous > 180:  # noqa: PLR2004
+            offset -= 360
+        elif previous - lng > 180:  # noqa: PLR2004
+            offset += 360
+        previous = lng
+        xs.append(math.radians(lng + offset) * EARTH_RADIUS * scale)
+    ys = [math.radians(lat) * EARTH_RADIUS for lat in points.lats]
+    return xs, ys
+
+
+def _segment_distances(xs: Sequence[float], ys: Sequence[float], first: int, last: int) -> list[float]:
+    """
+    Distances of the points between first and last (exclusive) from the segment joining them
+    """
+    x1, y1, dx, dy = xs[first], ys[first], xs[last] - xs[first], ys[last] - ys[first]
+    length2 = dx * dx + dy * dy
+    distances = []
+    for i in range(first + 1, last):
+        t = ((xs[i] - x1) * dx + (ys[i] - y1) * dy) / length2 if length2 else 0.0
+        t = min(1.0, max(0.0, t))
+        distances.append(math.hypot(xs[i] - x1 - t * dx, ys[i] - y1 - t * dy))
+    return distances
+
+
+def _numpy_segment_distances(xs, ys, first: int, last: int):
+    """
+    _segment_distances for NumPy arrays, computed for all the points at once
+    """
+    start = first + 1
+    px, py = xs[start:last], ys[start:last]
+    x1, y1, dx, dy = xs[first], ys[first], xs[last] - xs[first], ys[last] - ys[first]
+    length2 = dx * dx + dy * dy
+    np = _numpy()
+    t = np.clip(((px - x1) * dx + (py - y1) * dy) / length2, 0.0, 1.0) if length2 else 0.0
+    return np.hypot(px - x1 - t * dx, py - y1 - t * dy)
+
+
+def _farthest(distances) -> tuple[int, float]:
+    if not isinstance(distances, list):
+        index = int(_numpy().argmax(distances))
+        return index, float(distances[index])
+    distance = max(distances)
+    return distances.index(distance), distance
+
+
+def _douglas_peucker(distances: Callable, count: int, tolerance: float) -> list[int]:
+    keep = [0, count - 1]
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:  # noqa: PLR2004
+            continue
+        offset, distance = _farthest(distances(first, last))
+        if distance > tolerance:
+            index = first + 1 + offset
+            keep.append(index)
+            stack.append((first, index))
+            stack.append((index, last))
+    return sorted(keep)
+
+
+def _triangle_area(xs: Sequence[float], ys: Sequence[float], a: int, b: int, c: int) -> float:
+    return abs((xs[b] - xs[a]) * (ys[c] - ys[a]) - (xs[c] - xs[a]) * (ys[b] - ys[a])) / 2
+
+
+def _visvalingam(xs, ys, distances: Callable, tolerance: float) -> list[int]:
+    """
+    Remove the point making the smallest triangle with its neighbours first (Visvalingam-Whyatt), but only
+    while every original point between the new neighbours stays within tolerance of the joining segment
+    """
+    count = len(xs)
+    previous = list(range(-1, count - 1))
+    following = list(range(1, count + 1))
+    removed = [False] * count
+    heap = [(_triangle_area(xs, ys, i - 1, i, i + 1), i, i - 1, i + 1) for i in range(1, count - 1)]
+    heapq.heapify(heap)
+    while heap:
+        _, i, before, after = heapq.heappop(heap)
+        if removed[i] or previous[i] != before or following[i] != after:
+            continue  # Stale entry, the neighbours have changed since it was pushed
+        offset_distances = distances(before, after)
+        if len(offset_distances) and _farthest(offset_distances)[1] > tolerance:
+            continue  # Pushed again if a neighbour is removed
+        removed[i] = True
+        following[before] = after
+        previous[after] = before
+        for j in (before, after):
+            if 0 < j < count - 1:
+                heapq.heappush(
+                    heap, (_triangle_area(xs, ys, previous[j], j, following[j]), j, previous[j], following[j])
+                )
+    return [i for i in range(count) if not removed[i]]
+
+
+def _max_deviation(distances: Callable, kept: list[int]) -> float:
+    deviation = 0.0
+    for first, last in zip(kept, kept[1:]):
+        if last - first > 1:
+            deviation = max(deviation, _farthest(distances(first, last))[1])
+    return deviation
+
+
+def simplify(
+    points: list[SMMPoint] | SMMPointArray,
+    tolerance: float,
+    *,
+    method: str = DOUGLAS_PEUCKER,
+    closed: bool = False,
+) -> SMMSimplification:
+    """
+    Remove points from a line or polygon that are within tolerance metres of the simplified shape
+
+    Douglas-Peucker is faster and usually keeps fewer points; Visvalingam-Whyatt removes points in order
+    of the area they contribute, which keeps the character of wiggly tracks better. Either way, no
+    original point ends up further than tolerance from the simplified line. Uses NumPy if it is installed.
+
+    Args:
+        points (list[SMMPoint] | SMMPointArray): The points of the line or polygon.
+        tolerance (float): Maximum distance in metres between an original point and the simplified line.
+        method (str): DOUGLAS_PEUCKER or VISVALINGAM.
+        closed (bool): The points are a polygon, so the last point joins back to the first. A polygon that
+            would have fewer than 3 points left is not simplified.
+
+    Returns:
+        SMMSimplification: The simplified points, how many were removed and the actual maximum deviation.
+    """
+    if method not in (DOUGLAS_PEUCKER, VISVALINGAM):
+        msg = f"Unknown simplification method: {method}"
+        raise ValueError(msg)
+    original = SMMPointArray.from_points(points)
+    count = len(original)
+    if count < 3:  # noqa: PLR2004
+        return SMMSimplification(original, count, 0.0, tolerance, method)
+    xs, ys = _project(original)
+    if closed:
+        # Simplify the ring as a line ending back at the start, so the closing edge is checked too
+        xs.append(xs[0])
+        ys.append(ys[0])
+    # Only lines long enough to have spans worth vectorizing need NumPy
+    np = _numpy() if len(xs) > _VECTORIZE_SPAN + 1 else None
+    arrays = (np.array(xs), np.array(ys)) if np is not None else None
+
+    def segment_distances(first: int, last: int):
+        if arrays is not None and last - first > _VECTORIZE_SPAN:
+            return _numpy_segment_distances(arrays[0], arrays[1], first, last)
+        return _segment_distances(xs, ys, first, last)
+
+    if method == DOUGLAS_PEUCKER:
+        kept = _douglas_peucker(segment_distances, len(xs), tolerance)
+    else:
+        kept = _visvalingam(xs, ys, segment_distances, tolerance)
+    deviation = _max_deviation(segment_distances, kept)
+    if closed:
+        kept = kept[:-1]
+        if len(kept) < _MIN_POLYGON_POINTS:
+            return SMMSimplification(original, count, 0.0, tolerance, method)
+    simplified = SMMPointArray([original.lats[i] for i in kept], [original.lngs[i] for i in kept])
+    return SMMSimplification(simplified, count, deviation, tolerance, method)
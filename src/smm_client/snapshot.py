@@ -0,0 +1,313 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Mission snapshots
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
+
+from smm_client.assets import SMMAsset
+from smm_client.fleet import _timed
+
+if TYPE_CHECKING:
+    from smm_client.assets import SMMAssetCommand, SMMAssetStatus
+    from smm_client.connection import SMMConnection
+    from smm_client.missions import SMMMission
+
+
+SNAPSHOT_ASSETS = "assets"
+SNAPSHOT_ORGANIZATIONS = "organizations"
+SNAPSHOT_EXTERNAL_REFERENCES = "external_references"
+SNAPSHOT_ASSET_STATUS = "asset_status"
+SNAPSHOT_ASSET_COMMANDS = "asset_commands"
+
+_FIELDS = ("mission_id", "mission_name", "taken", "assets", "organizations", "external_references", "errors", "timings")
+
+
+def _msgpack(method: str):
+    """
+    The msgpack module, imported when first needed rather than with this module
+    """
+    try:
+        return importlib.import_module("msgpack")
+    except ImportError as exc:
+        msg = f"{method}() requires msgpack: pip install smm-client[msgpack]"
+        raise RuntimeError(msg) from exc
+
+
+def _freeze(value):
+    """
+    A read-only copy of JSON-like data: dicts become mappingproxies and lists tuples
+    """
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class SMMMissionSnapshot:
+    """
+    An immutable picture of a mission: its assets (each with its status and command), organizations and
+    external references, as plain JSON-compatible data
+
+    errors maps each part that could not be fetched (e.g. "organizations", "asset_status/42" for one
+    asset, or "assets/3" for an unreadable entry in the asset list) to the error message, and timings the
+    seconds each part took, plus "total".
+    """
+
+    __slots__ = _FIELDS
+
+    mission_id: int
+    mission_name: str
+    taken: float
+    assets: tuple[Mapping[str, Any], ...]
+    organizations: tuple[Mapping[str, Any], ...]
+    external_references: tuple[Mapping[str, Any], ...]
+    errors: Mapping[str, str]
+    timings: Mapping[str, float]
+
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        """
+        Args:
+            data (dict): The snapshot as returned by to_dict().
+        """
+        for field in _FIELDS:
+            object.__setattr__(self, field, _freeze(data[field]))
+
+    def __setattr__(self, name: str, value) -> None:
+        msg = "SMMMissionSnapshot is immutable"
+        raise AttributeError(msg)
+
+    def __delattr__(self, name: str) -> None:
+        msg = "SMMMissionSnapshot is immutable"
+        raise AttributeError(msg)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SMMMissionSnapshot):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __str__(self) -> str:
+        failed = f", {len(self.errors)} errors" if self.errors else ""
+        return (
+            f"Snapshot of {self.mission_name} ({self.mission_id}): {len(self.assets)} assets, "
+            f"{len(self.organizations)} organizations, {len(self.external_references)} external references "
+            f"in {self.timings['total'] * 1000:.0f}ms{failed}"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        The snapshot as plain (mutable) dicts and lists
+        """
+        return {field: _thaw(getattr(self, field)) for field in _FIELDS}
+
+    def to_json(self, **kwargs) -> str:
+        """
+        The snapshot encoded as JSON, kwargs are passed to json.dumps
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_msgpack(self) -> bytes:
+        """
+        The snapshot encoded with MessagePack (requires msgpack: pip install smm-client[msgpack])
+        """
+        return _msgpack("to_msgpack").packb(self.to_dict())
+
+    @classmethod
+    def from_json(cls, data: str | bytes) -> SMMMissionSnapshot:
+        """
+        Load a snapshot saved with to_json()
+        """
+        return cls(json.loads(data))
+
+    @classmethod
+    def from_msgpack(cls, data: bytes) -> SMMMissionSnapshot:
+        """
+        Load a snapshot saved with to_msgpack()
+        """
+        return cls(_msgpack("from_msgpack").unpackb(data))
+
+
+def _status_json(status: SMMAssetStatus | None) -> dict | None:
+    if status is None:
+        return None
+    return {"status": status.status, "inop": status.inop, "since": status.since, "notes": status.notes}
+
+
+def _command_json(command: SMMAssetCommand | None) -> dict | None:
+    if command is None:
+        return None
+    position = getattr(command, "position", None)
+    return {
+        "id": command.id,
+        "command": command.command,
+        "issued": command.issued,
+        "issued_by": command.issued_by,
+        "reason": command.reason,
+        "position": {"lat": position.lat, "lng": position.lng} if position is not None else None,
+        "response": {
+            "by": command.responded_by,
+            "type": command.response_type,
+            "message": command.response_message,
+        },
+    }
+
+
+def _fetch_organizations(mission: SMMMission) -> list[dict]:
+    return [{"id": org.organization.id, "name": org.organization.name} for org in mission.get_organizations()]
+
+
+def _fetch_external_references(mission: SMMMission) -> list[dict]:
+    return [
+        {"id": ref.id, "name": ref.name, "code": ref.code, "url": ref.url, "notes": ref.notes}
+        for ref in mission.get_external_references()
+    ]
+
+
+def _fetch_assets(mission: SMMMission) -> list:
+    return mission.assets()
+
+
+def _span(results: Iterable[tuple]) -> float:
+    spans = [(started, finished) for _, _, started, finished in results]
+    return max(finished for _, finished in spans) - min(started for started, _ in spans) if spans else 0.0
+
+
+def _asset_status(asset: SMMAsset) -> dict | None:
+    return _status_json(asset.get_status())
+
+
+def _asset_command(asset: SMMAsset) -> dict | None:
+    return _command_json(asset.get_command())
+
+
+class _SnapshotParts:
+    """
+    Collects the results of the snapshot requests, with their timings and errors
+    """
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.values: dict[str, Any] = {}
+        self.errors: dict[str, str] = {}
+        self.timings: dict[str, float] = {}
+
+    def add(self, name: str, result: tuple) -> Any:
+        """
+        Record the (value, error, started, finished) result of the request for part name, returning the value
+        """
+        value, error, started, finished = result
+        self.values[name] = value
+        self.timings[name] = finished - started
+        if error is not None:
+            self.errors[name] = str(error)
+        return value
+
+    def listed_assets(self, connection: SMMConnection, listed: list | None) -> list[SMMAsset]:
+        """
+        The assets in the mission's asset list, recording entries without an id and name as errors
+        """
+        assets = []
+        for index, entry in enumerate(listed or []):
+            try:
+                assets.append(connection.identity_map.get(SMMAsset, connection, entry["id"], entry["name"]))
+            except (KeyError, TypeError) as exc:
+                self.errors[f"{SNAPSHOT_ASSETS}/{index}"] = f"Malformed asset entry {entry!r}: {exc!r}"
+        return assets
+
+    def add_assets(self, listed: list | None, per_asset: list[tuple]) -> list[dict]:
+        """
+        One entry per asset: its id, name, entry in the mission's asset list (if any), status and command
+        """
+        details = {entry.get("id"): entry for entry in listed or [] if isinstance(entry, Mapping)}
+        self.timings[SNAPSHOT_ASSET_STATUS] = _span(status for _, status, _ in per_asset)
+        self.timings[SNAPSHOT_ASSET_COMMANDS] = _span(command for _, _, command in per_asset)
+        entries = []
+        for asset, status, command in per_asset:
+            for name, (_, error, _, _) in ((SNAPSHOT_ASSET_STATUS, status), (SNAPSHOT_ASSET_COMMANDS, command)):
+                if error is not None:
+                    self.errors[f"{name}/{asset.id}"] = str(error)
+            entries.append(
+                {
+                    "id": asset.id,
+                    "name": asset.name,
+                    "details": details.get(asset.id),
+                    "status": status[0],
+                    "command": command[0],
+                }
+            )
+        return entries
+
+
+def snapshot_mission(
+    mission: SMMMission, *, assets: Iterable[SMMAsset] | None = None, workers: int | None = None
+) -> SMMMissionSnapshot:
+    """
+    Fetch the mission's assets, organizations and external references, and each asset's status and command,
+    all at once on a pool of threads
+
+    The per-asset requests start as soon as the mission's asset list arrives, so a snapshot takes about two
+    round trips; pass the assets if they are already known to make it about one. A part that fails is
+    recorded in the snapshot's errors rather than raised.
+
+    Args:
+        mission (SMMMission): The mission to take a snapshot of.
+        assets (Iterable[SMMAsset], optional): The assets to fetch the status/command of, instead of those in
+            the mission's asset list.
+        workers (int, optional): Maximum number of requests at once, by default the connection's pool_maxsize.
+
+    Returns:
+        SMMMissionSnapshot: The mission state.
+    """
+    connection = mission.connection
+    parts = _SnapshotParts()
+    with ThreadPoolExecutor(max_workers=workers or connection.pool_maxsize, thread_name_prefix="smm-snapshot") as pool:
+        futures = {
+            SNAPSHOT_ASSETS: pool.submit(_timed, _fetch_assets, mission),
+            SNAPSHOT_ORGANIZATIONS: pool.submit(_timed, _fetch_organizations, mission),
+            SNAPSHOT_EXTERNAL_REFERENCES: pool.submit(_timed, _fetch_external_references, mission),
+        }
+        if assets is None:
+            assets = parts.listed_assets(connection, parts.add(SNAPSHOT_ASSETS, futures[SNAPSHOT_ASSETS].result()))
+        per_asset = [
+            (asset, pool.submit(_timed, _asset_status, asset), pool.submit(_timed, _asset_command, asset))
+            for asset in assets
+        ]
+        for name, future in futures.items():
+            parts.add(name, future.result())
+        asset_entries = parts.add_assets(
+            parts.values[SNAPSHOT_ASSETS],
+            [(asset, status.result(), command.result()) for asset, status, command in per_asset],
+        )
+    parts.timings["total"] = time.monotonic() - parts.started
+    return SMMMissionSnapshot(
+        {
+            "mission_id": mission.id,
+            "mission_name": mission.name,
+            "taken": time.time(),
+            "assets": asset_entries,
+            "organizations": parts.values[SNAPSHOT_ORGANIZATIONS] or [],
+            "external_references": parts.values[SNAPSHOT_EXTERNAL_REFERENCES] or [],
+            "errors": parts.errors,
+            "timings": parts.timings,
+        }
+    )
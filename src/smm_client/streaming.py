@@ -0,0 +1,150 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Incremental JSON parsing
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+_COMPACT_THRESHOLD = 65536
+
+
+class _JSONStream:
+    """
+    Text buffer over an iterable of chunks, holding only the part of the document not yet parsed
+    """
+
+    def __init__(self, chunks: Iterable[bytes | str]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """
+        Read the next chunk into the buffer, returning False at the end of the input
+        """
+        if self.eof:
+            return False
+        if self.pos > _COMPACT_THRESHOLD:
+            consumed = self.pos
+            self.buffer = self.buffer[consumed:]
+            self.pos = 0
+        for chunk in self._chunks:
+            text = chunk if isinstance(chunk, str) else self._decoder.decode(chunk)
+            if text:
+                self.buffer += text
+                return True
+        self.buffer += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def next_char(self) -> str:
+        """
+        Consume and return the next non-whitespace character
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                self.pos += 1
+                return self.buffer[self.pos - 1]
+            if not self.fill():
+                raise json.JSONDecodeError("Unexpected end of data", self.buffer, self.pos)
+
+    def expect(self, char: str) -> None:
+        """
+        Consume the next non-whitespace character, which must be char
+        """
+        found = self.next_char()
+        if found != char:
+            raise json.JSONDecodeError(f"Expected {char!r} but found {found!r}", self.buffer, self.pos - 1)
+
+    def peek(self) -> str:
+        """
+        Return the next non-whitespace character without consuming it
+        """
+        char = self.next_char()
+        self.pos -= 1
+        return char
+
+    def value(self):
+        """
+        Consume and return the next complete JSON value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number that runs to the end of the buffer (or stops just short of an unread
+            # fraction/exponent, e.g. "0" of "0.5") may continue in the next chunk
+            if self._number_may_continue(value, end) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def _number_may_continue(self, value, end: int) -> bool:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        return end == len(self.buffer) or self.buffer[end] in _NUMBER_CHARS
+
+    def drain(self) -> None:
+        """
+        Read (and discard) the rest of the input
+        """
+        self.buffer = ""
+        self.pos = 0
+        while self.fill():
+            self.buffer = ""
+
+
+def iter_json_array(chunks: Iterable[bytes | str], key: str) -> Iterator:
+    """
+    Yield the items of the array stored under key in a JSON object, parsing the document as it is read
+
+    Only the item being parsed is held in memory (values under other keys are parsed and discarded).
+    The rest of the document after the array is read but not checked.
+
+    Raises:
+        KeyError: If the object has no member called key.
+        ValueError: If the document is not valid JSON, or key is not an array.
+    """
+    stream = _JSONStream(chunks)
+    stream.expect("{")
+    if stream.peek() == "}":
+        raise KeyError(key)
+    while True:
+        name = stream.value()
+        stream.expect(":")
+        if name == key:
+            stream.expect("[")
+            if stream.peek() == "]":
+                stream.drain()
+                return
+            while True:
+                yield stream.value()
+                separator = stream.next_char()
+                if separator == "]":
+                    stream.drain()
+                    return
+                if separator != ",":
+                    raise json.JSONDecodeError("Expected ',' or ']'", stream.buffer, stream.pos - 1)
+        stream.value()
+        separator = stream.next_char()
+        if separator == "}":
+            raise KeyError(key)
+        if separator != ",":
+            raise json.JSONDecodeError("Expected ',' or '}'", stream.buffer, stream.pos - 1)
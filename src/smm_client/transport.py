@@ -0,0 +1,67 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - HTTP transport helpers
+"""
+
+from __future__ import annotations
+
+import socket
+from typing import TYPE_CHECKING
+
+from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar
+from urllib3.connection import HTTPConnection
+
+if TYPE_CHECKING:
+    from http.cookiejar import Cookie
+
+
+class SMMCookieJar(RequestsCookieJar):
+    """
+    Cookie jar that can be read safely while other threads are storing cookies from their responses
+    """
+
+    def value(self, name: str) -> str | None:
+        """
+        Get the value of the cookie called name, or None if it isn't set
+
+        Unlike jar[name] this does not raise when the server has set the cookie for more than one
+        domain/path. The jar iterates cookies sorted by domain and then path, and the last match in
+        that order is returned; this is unrelated to when each cookie was stored.
+        """
+        with self._cookies_lock:
+            values = [cookie.value for cookie in self if cookie.name == name]
+        return values[-1] if values else None
+
+    def all_cookies(self) -> list[Cookie]:
+        """
+        Get a consistent list of all the cookies in the jar
+        """
+        with self._cookies_lock:
+            return list(self)
+
+
+class SMMHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter with a configurable connection pool and TCP keep-alive on pooled connections
+    """
+
+    __attrs__ = (*HTTPAdapter.__attrs__, "tcp_keepalive")
+
+    def __init__(self, *, tcp_keepalive: bool = True, **kwargs) -> None:
+        """
+        Args:
+            tcp_keepalive (bool): Enable SO_KEEPALIVE so idle pooled connections aren't silently dropped.
+            kwargs: Passed to requests.adapters.HTTPAdapter (pool_connections, pool_maxsize, pool_block, ...).
+        """
+        self.tcp_keepalive = tcp_keepalive
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        if self.tcp_keepalive:
+            kwargs.setdefault(
+                "socket_options", [*HTTPConnection.default_socket_options, (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+            )
+        super().init_poolmanager(*args, **kwargs)
@@ -5,6 +5,15 @@
 Search Management Map - Types
 """
 
+from __future__ import annotations
+
+import importlib
+from array import array
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from typing import Sequence
+
 MIN_LATITUDE = -90.0
 MAX_LATITUDE = 90.0
 MIN_LONGITUDE = -180.0
@@ -167,12 +176,14 @@ class SMMPoint:
     Latitude/Longitude combination
     """
 
+    __slots__ = ("_lat", "_lng")
+
     _lat: float
     _lng: float
 
     def __init__(self, latitude: float, longitude: float) -> None:
-        self.lat = latitude
-        self.lng = longitude
+        self.__set_lat(latitude)
+        self.__set_lng(longitude)
 
     def __set_lat(self, lat: float) -> None:
         if lat < MIN_LATITUDE or lat > MAX_LATITUDE:
@@ -197,3 +208,90 @@ class SMMPoint:
     latitude = property(__get_lat, __set_lat)
     lng = property(__get_lng, __set_lng)
     longitude = property(__get_lng, __set_lng)
+
+
+def _check_ranges(lats: array, lngs: array) -> None:
+    if lats and (min(lats) < MIN_LATITUDE or max(lats) > MAX_LATITUDE):
+        raise LatitudeError
+    if lngs and (min(lngs) < MIN_LONGITUDE or max(lngs) > MAX_LONGITUDE):
+        raise LongitudeError
+
+
+class SMMPointArray:
+    """
+    Sequence of Latitude/Longitude points stored as two contiguous arrays of doubles
+
+    Indexing or iterating returns SMMPoint objects; the raw coordinates are available as the
+    lats and lngs arrays, or as NumPy arrays (sharing the same memory) from numpy_view().
+    """
+
+    __slots__ = ("lats", "lngs")
+
+    def __init__(self, latitudes: Iterable[float] = (), longitudes: Iterable[float] = ()) -> None:
+        self.lats = array("d", latitudes)
+        self.lngs = array("d", longitudes)
+        if len(self.lats) != len(self.lngs):
+            raise ValueError(f"{len(self.lats)} latitudes but {len(self.lngs)} longitudes")
+        _check_ranges(self.lats, self.lngs)
+
+    @classmethod
+    def from_points(cls, points: Iterable[SMMPoint]) -> SMMPointArray:
+        """
+        Create from SMMPoint objects (or anything with lat and lng attributes)
+        """
+        if isinstance(points, SMMPointArray):
+            return cls(points.lats, points.lngs)
+        points = list(points)
+        return cls([point.lat for point in points], [point.lng for point in points])
+
+    @classmethod
+    def from_lnglat(cls, coordinates: Sequence[Sequence[float]]) -> SMMPointArray:
+        """
+        Create from [longitude, latitude, ...] pairs, as used by GeoJSON
+        """
+        return cls([coordinate[1] for coordinate in coordinates], [coordinate[0] for coordinate in coordinates])
+
+    def append(self, latitude: float, longitude: float) -> None:
+        """
+        Add a point to the end of the array
+        """
+        if latitude < MIN_LATITUDE or latitude > MAX_LATITUDE:
+            raise LatitudeError
+        if longitude < MIN_LONGITUDE or longitude > MAX_LONGITUDE:
+            raise LongitudeError
+        self.lats.append(latitude)
+        self.lngs.append(longitude)
+
+    def numpy_view(self):
+        """
+        Get (latitudes, longitudes) as float64 NumPy arrays sharing this array's memory
+
+        Requires NumPy to be installed.
+        """
+        np = importlib.import_module("numpy")
+        return np.frombuffer(self.lats, dtype=np.float64), np.frombuffer(self.lngs, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.lats)
+
+    def __getitem__(self, index: int | slice) -> SMMPoint | SMMPointArray:
+        if isinstance(index, slice):
+            result = SMMPointArray()
+            result.lats = self.lats[index]
+            result.lngs = self.lngs[index]
+            return result
+        return SMMPoint(self.lats[index], self.lngs[index])
+
+    def __iter__(self) -> Iterator[SMMPoint]:
+        for lat, lng in zip(self.lats, self.lngs):
+            yield SMMPoint(lat, lng)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SMMPointArray):
+            return NotImplemented
+        return self.lats == other.lats and self.lngs == other.lngs
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"SMMPointArray({len(self)} points)"
@@ -0,0 +1,280 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Background position uploader
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from smm_client.assets import SMMAsset, SMMAssetCommand
+
+
+class SMMPositionFix:
+    # pylint: disable=R0903
+    """
+    A position fix waiting to be uploaded
+    """
+
+    def __init__(self, asset: SMMAsset, lat: float, lon: float, fix: int, alt: int | None, heading: int | None) -> None:
+        # pylint: disable=R0913,R0917
+        self.asset = asset
+        self.lat = lat
+        self.lon = lon
+        self.fix = fix
+        self.alt = alt
+        self.heading = heading
+        self.submitted = time.monotonic()
+
+
+class SMMPositionUploaderStats:
+    # pylint: disable=R0902,R0903
+    """
+    Snapshot of the counters for a SMMPositionUploader
+    """
+
+    def __init__(self) -> None:
+        self.submitted = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.sent = 0
+        self.failed = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.in_flight = 0
+        self.oldest_age = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"submitted={self.submitted} coalesced={self.coalesced} rejected={self.rejected} sent={self.sent} "
+            f"failed={self.failed} queue_depth={self.queue_depth} in_flight={self.in_flight}"
+        )
+
+
+class SMMPositionUploader:
+    # pylint: disable=R0902
+    """
+    Uploads asset positions from a pool of background threads
+
+    Fixes are accepted without blocking. While a fix for an asset is waiting to be sent, a newer fix for
+    the same asset replaces it, so a slow link sends the latest position rather than falling further behind.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 4,
+        max_pending: int = 1000,
+        batch_size: int = 1,
+        flush_interval: float = 0.0,
+        on_command: Callable[[SMMAsset, SMMAssetCommand], None] | None = None,
+        on_error: Callable[[SMMAsset, Exception], None] | None = None,
+    ) -> None:
+        # pylint: disable=R0913
+        """
+        Start the uploader.
+
+        Args:
+            workers (int): Number of threads sending positions to the server.
+            max_pending (int): Maximum number of assets with a fix waiting to be sent.
+            batch_size (int): Hold fixes until this many assets have one waiting...
+            flush_interval (float): ...or the oldest waiting fix is this many seconds old.
+            on_command (callable, optional): Called with (asset, command) when the server returns a command.
+            on_error (callable, optional): Called with (asset, exception) when sending a fix fails.
+        """
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_command = on_command
+        self.on_error = on_error
+        self._pending: OrderedDict[int, SMMPositionFix] = OrderedDict()
+        self._in_flight: set[int] = set()
+        self._stats = SMMPositionUploaderStats()
+        self._lock = threading.Lock()
+        self._work = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._draining = False
+        self._flushing = 0
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._run, name=f"smm-position-uploader-{i}", daemon=True) for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def submit(
+        self,
+        asset: SMMAsset,
+        lat: float,
+        lon: float,
+        fix: int,
+        alt: int | None = None,
+        heading: int | None = None,
+        *,
+        block: bool = False,
+        timeout: float | None = None,
+    ) -> bool:
+        # pylint: disable=R0913,R0917
+        """
+        Queue a position fix for upload, see SMMAsset.set_position for the arguments.
+
+        If max_pending assets already have a fix waiting, either wait for space (block=True) or
+        reject the fix straight away.
+
+        Returns:
+            bool: True if the fix was queued (or replaced an older fix for the same asset).
+        """
+        position = SMMPositionFix(asset, lat, lon, fix, alt, heading)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("SMMPositionUploader is closed")
+            self._stats.submitted += 1
+            if asset.id in self._pending:
+                # Keep the age of the original fix so a stream of updates can't hold back the flush
+                position.submitted = self._pending[asset.id].submitted
+                self._pending[asset.id] = position
+                self._stats.coalesced += 1
+                return True
+            if len(self._pending) >= self.max_pending and not (
+                block and self._idle.wait_for(lambda: len(self._pending) < self.max_pending, timeout)
+            ):
+                self._stats.rejected += 1
+                return False
+            self._pending[asset.id] = position
+            self._stats.max_queue_depth = max(self._stats.max_queue_depth, len(self._pending))
+            self._work.notify()
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Send all waiting fixes now, and wait for them to be sent.
+
+        Returns:
+            bool: True if everything was sent before the timeout.
+        """
+        with self._lock:
+            self._flushing += 1
+            self._work.notify_all()
+            try:
+                return self._idle.wait_for(lambda: not self._pending and not self._in_flight, timeout)
+            finally:
+                self._flushing -= 1
+
+    def close(self, timeout: float | None = None) -> None:
+        """
+        Send any waiting fixes, then stop the worker threads.
+        """
+        self.flush(timeout)
+        with self._lock:
+            self._closed = True
+            self._work.notify_all()
+        for worker in self._workers:
+            worker.join(timeout)
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Number of assets with a fix waiting to be sent
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def stats(self) -> SMMPositionUploaderStats:
+        """
+        Get a snapshot of the uploader counters
+        """
+        with self._lock:
+            snapshot = copy.copy(self._stats)
+            snapshot.queue_depth = len(self._pending)
+            snapshot.in_flight = len(self._in_flight)
+            if self._pending:
+                snapshot.oldest_age = time.monotonic() - next(iter(self._pending.values())).submitted
+        return snapshot
+
+    def _next_deadline(self) -> float | None:
+        """
+        How long until the oldest fix is due, or None if a fix can be sent now
+        """
+        if self._closed or self._flushing or self._draining or len(self._pending) >= self.batch_size:
+            self._draining = True
+            return None
+        oldest = next(iter(self._pending.values())).submitted
+        remaining = oldest + self.flush_interval - time.monotonic()
+        if remaining <= 0:
+            self._draining = True
+            return None
+        return remaining
+
+    def _take(self) -> SMMPositionFix | None:
+        """
+        Wait for a fix to send, returning None when the uploader is closed and idle
+        """
+        with self._lock:
+            while True:
+                sendable = [asset_id for asset_id in self._pending if asset_id not in self._in_flight]
+                if sendable:
+                    remaining = self._next_deadline()
+                    if remaining is None:
+                        position = self._pending.pop(sendable[0])
+                        self._in_flight.add(sendable[0])
+                        self._idle.notify_all()
+                        return position
+                    self._work.wait(remaining)
+                elif self._closed:
+                    return None
+                else:
+                    self._work.wait()
+
+    def _sent(self, position: SMMPositionFix, *, failed: bool) -> None:
+        with self._lock:
+            self._in_flight.discard(position.asset.id)
+            if failed:
+                self._stats.failed += 1
+            else:
+                self._stats.sent += 1
+            if not self._pending:
+                self._draining = False
+            self._work.notify_all()
+            self._idle.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            position = self._take()
+            if position is None:
+                return
+            try:
+                command = position.asset.set_position(
+                    position.lat, position.lon, position.fix, position.alt, position.heading
+                )
+            except Exception as exc:  # noqa: BLE001 # pylint: disable=W0718
+                self._sent(position, failed=True)
+                self._callback(self.on_error, position.asset, exc)
+                continue
+            self._sent(position, failed=False)
+            if command is not None:
+                self._callback(self.on_command, position.asset, command)
+
+    @staticmethod
+    def _callback(callback: Callable | None, asset: SMMAsset, value) -> None:
+        if callback is None:
+            return
+        try:
+            callback(asset, value)
+        except Exception:  # noqa: BLE001 # pylint: disable=W0718
+            # A failing callback must not take the worker thread down with it
+            return
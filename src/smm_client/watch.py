@@ -0,0 +1,337 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+"""
+Search Management Map - Change detection with adaptive polling
+"""
+
+from __future__ import annotations
+
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Iterator
+
+from smm_client.assets import SMMAsset
+from smm_client.snapshot import _command_json, _status_json
+from smm_client.types import SMMMalformedDataError
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from smm_client.connection import SMMConnection
+    from smm_client.missions import SMMMission
+
+WATCH_MISSIONS = "missions"
+WATCH_MISSION_ASSETS = "mission assets"
+WATCH_ASSET_STATUS = "asset status"
+WATCH_ASSET_COMMAND = "asset command"
+
+CHANGE_ADDED = "added"
+CHANGE_REMOVED = "removed"
+CHANGE_UPDATED = "updated"
+CHANGE_ERROR = "error"
+
+
+class SMMChangeEvent:
+    # pylint: disable=R0902,R0903
+    """
+    A change seen by an SMMWatcher
+
+    resource is what was polled (e.g. WATCH_ASSET_STATUS) and subject the object it belongs to (the asset,
+    mission or connection). For lists (WATCH_MISSIONS, WATCH_MISSION_ASSETS) each added, removed or updated
+    item is a separate event with its id as key; old and new are the item's JSON before and after.
+    A poll that fails produces a CHANGE_ERROR event with the exception in error.
+    """
+
+    __slots__ = ("error", "key", "kind", "new", "old", "resource", "subject", "time")
+
+    def __init__(
+        self, resource: str, kind: str, subject, key=None, old=None, new=None, error: Exception | None = None
+    ) -> None:
+        # pylint: disable=R0913,R0917
+        self.resource = resource
+        self.kind = kind
+        self.subject = subject
+        self.key = key
+        self.old = old
+        self.new = new
+        self.error = error
+        self.time = time.time()
+
+    def __str__(self) -> str:
+        key = f" {self.key}" if self.key is not None else ""
+        detail = f": {self.error}" if self.error is not None else ""
+        return f"{self.resource} of {self.subject}{key} {self.kind}{detail}"
+
+
+def _check_items(resource: str, items) -> SMMMalformedDataError | None:
+    """
+    Check that items is a list of objects with an id and a name, as _diff_items and following need
+    """
+    if not isinstance(items, list):
+        return SMMMalformedDataError(resource, TypeError(f"expected a list, not {items!r}"))
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or "id" not in item or "name" not in item:
+            return SMMMalformedDataError(resource, ValueError(f"entry {index} has no id and name: {item!r}"))
+    return None
+
+
+def _diff_items(resource: str, subject, old: list, new: list) -> list[SMMChangeEvent]:
+    before = {item.get("id"): item for item in old}
+    after = {item.get("id"): item for item in new}
+    events = [
+        SMMChangeEvent(resource, CHANGE_REMOVED, subject, key, item, None)
+        for key, item in before.items()
+        if key not in after
+    ]
+    for key, item in after.items():
+        if key not in before:
+            events.append(SMMChangeEvent(resource, CHANGE_ADDED, subject, key, None, item))
+        elif before[key] != item:
+            events.append(SMMChangeEvent(resource, CHANGE_UPDATED, subject, key, before[key], item))
+    return events
+
+
+def _diff_value(resource: str, subject, old, new) -> list[SMMChangeEvent]:
+    if old == new:
+        return []
+    kind = CHANGE_ADDED if old is None else CHANGE_REMOVED if new is None else CHANGE_UPDATED
+    return [SMMChangeEvent(resource, kind, subject, None, old, new)]
+
+
+class _Resource:
+    # pylint: disable=R0902,R0903
+    """
+    One polled endpoint, with its last value and its own polling interval
+    """
+
+    def __init__(self, resource: str, subject, fetch: Callable[[], Any], interval: float, *, items: bool) -> None:
+        # pylint: disable=R0913,R0917
+        self.resource = resource
+        self.subject = subject
+        self.fetch = fetch
+        self.items = items
+        self.interval = interval
+        self.due = 0.0
+        self.value: Any = None
+        self.polled = False
+
+    def poll(self) -> tuple[Any, Exception | None]:
+        """
+        Fetch the current value, returning (value, None) or (None, the exception raised)
+        """
+        try:
+            return self.fetch(), None
+        except Exception as exc:  # noqa: BLE001 # pylint: disable=W0718
+            return None, exc
+
+
+class SMMWatcher:
+    # pylint: disable=R0902
+    """
+    Polls missions, mission assets and asset statuses/commands, yielding an SMMChangeEvent for each change
+
+    Each resource has its own polling interval between min_interval and max_interval: it halves when the
+    resource changes and grows by backoff each time it doesn't, so busy resources are polled often and idle
+    ones rarely. The first poll of each resource sets the baseline and produces no events (unless
+    initial=True, when everything is reported as added).
+
+    Iterate over the watcher (for event in watcher) or, from asyncio code, use async for; the polling requests
+    then run in the event loop's default executor. Iteration ends when stop() is called (at once, if it was
+    called before iterating).
+    """
+
+    def __init__(
+        self,
+        connection: SMMConnection,
+        *,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        workers: int | None = None,
+        initial: bool = False,
+    ) -> None:
+        # pylint: disable=R0913
+        """
+        Args:
+            connection (SMMConnection): The connection to poll with.
+            min_interval (float): Shortest time between polls of one resource, in seconds.
+            max_interval (float): Longest time between polls of one resource, in seconds.
+            backoff (float): Factor the interval grows by after a poll that saw no change.
+            workers (int, optional): Maximum number of polls at once, by default the connection's pool_maxsize.
+            initial (bool): Report the first value of each resource as added instead of staying silent.
+        """
+        self.connection = connection
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.workers = workers or connection.pool_maxsize
+        self.initial = initial
+        self._resources: dict[tuple[str, int], _Resource] = {}
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._followed: set[int] = set()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _add(self, resource: str, subject, fetch: Callable[[], Any], *, items: bool = False) -> Self:
+        with self._lock:
+            self._resources.setdefault(
+                (resource, id(subject)), _Resource(resource, subject, fetch, self.min_interval, items=items)
+            )
+        return self
+
+    def watch_missions(self, only: str = "active") -> Self:
+        """
+        Watch the list of missions (see SMMConnection.get_missions)
+        """
+        connection = self.connection
+        return self._add(
+            WATCH_MISSIONS,
+            connection,
+            lambda: [{"id": mission.id, "name": mission.name} for mission in connection.get_missions(only)],
+            items=True,
+        )
+
+    def watch_mission_assets(self, mission: SMMMission, *, follow: bool = False) -> Self:
+        """
+        Watch the assets in mission; with follow, also watch the status and command of each asset in it
+        """
+        if follow:
+            self._followed.add(id(mission))
+        return self._add(WATCH_MISSION_ASSETS, mission, mission.assets, items=True)
+
+    def watch_asset_status(self, asset: SMMAsset) -> Self:
+        """
+        Watch the status of asset
+        """
+        return self._add(WATCH_ASSET_STATUS, asset, lambda: _status_json(asset.get_status()))
+
+    def watch_asset_command(self, asset: SMMAsset) -> Self:
+        """
+        Watch the current command of asset
+        """
+        return self._add(WATCH_ASSET_COMMAND, asset, lambda: _command_json(asset.get_command()))
+
+    def unwatch(self, subject) -> None:
+        """
+        Stop watching every resource of subject (an asset, a mission, or the connection for the missions list)
+        """
+        with self._lock:
+            for key in [key for key in self._resources if key[1] == id(subject)]:
+                del self._resources[key]
+        self._followed.discard(id(subject))
+
+    def stop(self) -> None:
+        """
+        End the iteration, after the poll in progress (if any)
+        """
+        self._stopped.set()
+
+    def intervals(self) -> dict[str, float]:
+        """
+        The current polling interval of each resource, keyed by "resource of subject"
+        """
+        with self._lock:
+            return {f"{entry.resource} of {entry.subject}": entry.interval for entry in self._resources.values()}
+
+    def _next_due(self) -> float | None:
+        """
+        Seconds until the next resource is due, or None if nothing is being watched
+        """
+        with self._lock:
+            if not self._resources:
+                return None
+            return max(0.0, min(entry.due for entry in self._resources.values()) - time.monotonic())
+
+    def _changes(self, entry: _Resource, value, error: Exception | None) -> list[SMMChangeEvent]:
+        """
+        Update entry with the result of polling it, returning the changes (from nothing, for the first poll)
+        and adjusting its interval
+
+        A list with a malformed entry is an error, and leaves the last value as it was.
+        """
+        if error is None and entry.items:
+            error = _check_items(entry.resource, value)
+        if error is not None:
+            events = [SMMChangeEvent(entry.resource, CHANGE_ERROR, entry.subject, error=error)]
+            changed = False
+        else:
+            # The first poll is diffed against nothing, so everything is added
+            empty = [] if entry.items else None
+            old = entry.value if entry.polled else empty
+            events = (_diff_items if entry.items else _diff_value)(entry.resource, entry.subject, old, value)
+            changed = bool(events) and entry.polled
+            entry.value = value
+            entry.polled = True
+        if changed:
+            entry.interval = max(self.min_interval, entry.interval / 2)
+        else:
+            entry.interval = min(self.max_interval, entry.interval * self.backoff)
+        entry.due = time.monotonic() + entry.interval
+        return events
+
+    def _follow(self, events: list[SMMChangeEvent]) -> None:
+        for event in events:
+            if event.resource != WATCH_MISSION_ASSETS or id(event.subject) not in self._followed:
+                continue
+            item = event.new if event.kind == CHANGE_ADDED else event.old if event.kind == CHANGE_REMOVED else None
+            if item is None:
+                continue
+            asset = self.connection.identity_map.get(SMMAsset, self.connection, item["id"], item["name"])
+            if event.kind == CHANGE_ADDED:
+                self.watch_asset_status(asset)
+                self.watch_asset_command(asset)
+            else:
+                self.unwatch(asset)
+
+    def poll(self) -> list[SMMChangeEvent]:
+        """
+        Poll every resource that is due now (in parallel), returning the changes found
+        """
+        now = time.monotonic()
+        with self._lock:
+            due = [entry for entry in self._resources.values() if entry.due <= now]
+        if not due:
+            return []
+        if len(due) == 1:
+            results = [due[0].poll()]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(due)), thread_name_prefix="smm-watch") as pool:
+                results = list(pool.map(_Resource.poll, due))
+        events = []
+        with self._lock:
+            for entry, (value, error) in zip(due, results):
+                baseline = not entry.polled
+                found = self._changes(entry, value, error)
+                # Follow the assets already in a mission too, even though they aren't reported
+                self._follow(found)
+                if self.initial or not baseline or error is not None:
+                    events += found
+        return events
+
+    def __iter__(self) -> Iterator[SMMChangeEvent]:
+        while not self._stopped.is_set():
+            delay = self._next_due()
+            if delay is None or delay > 0:
+                self._stopped.wait(delay if delay is not None else self.min_interval)
+                continue
+            yield from self.poll()
+
+    async def __aiter__(self) -> AsyncIterator[SMMChangeEvent]:
+        # Imported here so that only asyncio users pay for importing it
+        asyncio = importlib.import_module("asyncio")
+        loop = asyncio.get_running_loop()
+        while not self._stopped.is_set():
+            delay = self._next_due()
+            if delay is None or delay > 0:
+                await asyncio.sleep(min(delay if delay is not None else self.min_interval, self.min_interval))
+                continue
+            for event in await loop.run_in_executor(None, self.poll):
+                yield event
@@ -0,0 +1,28 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from benchmarks.fake_server import FakeSMMServer
+from smm_client.connection import SMMConnection
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+USERNAME = "test"
+THREADS = 16
+
+
+@pytest.fixture
+def server() -> Iterator[FakeSMMServer]:
+    with FakeSMMServer(assets=THREADS) as fake_server:
+        yield fake_server
+
+
+@pytest.fixture
+def connection(server: FakeSMMServer) -> SMMConnection:
+    return SMMConnection(server.url, USERNAME, server.password, pool_maxsize=THREADS)
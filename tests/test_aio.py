@@ -0,0 +1,190 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from smm_client.aio import AsyncSMMConnection, AsyncSMMMissionMember, AsyncSMMMissionOrganization
+from smm_client.connection import SMMUser
+from smm_client.types import (
+    SMMDeleteCSRFError,
+    SMMGetHTTPError,
+    SMMJSONDecodeError,
+    SMMLoginNoSessionError,
+    SMMPostCSRFError,
+    SMMPostHTTPError,
+)
+from tests.conftest import USERNAME
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from benchmarks.fake_server import FakeSMMServer
+
+CALLS = 200
+
+
+def test_login(server: FakeSMMServer) -> None:
+    async def run() -> None:
+        async with AsyncSMMConnection(server.url, USERNAME, server.password) as connection:
+            assert connection.session is not None
+            assert {"sessionid", "csrftoken"} <= {cookie.key for cookie in connection.session.cookie_jar}
+            assert len(await connection.get_assets()) == len(server.state.assets)
+
+    asyncio.run(run())
+    assert server.state.logins == 1
+
+
+def test_login_wrong_password(server: FakeSMMServer) -> None:
+    async def run() -> None:
+        connection = AsyncSMMConnection(server.url, USERNAME, "wrong")
+        try:
+            await connection.login()
+        finally:
+            await connection.close()
+
+    with pytest.raises(SMMLoginNoSessionError):
+        asyncio.run(run())
+
+
+def test_concurrent_requests(server: FakeSMMServer) -> None:
+    async def run() -> None:
+        async with AsyncSMMConnection(server.url, USERNAME, server.password) as connection:
+            assets = await connection.get_assets()
+            await asyncio.gather(
+                *(assets[index % len(assets)].set_position(-43.5, 172.6, 3, None, None) for index in range(CALLS)),
+                *(assets[index % len(assets)].set_status("1", "concurrent") for index in range(CALLS)),
+            )
+
+    asyncio.run(run())
+    assert len(server.state.positions) == len(server.state.assets)
+    assert server.state.logins == 1
+
+
+def test_expired_session_is_renewed_once(server: FakeSMMServer) -> None:
+    async def run() -> None:
+        async with AsyncSMMConnection(server.url, USERNAME, server.password) as connection:
+            assets = await connection.get_assets()
+            server.state.expire_sessions()
+            await asyncio.gather(
+                *(connection.get_json(f"/assets/{assets[index % len(assets)].id}/") for index in range(CALLS)),
+                *(assets[index % len(assets)].set_status("1", "after expiry") for index in range(CALLS)),
+            )
+
+    asyncio.run(run())
+    assert server.state.logins == 2
+
+
+def test_without_reauthenticate(server: FakeSMMServer) -> None:
+    async def run() -> None:
+        connection = await AsyncSMMConnection.connect(server.url, USERNAME, server.password, reauthenticate=False)
+        try:
+            server.state.expire_sessions()
+            # The server redirects to its login page
+            await connection.get_json("/assets/")
+        finally:
+            await connection.close()
+
+    with pytest.raises(SMMJSONDecodeError):
+        asyncio.run(run())
+    assert server.state.logins == 1
+
+
+@pytest.mark.parametrize(
+    ("method", "error"),
+    [("post", SMMPostCSRFError), ("delete", SMMDeleteCSRFError)],
+)
+def test_missing_csrf_token(server: FakeSMMServer, method: str, error: type[Exception]) -> None:
+    async def run() -> None:
+        async with AsyncSMMConnection(server.url, USERNAME, server.password) as connection:
+            assert connection.session is not None
+            connection.session.cookie_jar.clear()
+            await getattr(connection, method)("/mission/1/close/")
+
+    with pytest.raises(error):
+        asyncio.run(run())
+
+
+def test_http_errors(server: FakeSMMServer) -> None:
+    async def run() -> None:
+        async with AsyncSMMConnection(server.url, USERNAME, server.password) as connection:
+            with pytest.raises(SMMGetHTTPError):
+                await connection.get_json("/missing/")
+            with pytest.raises(SMMPostHTTPError):
+                await connection.post("/missing/", {"name": "x"})
+
+    asyncio.run(run())
+
+
+def test_mission_memberships(server: FakeSMMServer) -> None:
+    async def run() -> None:
+        async with AsyncSMMConnection(server.url, USERNAME, server.password) as connection:
+            mission = (await connection.get_missions())[0]
+            organization = (await connection.get_organizations())[0]
+
+            member = await mission.add_member(SMMUser(7, "searcher"))
+            assert isinstance(member, AsyncSMMMissionMember)
+            assert await member.set_is_admin(value=True)
+            added = await mission.add_organization(organization)
+            assert isinstance(added, AsyncSMMMissionOrganization)
+            assert await added.set_can_add_users(value=False)
+
+            organizations = await mission.get_organizations()
+            assert [entry.organization for entry in organizations] == [organization]
+            assert len([member async for member in organization.iter_members()]) == len(
+                await organization.get_members()
+            )
+
+    asyncio.run(run())
+
+
+def test_mission_external_references(server: FakeSMMServer) -> None:
+    async def run() -> None:
+        async with AsyncSMMConnection(server.url, USERNAME, server.password) as connection:
+            mission = (await connection.get_missions())[0]
+            await mission.add_external_reference("Police", "P1", "https://example.com/p1", "Job")
+
+            references = await mission.get_external_references()
+            assert [(reference.name, reference.code) for reference in references] == [("Police", "P1")]
+
+    asyncio.run(run())
+
+
+def test_mission_iter_assets(server: FakeSMMServer) -> None:
+    async def run() -> list:
+        async with AsyncSMMConnection(server.url, USERNAME, server.password) as connection:
+            mission = (await connection.get_missions())[0]
+            return [asset async for asset in mission.iter_assets()]
+
+    assert asyncio.run(run()) == list(server.state.assets.values())
+
+
+def test_mission_import_geometry(server: FakeSMMServer, tmp_path: Path) -> None:
+    source = tmp_path / "features.geojson"
+    geometries = [
+        {"type": "Point", "coordinates": [172.6, -43.5]},
+        {"type": "LineString", "coordinates": [[172.6, -43.5], [172.7, -43.6]]},
+        {"type": "Polygon", "coordinates": [[[172.6, -43.5], [172.7, -43.5], [172.7, -43.6], [172.6, -43.5]]]},
+        {"type": "LineString", "coordinates": [[172.6, -43.5]]},
+    ]
+    features = [{"type": "Feature", "properties": {"name": f"F{i}"}, "geometry": g} for i, g in enumerate(geometries)]
+    source.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+    progress = []
+
+    async def run():
+        async with AsyncSMMConnection(server.url, USERNAME, server.password) as connection:
+            mission = (await connection.get_missions())[0]
+            return await mission.import_geometry(source, workers=2, on_progress=lambda *counts: progress.append(counts))
+
+    result = asyncio.run(run())
+
+    assert len(result.created) == len(server.state.geometry) == len(geometries) - 1
+    assert [feature.index for feature in result.errors] == [len(geometries) - 1]
+    assert progress[-1] == (len(geometries), 1)
@@ -0,0 +1,47 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import io
+import json
+from typing import TYPE_CHECKING
+
+from smm_client.cli import EXIT_USAGE, SMMBatchContext, main, run_batch
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+    from smm_client.connection import SMMConnection
+
+
+def test_run_batch_reports_bad_lines(connection: SMMConnection) -> None:
+    lines = [
+        '{"op": "set_status", "asset": 1, "status": "1", "notes": "ok"}',
+        '{"op": "set_status", "asset": [1], "status": "1"}',
+        '{"op": "add_waypoint", "mission": {"id": 1}, "lat": -43.5, "lon": 172.6, "label": "x"}',
+        "not json",
+        '{"op": "nothing"}',
+    ]
+    output = io.StringIO()
+
+    batch = run_batch(SMMBatchContext(connection), lines, output, 4)
+
+    results = {result["line"]: result for result in map(json.loads, output.getvalue().splitlines())}
+    assert (batch.succeeded, batch.failed) == (1, 4)
+    assert results[1]["ok"]
+    assert results[2]["error"] == "asset must be an id or a name, not [1]"
+    assert results[3]["error"] == 'mission must be an id or a name, not {"id": 1}'
+    assert not results[4]["ok"]
+    assert results[5]["type"] == "LookupError"
+
+
+def test_missing_input_file(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    missing = tmp_path / "missing.jsonl"
+
+    status = main([str(missing), "--url", "http://127.0.0.1:1", "--username", "test"])
+
+    assert status == EXIT_USAGE
+    assert f"can't read {missing}" in capsys.readouterr().err
@@ -0,0 +1,99 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import pytest
+
+from smm_client.connection import SMMConnection
+from smm_client.types import SMMJSONDecodeError, SMMLoginNoSessionError, SMMPostCSRFError
+from tests.conftest import THREADS, USERNAME
+
+if TYPE_CHECKING:
+    from benchmarks.fake_server import FakeSMMServer
+
+CALLS_PER_THREAD = 50
+
+
+def _hammer(function, calls: int = THREADS * CALLS_PER_THREAD) -> list:
+    with ThreadPoolExecutor(THREADS) as executor:
+        return list(executor.map(function, range(calls)))
+
+
+def test_login(server: FakeSMMServer, connection: SMMConnection) -> None:
+    assert server.state.logins == 1
+    assert connection.session.cookies.value("sessionid") is not None
+    assert connection.session.cookies.value("csrftoken") is not None
+
+
+def test_login_wrong_password(server: FakeSMMServer) -> None:
+    with pytest.raises(SMMLoginNoSessionError):
+        SMMConnection(server.url, USERNAME, "wrong")
+
+
+def test_concurrent_get_json_reuses_connections(server: FakeSMMServer, connection: SMMConnection) -> None:
+    expected = connection.get_json("/assets/")
+    before = server.state.connections
+
+    results = _hammer(lambda _index: connection.get_json("/assets/"))
+
+    assert all(result == expected for result in results)
+    # Every thread keeps a pooled connection alive rather than opening one per request
+    assert server.state.connections - before <= THREADS
+    assert server.state.logins == 1
+
+
+def test_concurrent_writes_keep_csrf_state(server: FakeSMMServer, connection: SMMConnection) -> None:
+    assets = connection.get_assets()
+    csrftoken = connection.session.cookies.value("csrftoken")
+
+    def write(index: int) -> None:
+        asset = assets[index % len(assets)]
+        if index % 2:
+            asset.set_status("1", f"update {index}")
+        else:
+            connection.get_json(f"/assets/{asset.id}/")
+
+    _hammer(write)
+
+    assert connection.session.cookies.value("csrftoken") == csrftoken
+    assert sum(cookie.name == "csrftoken" for cookie in connection.session.cookies.all_cookies()) == 1
+    assert server.state.logins == 1
+
+
+def test_expired_session_is_renewed_once(server: FakeSMMServer, connection: SMMConnection) -> None:
+    assets = connection.get_assets()
+    server.state.expire_sessions()
+
+    _hammer(lambda index: connection.get_json(f"/assets/{assets[index % len(assets)].id}/"))
+
+    assert server.state.logins == 2
+
+
+def test_concurrent_relogin_for_writes(server: FakeSMMServer, connection: SMMConnection) -> None:
+    assets = connection.get_assets()
+    server.state.expire_sessions()
+
+    # Threads that find the cookie jar cleared by another thread's re-login wait for it instead of
+    # failing with SMMPostCSRFError
+    _hammer(lambda index: assets[index % len(assets)].set_status("1", "after expiry"), calls=200)
+
+    assert server.state.logins == 2
+
+
+def test_missing_csrf_token(connection: SMMConnection) -> None:
+    connection.session.cookies.clear()
+    with pytest.raises(SMMPostCSRFError):
+        connection.post("/organization/", {"name": "Org"})
+
+
+def test_without_reauthenticate(server: FakeSMMServer) -> None:
+    connection = SMMConnection(server.url, USERNAME, server.password, reauthenticate=False)
+    server.state.expire_sessions()
+    # The server redirects to its login page
+    with pytest.raises(SMMJSONDecodeError):
+        connection.get_json("/assets/")
+    assert server.state.logins == 1
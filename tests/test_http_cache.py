@@ -0,0 +1,93 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+import stat
+from typing import TYPE_CHECKING
+
+from smm_client.connection import SMMConnection
+from smm_client.http_cache import SMMResponseCache
+from tests.conftest import USERNAME
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from benchmarks.fake_server import FakeSMMServer
+
+
+def _connection(server: FakeSMMServer, cache: SMMResponseCache, username: str = USERNAME) -> SMMConnection:
+    return SMMConnection(server.url, username, server.password, response_cache=cache)
+
+
+def test_unchanged_response_is_revalidated(server: FakeSMMServer) -> None:
+    cache = SMMResponseCache()
+    connection = _connection(server, cache)
+
+    first = connection.get_json("/assets/")
+    assert connection.get_json("/assets/") is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    server.state.assets[99] = {"id": 99, "name": "New"}
+    changed = connection.get_json("/assets/")
+    assert changed is not first
+    assert changed["assets"][-1]["name"] == "New"
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_is_evicted(server: FakeSMMServer) -> None:
+    cache = SMMResponseCache(max_entries=2)
+    connection = _connection(server, cache)
+
+    connection.get_json("/assets/1/")
+    connection.get_json("/assets/2/")
+    connection.get_json("/assets/1/")
+    connection.get_json("/assets/3/")
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    connection.get_json("/assets/1/")
+    connection.get_json("/assets/3/")
+    assert (cache.hits, cache.misses) == (3, 3)
+    connection.get_json("/assets/2/")
+    assert (cache.hits, cache.misses) == (3, 4)
+
+
+def test_size_limit_evicts(server: FakeSMMServer) -> None:
+    cache = SMMResponseCache(max_bytes=1)
+    connection = _connection(server, cache)
+
+    connection.get_json("/assets/1/")
+    connection.get_json("/assets/1/")
+
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_responses_are_reloaded_from_disk(server: FakeSMMServer, tmp_path: Path) -> None:
+    directory = tmp_path / "cache"
+    first = _connection(server, SMMResponseCache(directory=str(directory))).get_json("/assets/")
+    [cache_file] = directory.iterdir()
+    assert stat.S_IMODE(os.stat(cache_file).st_mode) == 0o600
+
+    cache = SMMResponseCache(directory=str(directory))
+    assert _connection(server, cache).get_json("/assets/") == first
+    assert (cache.hits, cache.misses) == (1, 0)
+
+    cache.invalidate()
+    assert list(directory.iterdir()) == []
+
+
+def test_users_do_not_share_responses(server: FakeSMMServer, tmp_path: Path) -> None:
+    cache = SMMResponseCache(directory=str(tmp_path))
+    alice = _connection(server, cache, "alice")
+    bob = _connection(server, cache, "bob")
+
+    alice_assets = alice.get_json("/assets/")
+    bob_assets = bob.get_json("/assets/")
+    assert bob_assets is not alice_assets
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert len(list(tmp_path.iterdir())) == 2
+
+    assert alice.get_json("/assets/") is alice_assets
+    assert bob.get_json("/assets/") is bob_assets
+    assert (cache.hits, cache.misses) == (2, 2)
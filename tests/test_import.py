@@ -0,0 +1,23 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import statistics
+
+import pytest
+
+from benchmarks.bench_import import CASES, profile
+
+RUNS = 3
+# Generous, so the test only fails when an import brings back a heavy dependency, not on a slow machine
+BUDGET_MS = {"package": 50.0, "patterns": 100.0, "connection": 500.0}
+
+
+@pytest.mark.parametrize(("name", "statement", "forbidden"), CASES, ids=[case[0] for case in CASES])
+def test_import(name: str, statement: str, forbidden: tuple[str, ...]) -> None:
+    profiles = [profile(statement) for _ in range(RUNS)]
+
+    imported = sorted(module for module in forbidden if module in profiles[0].modules)
+    assert imported == []
+    assert statistics.median(run.total for run in profiles) / 1000 <= BUDGET_MS[name]
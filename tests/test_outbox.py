@@ -0,0 +1,156 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+import requests
+
+from smm_client.outbox import OUTBOX_POSITION, OUTBOX_STATUS, SMMOutbox
+from smm_client.types import SMMLoginNoSessionError, SMMPostHTTPError
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from benchmarks.fake_server import FakeSMMServer
+    from smm_client.connection import SMMConnection
+
+WRITES = 20
+
+
+@pytest.fixture
+def sent(connection: SMMConnection, monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, dict]]:
+    # The writes the server accepted, in the order it accepted them
+    accepted = []
+    post = connection.post
+
+    def record(path: str, data=None):
+        response = post(path, data)
+        accepted.append((path, data))
+        return response
+
+    monkeypatch.setattr(connection, "post", record)
+    return accepted
+
+
+def _http_error(status: int) -> SMMPostHTTPError:
+    response = requests.Response()
+    response.status_code = status
+    cause = requests.HTTPError(f"{status} error", response=response)
+    error = SMMPostHTTPError("/assets/1/status/", cause)
+    error.__cause__ = cause
+    return error
+
+
+def test_sent_directly(server: FakeSMMServer, connection: SMMConnection, tmp_path: Path) -> None:
+    asset = connection.get_assets()[0]
+    with SMMOutbox(connection, tmp_path / "outbox.db") as outbox:
+        assert outbox.set_position(asset, -43.5, 172.6, 3)
+        assert outbox.pending == 0
+    assert server.state.positions[asset.id]["lat"] == "-43.5"
+
+
+def test_queued_while_unavailable_and_replayed_in_order(
+    server: FakeSMMServer, connection: SMMConnection, sent: list, tmp_path: Path
+) -> None:
+    asset = connection.get_assets()[0]
+    with SMMOutbox(connection, tmp_path / "outbox.db", batch_size=3) as outbox:
+        server.state.capacity = 0
+        assert not any(outbox.set_status(asset, "1", f"note {index}") for index in range(WRITES))
+        server.state.capacity = None
+        # Nothing overtakes the queue, even though the server is back
+        assert not outbox.set_status(asset, "1", "last")
+        assert outbox.pending == WRITES + 1
+
+        assert outbox.replay() == WRITES + 1
+
+        assert outbox.pending == 0
+    assert [data["notes"] for _path, data in sent] == [f"note {index}" for index in range(WRITES)] + ["last"]
+
+
+def test_rejected_write_is_failed(server: FakeSMMServer, connection: SMMConnection, tmp_path: Path) -> None:
+    asset = connection.get_assets()[0]
+    with SMMOutbox(connection, tmp_path / "outbox.db") as outbox:
+        with pytest.raises(SMMPostHTTPError):
+            outbox.post(OUTBOX_STATUS, "/missing/", {"notes": "now"})
+        assert outbox.pending == 0
+
+        server.state.capacity = 0
+        outbox.post(OUTBOX_STATUS, "/missing/", {"notes": "queued"})
+        outbox.set_status(asset, "1", "after")
+        server.state.capacity = None
+
+        assert outbox.replay() == 1
+        assert outbox.pending == 0
+        [failed] = outbox.failed()
+        assert (failed.path, failed.data, failed.attempts) == ("/missing/", {"notes": "queued"}, 1)
+        outbox.clear_failed()
+        assert outbox.failed() == []
+
+
+@pytest.mark.parametrize(
+    ("error", "queued"),
+    [
+        (requests.ConnectionError(), True),
+        (requests.Timeout(), True),
+        (SMMLoginNoSessionError(), True),
+        (_http_error(503), True),
+        (_http_error(429), True),
+        (_http_error(408), True),
+        (_http_error(404), False),
+        (_http_error(400), False),
+        (ValueError("bad"), False),
+    ],
+)
+def test_which_errors_queue(
+    connection: SMMConnection, monkeypatch: pytest.MonkeyPatch, tmp_path: Path, error: Exception, *, queued: bool
+) -> None:
+    def fail(_path: str, _data=None):
+        raise error
+
+    monkeypatch.setattr(connection, "post", fail)
+    with SMMOutbox(connection, tmp_path / "outbox.db") as outbox:
+        if queued:
+            assert not outbox.post(OUTBOX_STATUS, "/assets/1/status/", {"notes": "x"})
+        else:
+            with pytest.raises(type(error)):
+                outbox.post(OUTBOX_STATUS, "/assets/1/status/", {"notes": "x"})
+        assert outbox.pending == int(queued)
+
+
+def test_queue_survives_reopening(server: FakeSMMServer, connection: SMMConnection, tmp_path: Path) -> None:
+    asset = connection.get_assets()[0]
+    server.state.capacity = 0
+    with SMMOutbox(connection, tmp_path / "outbox.db") as outbox:
+        for index in range(WRITES):
+            outbox.set_position(asset, -43.5, 172.6 + index / 100, 3)
+    server.state.capacity = None
+
+    with SMMOutbox(connection, tmp_path / "outbox.db") as outbox:
+        assert outbox.pending == WRITES
+        assert outbox.replay() == WRITES
+    assert server.state.positions[asset.id]["lon"] == str(172.6 + (WRITES - 1) / 100)
+
+
+def test_close_while_replaying(server: FakeSMMServer, connection: SMMConnection, sent: list, tmp_path: Path) -> None:
+    asset = connection.get_assets()[0]
+    outbox = SMMOutbox(connection, tmp_path / "outbox.db", batch_size=2, rate=100)
+    server.state.capacity = 0
+    for index in range(WRITES):
+        outbox.post(OUTBOX_POSITION, f"/data/assets/{asset.id}/position/add/", {"lat": index, "lon": 0, "fix": 3})
+    server.state.capacity = None
+    outbox.start()
+    while not sent:
+        time.sleep(0.001)
+
+    outbox.close()
+
+    # Replaying stopped part way, after the batch in progress, and the rest is kept for next time
+    with SMMOutbox(connection, tmp_path / "outbox.db") as reopened:
+        assert 0 < reopened.pending < WRITES
+        assert len(sent) + reopened.pending == WRITES
+        with pytest.raises(RuntimeError):
+            outbox.post(OUTBOX_STATUS, "/assets/1/status/", {"notes": "closed"})
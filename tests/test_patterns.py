@@ -0,0 +1,168 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from smm_client.patterns import creeping_line, expanding_box, polygon_creeping_line, sector, shoreline, trackline
+from smm_client.simplify import EARTH_RADIUS
+from smm_client.types import SMMPoint, SMMPointArray
+
+DATUM = SMMPoint(-43.5, 172.6)
+SWEEP_WIDTH = 100.0
+# The previews use a flat projection, so allow a little error against the spherical measurements
+RELATIVE = 0.005
+DEGREES = 0.5
+
+
+def _distance(a: SMMPoint, b: SMMPoint) -> float:
+    # Haversine distance in metres
+    lat1, lat2 = math.radians(a.lat), math.radians(b.lat)
+    half_dlat, half_dlng = (lat2 - lat1) / 2, math.radians(b.lng - a.lng) / 2
+    h = math.sin(half_dlat) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(half_dlng) ** 2
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(h))
+
+
+def _bearing(a: SMMPoint, b: SMMPoint) -> float:
+    # Initial great circle bearing from a to b, in degrees true
+    lat1, lat2 = math.radians(a.lat), math.radians(b.lat)
+    dlng = math.radians(b.lng - a.lng)
+    y = math.sin(dlng) * math.cos(lat2)
+    x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(dlng)
+    return math.degrees(math.atan2(y, x)) % 360
+
+
+def _angle(bearing: float, expected: float) -> float:
+    return abs((bearing - expected + 180) % 360 - 180)
+
+
+def _walk(start: SMMPoint, *legs: tuple[float, float]) -> SMMPointArray:
+    # Points reached by following (bearing, metres) legs from start, on the sphere
+    points = SMMPointArray([start.lat], [start.lng])
+    for bearing, metres in legs:
+        lat1, lng1, angle = math.radians(points.lats[-1]), math.radians(points.lngs[-1]), metres / EARTH_RADIUS
+        theta = math.radians(bearing)
+        lat2 = math.asin(math.sin(lat1) * math.cos(angle) + math.cos(lat1) * math.sin(angle) * math.cos(theta))
+        lng2 = lng1 + math.atan2(
+            math.sin(theta) * math.sin(angle) * math.cos(lat1), math.cos(angle) - math.sin(lat1) * math.sin(lat2)
+        )
+        points.append(math.degrees(lat2), (math.degrees(lng2) + 180) % 360 - 180)
+    return points
+
+
+def _legs(points: SMMPointArray) -> list[tuple[float, float]]:
+    return [(_distance(a, b), _bearing(a, b)) for a, b in zip(points, points[1:])]
+
+
+@pytest.mark.parametrize("datum", [DATUM, SMMPoint(-43.5, 179.999)])
+def test_sector(datum: SMMPoint) -> None:
+    preview = sector(datum, SWEEP_WIDTH, first_bearing=30)
+    radius = 5 * SWEEP_WIDTH
+
+    assert (len(preview.points), preview.legs) == (10, 9)
+    assert all(length == pytest.approx(radius, rel=RELATIVE) for length, _bearing in _legs(preview.points))
+    # Each triangle starts and ends at the datum, the triangles 120 degrees apart
+    for start, first_bearing in zip((0, 3, 6), (30, 270, 150)):
+        assert _distance(preview.points[start], datum) < 1
+        assert _angle(_bearing(datum, preview.points[start + 1]), first_bearing) < DEGREES
+        # Turning 120 degrees right at each corner
+        assert _angle(_bearing(preview.points[start + 1], preview.points[start + 2]), first_bearing + 120) < DEGREES
+    assert preview.track_length == pytest.approx(9 * radius)
+    assert preview.area == pytest.approx(math.pi * radius * radius)
+
+
+def test_expanding_box() -> None:
+    preview = expanding_box(DATUM, SWEEP_WIDTH, 2, first_bearing=45)
+
+    legs = _legs(preview.points)
+    assert preview.legs == len(legs) == 8
+    for index, (length, bearing) in enumerate(legs):
+        assert length == pytest.approx((index // 2 + 1) * SWEEP_WIDTH, rel=RELATIVE)
+        assert _angle(bearing, 45 + 90 * index) < DEGREES
+    assert preview.track_length == pytest.approx(sum(length for length, _bearing in legs), rel=RELATIVE)
+    assert preview.area == pytest.approx(500 * 500)
+
+
+def test_trackline() -> None:
+    line = _walk(DATUM, (0, 1000), (90, 500))
+
+    preview = trackline(line, SWEEP_WIDTH)
+
+    assert preview.legs == 2
+    assert preview.track_length == pytest.approx(1500, rel=RELATIVE)
+    assert preview.coverage == pytest.approx(1.0)
+
+
+def test_shoreline_is_offset_to_the_right() -> None:
+    shore = _walk(DATUM, (0, 1000), (90, 1000))
+
+    preview = shoreline(shore, SWEEP_WIDTH)
+
+    offset = SWEEP_WIDTH / 2
+    track = list(preview.points)
+    # Half a sweep width east of the first leg, south of the second, and diagonally off the corner
+    assert _distance(shore[0], track[0]) == pytest.approx(offset, rel=RELATIVE)
+    assert _angle(_bearing(shore[0], track[0]), 90) < DEGREES
+    assert _distance(shore[1], track[1]) == pytest.approx(offset * math.sqrt(2), rel=RELATIVE)
+    assert _angle(_bearing(shore[1], track[1]), 135) < DEGREES
+    assert _distance(shore[2], track[2]) == pytest.approx(offset, rel=RELATIVE)
+    assert _angle(_bearing(shore[2], track[2]), 180) < DEGREES
+    assert preview.track_length == pytest.approx(2000 - 2 * offset, rel=RELATIVE)
+
+
+def test_creeping_line_along_a_line() -> None:
+    line = _walk(DATUM, (0, 2000))
+
+    preview = creeping_line(line, SWEEP_WIDTH, 400)
+
+    assert preview.legs == 20
+    points = list(preview.points)
+    legs = list(zip(points[::2], points[1::2]))
+    assert len(legs) == preview.legs
+    centres = []
+    for index, (start, end) in enumerate(legs):
+        assert _distance(start, end) == pytest.approx(400, rel=RELATIVE)
+        # Square to the line, alternating east and west
+        assert _angle(_bearing(start, end), 90 if index % 2 == 0 else 270) < DEGREES
+        centres.append(SMMPoint((start.lat + end.lat) / 2, (start.lng + end.lng) / 2))
+    assert _distance(DATUM, centres[0]) == pytest.approx(SWEEP_WIDTH / 2, rel=RELATIVE)
+    assert all(
+        _distance(before, after) == pytest.approx(SWEEP_WIDTH, rel=RELATIVE)
+        for before, after in zip(centres, centres[1:])
+    )
+    assert preview.area == pytest.approx(2000 * 400, rel=RELATIVE)
+
+
+@pytest.mark.parametrize(("bearing", "leg_bearing"), [(90, 90), (None, 0)])
+def test_polygon_creeping_line(bearing: float | None, leg_bearing: float) -> None:
+    # 1km east-west by 1.5km north-south, so the longest edges run north-south
+    square = _walk(DATUM, (0, 1500), (90, 1000), (180, 1500))
+
+    preview = polygon_creeping_line(square, SWEEP_WIDTH, bearing=bearing)
+
+    points = list(preview.points)
+    legs = list(zip(points[::2], points[1::2]))
+    across, along = (1500, 1000) if leg_bearing == 90 else (1000, 1500)
+    assert preview.legs == len(legs) == across / SWEEP_WIDTH
+    for index, (start, end) in enumerate(legs):
+        assert _distance(start, end) == pytest.approx(along, rel=RELATIVE)
+        assert _angle(_bearing(start, end), leg_bearing + 180 * (index % 2)) < DEGREES
+    # Each leg starts one sweep width over from where the last one ended
+    assert all(
+        _distance(before[1], after[0]) == pytest.approx(SWEEP_WIDTH, rel=RELATIVE)
+        for before, after in zip(legs, legs[1:])
+    )
+    assert preview.track_length == pytest.approx(len(legs) * along + (len(legs) - 1) * SWEEP_WIDTH, rel=RELATIVE)
+    assert preview.area == pytest.approx(1000 * 1500, rel=RELATIVE)
+
+
+def test_bad_input() -> None:
+    with pytest.raises(ValueError, match="sweep width"):
+        sector(DATUM, 0)
+    with pytest.raises(ValueError, match="at least 2 points"):
+        trackline([DATUM], SWEEP_WIDTH)
+    with pytest.raises(ValueError, match="at least 3 points"):
+        polygon_creeping_line([DATUM, DATUM], SWEEP_WIDTH)
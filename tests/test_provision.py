@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from smm_client.provision import CREATED, FAILED, PROVISION_MEMBER, PROVISION_USER, SMMProvisionPlan, provision
+from smm_client.types import SMMPostHTTPError
+
+if TYPE_CHECKING:
+    import pytest
+
+    from smm_client.connection import SMMConnection, SMMUser
+
+
+def test_memberships_of_a_failed_user_are_failed(connection: SMMConnection, monkeypatch: pytest.MonkeyPatch) -> None:
+    create_user = connection.create_user
+
+    def create_user_or_fail(username: str, password: str) -> SMMUser:
+        if username == "bad":
+            raise SMMPostHTTPError("/admin/auth/user/add/", ValueError("username taken"))
+        return create_user(username, password)
+
+    monkeypatch.setattr(connection, "create_user", create_user_or_fail)
+    plan = SMMProvisionPlan()
+    plan.add_user("good", "password", ["Org"])
+    plan.add_user("bad", "password", ["Org", "Other Org"])
+
+    report = provision(connection, plan)
+
+    outcomes = {(item.kind, item.name): item.outcome for item in report.items}
+    assert outcomes[(PROVISION_USER, "good")] == CREATED
+    assert outcomes[(PROVISION_USER, "bad")] == FAILED
+    assert outcomes[(PROVISION_MEMBER, "good in Org")] == CREATED
+    failed = [item for item in report.failed if item.kind == PROVISION_MEMBER]
+    assert [item.name for item in failed] == ["bad in Org", "bad in Other Org"]
+    assert all(str(item.error) == "user bad could not be created" for item in failed)
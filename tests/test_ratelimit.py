@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+import requests
+
+from smm_client.connection import SMMConnection
+from smm_client.ratelimit import SMMAdaptiveConcurrency, SMMRateLimiter
+from smm_client.types import SMMGetHTTPError, SMMPostCSRFError
+from tests.conftest import USERNAME
+
+if TYPE_CHECKING:
+    from benchmarks.fake_server import FakeSMMServer
+
+
+def _limited(server: FakeSMMServer) -> tuple[SMMConnection, SMMAdaptiveConcurrency]:
+    concurrency = SMMAdaptiveConcurrency(initial=8)
+    limiter = SMMRateLimiter({"read": None, "write": None, "telemetry": None}, concurrency=concurrency)
+    return SMMConnection(server.url, USERNAME, server.password, rate_limiter=limiter), concurrency
+
+
+def test_local_errors_leave_the_limit_alone(server: FakeSMMServer) -> None:
+    connection, concurrency = _limited(server)
+    connection.session.cookies.clear()
+
+    with pytest.raises(SMMPostCSRFError):
+        connection.post("/organization/", {"name": "Org"})
+
+    assert concurrency.limit == 8
+    assert concurrency.in_flight == 0
+
+
+def test_connection_errors_reduce_the_limit(server: FakeSMMServer) -> None:
+    connection, concurrency = _limited(server)
+    connection.base_url = "http://127.0.0.1:1"
+
+    with pytest.raises(requests.ConnectionError):
+        connection.get_json("/assets/")
+
+    assert concurrency.limit == 4
+    assert concurrency.in_flight == 0
+
+
+def test_server_errors_reduce_the_limit(server: FakeSMMServer) -> None:
+    connection, concurrency = _limited(server)
+    server.state.capacity = 0
+
+    with pytest.raises(SMMGetHTTPError):
+        connection.get_json("/assets/")
+
+    assert concurrency.limit == 4
@@ -0,0 +1,161 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import math
+import random
+from typing import TYPE_CHECKING
+
+import pytest
+
+from smm_client.simplify import DOUGLAS_PEUCKER, EARTH_RADIUS, VISVALINGAM, simplify
+from smm_client.types import SMMPoint, SMMPointArray
+
+if TYPE_CHECKING:
+    from benchmarks.fake_server import FakeSMMServer
+    from smm_client.connection import SMMConnection
+
+METHODS = [DOUGLAS_PEUCKER, VISVALINGAM]
+TOLERANCE = 25.0
+# Metres per degree of latitude
+DEGREE = math.radians(1) * EARTH_RADIUS
+
+
+def _track(count: int, seed: int = 1) -> SMMPointArray:
+    # A wandering track a few kilometres long, with steps of about 20m
+    rng = random.Random(seed)
+    points = SMMPointArray([-43.5], [172.6])
+    heading = 0.0
+    for _ in range(count - 1):
+        heading += rng.uniform(-0.5, 0.5)
+        points.append(
+            points.lats[-1] + 20 * math.cos(heading) / DEGREE, points.lngs[-1] + 20 * math.sin(heading) / DEGREE
+        )
+    return points
+
+
+def _square(per_side: int) -> SMMPointArray:
+    # A 1km square with per_side points along each side, starting part way along the closing side
+    corners = [(0.0, 0.0), (0.0, 1000.0), (1000.0, 1000.0), (1000.0, 0.0)]
+    metres = []
+    for (y1, x1), (y2, x2) in zip(corners, corners[1:] + corners[:1]):
+        metres += [(y1 + (y2 - y1) * i / per_side, x1 + (x2 - x1) * i / per_side) for i in range(per_side)]
+    metres = metres[per_side // 2 :] + metres[: per_side // 2]
+    scale = math.cos(math.radians(-43.5))
+    return SMMPointArray([-43.5 + y / DEGREE for y, _ in metres], [172.6 + x / DEGREE / scale for _, x in metres])
+
+
+def _coordinates(points: SMMPointArray) -> list[tuple[float, float]]:
+    return list(zip(points.lats, points.lngs))
+
+
+def _deviation(original: SMMPointArray, simplified: SMMPointArray, *, closed: bool) -> float:
+    # The furthest any original point is from the nearest segment of the simplified shape, in metres
+    scale = math.cos(math.radians(original.lats[0]))
+
+    def xy(point: SMMPoint) -> tuple[float, float]:
+        return point.lng * DEGREE * scale, point.lat * DEGREE
+
+    corners = [xy(point) for point in simplified]
+    segments = list(zip(corners, corners[1:] + corners[:1] if closed else corners[1:]))
+
+    def distance(point: tuple[float, float], start: tuple[float, float], end: tuple[float, float]) -> float:
+        dx, dy = end[0] - start[0], end[1] - start[1]
+        length2 = dx * dx + dy * dy
+        t = max(0.0, min(1.0, ((point[0] - start[0]) * dx + (point[1] - start[1]) * dy) / length2)) if length2 else 0
+        return math.hypot(point[0] - start[0] - t * dx, point[1] - start[1] - t * dy)
+
+    return max(min(distance(xy(point), *segment) for segment in segments) for point in original)
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("count", [20, 500])
+def test_line_within_tolerance_keeps_endpoints(method: str, count: int) -> None:
+    track = _track(count)
+
+    result = simplify(track, TOLERANCE, method=method)
+
+    assert 2 <= result.count < count
+    kept = _coordinates(result.points)
+    assert (kept[0], kept[-1]) == (_coordinates(track)[0], _coordinates(track)[-1])
+    assert set(kept) <= set(_coordinates(track))
+    assert result.max_deviation <= TOLERANCE
+    assert _deviation(track, result.points, closed=False) <= TOLERANCE + 1e-6
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("per_side", [5, 40])
+def test_polygon_ring_stays_closed(method: str, per_side: int) -> None:
+    square = _square(per_side)
+
+    result = simplify(square, TOLERANCE, method=method, closed=True)
+
+    # The starting point is on the closing side, so it stays as well as the four corners
+    assert result.count == 5
+    kept = _coordinates(result.points)
+    assert kept[0] == _coordinates(square)[0]
+    assert kept[-1] != kept[0]
+    assert _deviation(square, result.points, closed=True) <= TOLERANCE + 1e-6
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize(("last_lng", "count"), [(172.6, 4), (172.599, 5)])
+def test_closing_edge_is_checked(method: str, last_lng: float, count: int) -> None:
+    # The last point is on the closing edge back to the first, so can go, or about 80m off it, so must stay
+    ring = SMMPointArray([-43.5, -43.5, -43.49, -43.49, -43.495], [172.6, 172.61, 172.61, 172.6, last_lng])
+
+    result = simplify(ring, TOLERANCE, method=method, closed=True)
+
+    assert result.count == count
+    assert _deviation(ring, result.points, closed=True) <= TOLERANCE + 1e-6
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("count", [0, 1, 2])
+def test_fewer_than_three_points(method: str, count: int) -> None:
+    points = _track(3)[:count]
+
+    result = simplify(points, TOLERANCE, method=method)
+
+    assert result.points == points
+    assert result.reduction == 0.0
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_duplicate_points(method: str) -> None:
+    same = SMMPointArray([-43.5] * 5, [172.6] * 5)
+
+    assert simplify(same, TOLERANCE, method=method).count == 2
+    # A polygon that would collapse below three points is left as it was
+    assert simplify(same, TOLERANCE, method=method, closed=True).points == same
+
+    stutter = SMMPointArray([-43.5, -43.5, -43.49, -43.49, -43.48], [172.6, 172.6, 172.61, 172.61, 172.6])
+    result = simplify(stutter, 0.0, method=method)
+    assert result.count == 3
+    assert result.max_deviation == 0.0
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_collinear_run(method: str) -> None:
+    line = SMMPointArray([-43.5 + i / 1000 for i in range(100)], [172.6 + i / 1000 for i in range(100)])
+
+    result = simplify(line, 1.0, method=method)
+
+    assert _coordinates(result.points) == [_coordinates(line)[0], _coordinates(line)[-1]]
+
+
+def test_unknown_method() -> None:
+    with pytest.raises(ValueError, match="Unknown simplification method"):
+        simplify(_track(5), TOLERANCE, method="fastest")
+
+
+def test_add_line_uploads_simplified_points(server: FakeSMMServer, connection: SMMConnection) -> None:
+    mission = connection.get_missions()[0]
+    track = _track(200)
+
+    line = mission.add_line(track, "Track", tolerance=TOLERANCE)
+
+    assert line is not None
+    assert line.simplification is not None
+    assert int(server.state.geometry[line.geo_id]["points"]) == line.simplification.count < len(track)
@@ -0,0 +1,27 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from benchmarks.fake_server import FakeSMMServer
+    from smm_client.connection import SMMConnection
+
+
+def test_snapshot(server: FakeSMMServer, connection: SMMConnection) -> None:
+    snapshot = connection.get_missions()[0].snapshot()
+
+    assert [asset["id"] for asset in snapshot.assets] == list(server.state.assets)
+    assert all(asset["status"] is not None for asset in snapshot.assets)
+    assert snapshot.errors == {}
+
+
+def test_malformed_asset_entry_is_an_error(server: FakeSMMServer, connection: SMMConnection) -> None:
+    server.state.assets[99] = {"name": "No id"}
+
+    snapshot = connection.get_missions()[0].snapshot()
+
+    assert len(snapshot.assets) == len(server.state.assets) - 1
+    assert list(snapshot.errors) == [f"assets/{len(server.state.assets) - 1}"]
@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from smm_client.streaming import iter_json_array
+from smm_client.types import SMMMissingKeyError
+
+if TYPE_CHECKING:
+    from benchmarks.fake_server import FakeSMMServer
+    from smm_client.connection import SMMConnection
+
+ITEMS = [
+    {"id": 1, "name": 'Say "hi" [not] {an} array', "lat": -43.5, "big": 1e21, "ok": True},
+    {"id": 2, "name": 'Back\\slash \\" ]}, ', "notes": None, "tags": [[], {}]},
+    {"id": 3, "name": "Ōtautahi ✈", "altitude": 0.25},
+    17,
+    "plain",
+]
+DOCUMENT = json.dumps({"before": {"assets": [1, 2]}, "assets": ITEMS, "after": "]"}, ensure_ascii=False).encode()
+
+
+def _chunks(document: bytes, size: int) -> list[bytes]:
+    return [document[start : start + size] for start in range(0, len(document), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, len(DOCUMENT)])
+def test_items_split_across_chunks(size: int) -> None:
+    assert list(iter_json_array(_chunks(DOCUMENT, size), "assets")) == ITEMS
+
+
+def test_text_chunks() -> None:
+    assert list(iter_json_array(DOCUMENT.decode(), "assets")) == ITEMS
+
+
+@pytest.mark.parametrize("document", [b'{"assets": []}', b'{"assets" : [ ] , "other": 1}'])
+def test_empty_array(document: bytes) -> None:
+    assert list(iter_json_array(_chunks(document, 1), "assets")) == []
+
+
+@pytest.mark.parametrize("document", [b"{}", b'{"missions": [1]}', b'{"other": "assets"}'])
+def test_missing_key(document: bytes) -> None:
+    with pytest.raises(KeyError):
+        list(iter_json_array([document], "assets"))
+
+
+# Cut off in the first item, inside an escaped string, in a number, and just before the array closes
+@pytest.mark.parametrize(
+    "end", [1, 12, DOCUMENT.index(b"slash") + 6, DOCUMENT.index(b"0.25") + 2, DOCUMENT.index(b'"plain"') + 7]
+)
+def test_truncated_input(end: int) -> None:
+    with pytest.raises(ValueError):  # noqa: PT011
+        list(iter_json_array(_chunks(DOCUMENT[:end], 5), "assets"))
+
+
+@pytest.mark.parametrize("document", [b'{"assets": {"id": 1}}', b"[1, 2]", b'{"assets": [1 2]}'])
+def test_not_an_array(document: bytes) -> None:
+    with pytest.raises(ValueError):  # noqa: PT011
+        list(iter_json_array([document], "assets"))
+
+
+def test_connection_iter_json(server: FakeSMMServer, connection: SMMConnection) -> None:
+    mission = connection.get_missions()[0]
+
+    assert list(connection.iter_json("/assets/", "assets", chunk_size=16)) == list(server.state.assets.values())
+    assert list(mission.iter_assets()) == mission.assets()
+    with pytest.raises(SMMMissingKeyError):
+        list(connection.iter_json("/assets/", "missions"))
@@ -0,0 +1,112 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from smm_client.types import SMMPostHTTPError
+from smm_client.uploader import SMMPositionUploader
+
+if TYPE_CHECKING:
+    from benchmarks.fake_server import FakeSMMServer
+    from smm_client.connection import SMMConnection
+
+# Large enough that nothing is sent until flush() or close()
+HOLD = 10_000
+TIMEOUT = 10.0
+
+
+def _wait_for(condition, timeout: float = TIMEOUT) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_only_the_latest_fix_is_sent(server: FakeSMMServer, connection: SMMConnection) -> None:
+    assets = connection.get_assets()[:3]
+    with SMMPositionUploader(batch_size=HOLD, flush_interval=HOLD) as uploader:
+        for step in range(5):
+            for asset in assets:
+                assert uploader.submit(asset, -43.5 + step / 100, 172.6, 3)
+        assert uploader.queue_depth == len(assets)
+        before = server.state.requests
+
+        assert uploader.flush(TIMEOUT)
+
+        assert server.state.requests - before == len(assets)
+        stats = uploader.stats()
+    assert (stats.submitted, stats.coalesced, stats.sent, stats.failed) == (15, 12, 3, 0)
+    assert all(server.state.positions[asset.id]["lat"] == str(-43.5 + 4 / 100) for asset in assets)
+
+
+def test_close_sends_everything(server: FakeSMMServer, connection: SMMConnection) -> None:
+    assets = connection.get_assets()
+    uploader = SMMPositionUploader(workers=2, batch_size=HOLD, flush_interval=HOLD)
+    for asset in assets:
+        uploader.submit(asset, -43.5, 172.6, 3, 100, 90)
+
+    uploader.close(TIMEOUT)
+
+    assert set(server.state.positions) == {asset.id for asset in assets}
+    assert uploader.stats().sent == len(assets)
+    with pytest.raises(RuntimeError):
+        uploader.submit(assets[0], -43.5, 172.6, 3)
+
+
+def test_flush_interval(server: FakeSMMServer, connection: SMMConnection) -> None:
+    asset = connection.get_assets()[0]
+    with SMMPositionUploader(batch_size=HOLD, flush_interval=0.05) as uploader:
+        uploader.submit(asset, -43.5, 172.6, 3)
+        assert _wait_for(lambda: asset.id in server.state.positions)
+        assert uploader.stats().sent == 1
+
+
+def test_pending_limit(connection: SMMConnection) -> None:
+    assets = connection.get_assets()[:3]
+    with SMMPositionUploader(max_pending=2, batch_size=HOLD, flush_interval=HOLD) as uploader:
+        assert uploader.submit(assets[0], -43.5, 172.6, 3)
+        assert uploader.submit(assets[1], -43.5, 172.6, 3)
+        assert not uploader.submit(assets[2], -43.5, 172.6, 3)
+        assert not uploader.submit(assets[2], -43.5, 172.6, 3, block=True, timeout=0.01)
+        # A newer fix for an asset already waiting still replaces it
+        assert uploader.submit(assets[0], -43.4, 172.6, 3)
+        stats = uploader.stats()
+    assert (stats.rejected, stats.coalesced, stats.max_queue_depth) == (2, 1, 2)
+
+
+def test_callbacks_and_stats_see_failures(server: FakeSMMServer, connection: SMMConnection) -> None:
+    assets = connection.get_assets()[:2]
+    server.state.commanded.add(assets[1].id)
+    errors = []
+    commands = []
+    finished = threading.Event()
+
+    def on_error(asset, exc: Exception) -> None:
+        errors.append((asset, exc))
+        # Raising from a callback must not stop the uploader
+        raise RuntimeError
+
+    def on_command(asset, command) -> None:
+        commands.append((asset, command))
+        finished.set()
+
+    with SMMPositionUploader(workers=1, on_error=on_error, on_command=on_command) as uploader:
+        server.state.capacity = 0
+        uploader.submit(assets[0], -43.5, 172.6, 3)
+        assert _wait_for(lambda: uploader.stats().failed == 1)
+        server.state.capacity = None
+        uploader.submit(assets[1], -43.5, 172.6, 3)
+        assert finished.wait(TIMEOUT)
+        stats = uploader.stats()
+
+    assert [(asset, type(exc)) for asset, exc in errors] == [(assets[0], SMMPostHTTPError)]
+    assert [(asset, command.command) for asset, command in commands] == [(assets[1], "Return to Base")]
+    assert (stats.sent, stats.failed, stats.in_flight) == (1, 1, 0)
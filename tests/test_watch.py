@@ -0,0 +1,62 @@
+# SPDX-FileCopyrightText: 2024-present Canterbury Air Patrol Inc. <github@canterburyairpatrol.org>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from smm_client.types import SMMMalformedDataError
+from smm_client.watch import (
+    CHANGE_ADDED,
+    CHANGE_ERROR,
+    WATCH_ASSET_STATUS,
+    WATCH_MISSION_ASSETS,
+    SMMWatcher,
+)
+
+if TYPE_CHECKING:
+    from benchmarks.fake_server import FakeSMMServer
+    from smm_client.connection import SMMConnection
+
+
+def test_added_asset_is_followed(server: FakeSMMServer, connection: SMMConnection) -> None:
+    watcher = SMMWatcher(connection, min_interval=0.0)
+    watcher.watch_mission_assets(connection.get_missions()[0], follow=True)
+    assert watcher.poll() == []
+
+    server.state.assets[99] = {"id": 99, "name": "New"}
+    events = watcher.poll()
+
+    assert [(event.kind, event.key) for event in events] == [(CHANGE_ADDED, 99)]
+    assert f"{WATCH_ASSET_STATUS} of New (99)" in watcher.intervals()
+
+
+def test_malformed_mission_assets_are_an_error(server: FakeSMMServer, connection: SMMConnection) -> None:
+    watcher = SMMWatcher(connection, min_interval=0.0)
+    watcher.watch_mission_assets(connection.get_missions()[0], follow=True)
+    watcher.watch_missions()
+    watcher.poll()
+
+    server.state.assets[98] = "junk"
+    server.state.assets[99] = {"id": 99}
+    events = watcher.poll()
+
+    assert [(event.resource, event.kind) for event in events] == [(WATCH_MISSION_ASSETS, CHANGE_ERROR)]
+    assert isinstance(events[0].error, SMMMalformedDataError)
+
+    # The last good value is kept, so only the real change is seen once the list is fixed
+    del server.state.assets[98]
+    server.state.assets[99]["name"] = "Fixed"
+    assert [(event.kind, event.key) for event in watcher.poll()] == [(CHANGE_ADDED, 99)]
+
+
+def test_stop_before_iterating(connection: SMMConnection) -> None:
+    watcher = SMMWatcher(connection, min_interval=0.0).watch_missions()
+    watcher.stop()
+
+    async def collect() -> list:
+        return [event async for event in watcher]
+
+    assert list(watcher) == []
+    assert asyncio.run(collect()) == []